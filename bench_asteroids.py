@@ -0,0 +1,80 @@
+# Asteroid rendering benchmark: the old per-vertex Python path against the
+# batched NumPy transform and the pre-rendered rotation frames.
+#
+#   python bench_asteroids.py [frames]
+#
+# Run from the repository root. Set SDL_VIDEODRIVER=dummy to run without a window.
+import math
+import sys
+import time
+from random import randint, seed
+
+import space
+from render_queue import RenderQueue
+
+COUNTS = (10, 100, 1000)
+
+
+def legacy_draw(asteroid, screen):
+    # Asteroid.draw before the entity store: every vertex rotated in Python
+    rotated_points = []
+    for x, y in asteroid.points:
+        rot_x = x * math.cos(math.radians(asteroid.rotation)) - y * math.sin(math.radians(asteroid.rotation))
+        rot_y = x * math.sin(math.radians(asteroid.rotation)) + y * math.cos(math.radians(asteroid.rotation))
+        rotated_points.append((rot_x + asteroid.x, rot_y + asteroid.y))
+    space.pygame.draw.polygon(screen, space.ASTEROID_COLOR, rotated_points, 2)
+
+
+def spawn(count):
+    # Asteroids scattered over the screen instead of entering from the edges
+    seed(count)
+    asteroids = []
+    for _ in range(count):
+        asteroid = space.Asteroid()
+        asteroid.x = randint(0, space.WIDTH)
+        asteroid.y = randint(0, space.HEIGHT)
+        asteroids.append(asteroid)
+    return asteroids
+
+
+def time_legacy(asteroids, screen, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        for asteroid in asteroids:
+            asteroid.rotation += asteroid.rotation_speed
+            legacy_draw(asteroid, screen)
+    return (time.perf_counter() - start) / frames
+
+
+def time_store(asteroids, screen, frames, renderer):
+    # Returns (spawn seconds, seconds per frame)
+    start = time.perf_counter()
+    store = space.AsteroidStore(renderer=renderer)
+    for asteroid in asteroids:
+        store.append(asteroid)
+    spawned = time.perf_counter() - start
+
+    queue = RenderQueue(screen.get_size())
+    start = time.perf_counter()
+    for _ in range(frames):
+        store.column("rotation")[:] += store.column("rotation_speed")
+        store.draw(queue)
+        queue.flush(screen)
+    return spawned, (time.perf_counter() - start) / frames
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    screen = space.screen
+    print(f"{'asteroids':>10} {'legacy':>12} {'batch':>12} {'frames':>12} {'frames spawn':>14}")
+    for count in COUNTS:
+        asteroids = spawn(count)
+        legacy = time_legacy(asteroids, screen, frames)
+        _, batch = time_store(asteroids, screen, frames, "batch")
+        spawned, framed = time_store(asteroids, screen, frames, "frames")
+        print(f"{count:>10} {legacy * 1000:>9.2f} ms {batch * 1000:>9.2f} ms "
+              f"{framed * 1000:>9.2f} ms {spawned * 1000:>11.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
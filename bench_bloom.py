@@ -0,0 +1,78 @@
+# Glow benchmark: the per-object halos (planet glow sprites, the sun corona
+# and double-size exhaust particles) against plain objects plus one bloom pass.
+#
+#   python bench_bloom.py [frames]
+#
+# Run from the repository root. Set SDL_VIDEODRIVER=dummy to run without a window.
+import sys
+import time
+
+import numpy as np
+
+import space
+from bloom import Bloom
+from glow_cache import glow_cache
+from particle import ParticleSystem
+from render_queue import RenderQueue, LAYER_EFFECTS
+
+# (planets, exhaust particles): the normal space view, then stress counts
+COUNTS = ((9, 100), (100, 1000), (1000, 4000))
+SUN_COLOR = (255, 200, 50)
+
+
+def spawn(planets, particles):
+    # Planets scattered over the screen and a particle system emitting from
+    # the middle, seeded so both paths draw the same frames
+    rng = np.random.default_rng(planets)
+    bodies = [(tuple(int(c) for c in rng.integers(60, 256, 3)),
+               int(rng.integers(10, 31)),
+               int(rng.integers(0, space.WIDTH)), int(rng.integers(0, space.HEIGHT)))
+              for _ in range(planets)]
+    systems = []
+    for glow in (2, 1):
+        system = ParticleSystem(particles, [(255, 100, 0), (255, 200, 0), (255, 255, 255)],
+                                max_life=1000, glow=glow, shrink=0, seed=planets)
+        system.emit_cone(space.WIDTH // 2, space.HEIGHT // 2, 0, particles, spread=180,
+                         speed=(0, 1), size=(1, 4), fade=(0, 0))
+        system.prewarm(4)
+        systems.append(system)
+    return bodies, systems
+
+
+def draw_frame(queue, bodies, particles, glow):
+    queue.blit(glow_cache.disc(SUN_COLOR, 50), (space.WIDTH // 2 - 50, space.HEIGHT // 2 - 50))
+    if glow:
+        queue.blit(glow_cache.corona(SUN_COLOR, 200, 80), (space.WIDTH // 2 - 100, space.HEIGHT // 2 - 100))
+    for color, radius, x, y in bodies:
+        if glow:
+            queue.blit(glow_cache.planet_glow(color, radius), (x - radius * 2, y - radius * 2))
+        queue.blit(glow_cache.disc(color, radius), (x - radius, y - radius))
+    particles.draw(queue)
+
+
+def time_glow(screen, bodies, particles, frames, bloom=None):
+    queue = RenderQueue(screen.get_size())
+    start = time.perf_counter()
+    for _ in range(frames):
+        screen.fill((0, 0, 0))
+        draw_frame(queue, bodies, particles, glow=bloom is None)
+        if bloom:
+            queue.draw(bloom.apply, layer=LAYER_EFFECTS)
+        queue.flush(screen)
+    return (time.perf_counter() - start) / frames
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    screen = space.screen
+    bloom = Bloom(screen.get_size(), intensity=space.BLOOM_INTENSITY)
+    print(f"{'planets':>8} {'particles':>10} {'per-object':>12} {'bloom':>12}")
+    for planets, particle_count in COUNTS:
+        bodies, (halo_particles, plain_particles) = spawn(planets, particle_count)
+        halos = time_glow(screen, bodies, halo_particles, frames)
+        bloomed = time_glow(screen, bodies, plain_particles, frames, bloom)
+        print(f"{planets:>8} {particle_count:>10} {halos * 1000:>9.2f} ms {bloomed * 1000:>9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
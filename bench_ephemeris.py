@@ -0,0 +1,95 @@
+# Orbit benchmark: the old per-planet update, which advanced every planet by
+# speed and placed it with math.cos and math.sin, against one Ephemeris pass
+# over the game's planets and moons and over made-up belts of bodies.
+#
+# The game's bodies are timed one step after another, as the game asks for
+# them, which the ephemeris answers from its table of steps ahead. Larger
+# belts are solved every step and cost more than the old update of the 8
+# planets (about 38 us for 1000 bodies against 8 us on a single core): the
+# cost per body of a NumPy pass sets a floor a pure NumPy ephemeris can't
+# get under, so those counts show how it scales rather than a target.
+#
+#   python bench_ephemeris.py [steps]
+#
+# Run from the repository root. Set SDL_VIDEODRIVER=dummy to run without a window.
+import math
+import sys
+import time
+from random import Random
+
+import space
+from ephemeris import Ephemeris
+
+COUNTS = (100, 1000)
+
+
+def legacy_update(planet):
+    # Planet.update before the ephemeris, without the rotation and trail,
+    # which are the same either way
+    planet.angle += planet.speed
+    base_x = math.cos(planet.angle) * planet.orbit
+    base_y = math.sin(planet.angle) * planet.orbit
+    planet.x = space.WIDTH // 2 + base_x
+    planet.y = space.HEIGHT // 2 + base_y * planet.tilt_factor
+    depth = math.sqrt(1 - planet.tilt_factor ** 2)
+    planet.light = (-base_x, -base_y * planet.tilt_factor, -base_y * depth)
+
+
+def time_legacy(steps):
+    planets = [space.Planet(name, data) for name, data in space.planets.items() if name != "Sun"]
+    for planet in planets:
+        planet.angle = 0.0
+    start = time.perf_counter()
+    for _ in range(steps):
+        for planet in planets:
+            legacy_update(planet)
+    return (time.perf_counter() - start) / steps
+
+
+def game_ephemeris():
+    # The planets and moons of the solar system view, added as SpaceExplorer
+    # adds them: all the planets, then all the moons
+    ephemeris = Ephemeris()
+    indices = {name: ephemeris.add(**space.orbit_elements(data))
+               for name, data in space.planets.items() if name != "Sun"}
+    for name, index in indices.items():
+        for moon in space.planets[name].get("moons", {}).values():
+            ephemeris.add(parent=index, **space.orbit_elements(moon))
+    return ephemeris
+
+
+def belt_ephemeris(count):
+    # An asteroid belt between Mars and Jupiter, a tenth of it moons of the
+    # belt's first bodies
+    rng = Random(count)
+    ephemeris = Ephemeris()
+    planets = count - count // 10
+    for _ in range(planets):
+        ephemeris.add(rng.uniform(270, 300), rng.uniform(0.005, 0.007), rng.uniform(0, 0.25),
+                      rng.uniform(0, 0.3), rng.uniform(0, 2 * math.pi),
+                      rng.uniform(0, 2 * math.pi), rng.uniform(0, 2 * math.pi))
+    for index in range(count - planets):
+        ephemeris.add(rng.uniform(10, 30), rng.uniform(0.02, 0.08), parent=index % 8)
+    return ephemeris
+
+
+def time_ephemeris(ephemeris, steps):
+    ephemeris.positions(0.0)
+    start = time.perf_counter()
+    for step in range(steps):
+        ephemeris.positions(float(step))
+    return (time.perf_counter() - start) / steps
+
+
+def main():
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    print(f"{'bodies':>20} {'per step':>12}")
+    print(f"{'8 planets, legacy':>20} {time_legacy(steps) * 1e6:>9.1f} us")
+    game = game_ephemeris()
+    print(f"{f'{len(game)} game bodies':>20} {time_ephemeris(game, steps) * 1e6:>9.1f} us")
+    for count in COUNTS:
+        print(f"{f'{count} bodies':>20} {time_ephemeris(belt_ephemeris(count), steps) * 1e6:>9.1f} us")
+
+
+if __name__ == "__main__":
+    main()
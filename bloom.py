@@ -0,0 +1,134 @@
+import sys
+import numpy as np
+import pygame
+from surface_pool import surface_pool
+
+BLOOM_THRESHOLD = 60    # Luminance (0-255) a pixel needs before it starts to glow
+BLOOM_DOWNSAMPLE = 4    # The glow is computed at 1/4 of the screen resolution
+BLOOM_RADIUS = 8        # Blur radius in downsampled pixels, 32 screen pixels
+
+# Rec. 601 luma weights, summing to 256
+LUMA = (77, 150, 29)
+
+
+def blur_kernel(radius):
+    # Gaussian weights with sigma radius / 2 as integers summing to 256, so
+    # each blur pass is an integer multiply-add and a shift within uint16
+    x = np.arange(-radius, radius + 1)
+    weights = np.exp(-0.5 * (x / max(radius / 2, 0.5)) ** 2)
+    # Rounding the running total keeps the sum exact
+    edges = np.round(np.cumsum(weights) / weights.sum() * 256).astype(int)
+    return tuple(int(weight) for weight in np.diff(edges, prepend=0))
+
+
+class Bloom:
+    # Screen-space glow for the space view, replacing the per-object halos.
+    # apply() shrinks the frame to a quarter resolution, keeps the pixels
+    # brighter than threshold (fading in over the rest of the range), blurs
+    # them with a separable kernel in NumPy, scales the result back up and
+    # adds it onto the frame. The cost depends only on the screen size, not on
+    # how many objects glow; intensity scales all of it and 0 turns it off.
+    #
+    # The downsampled frame is read through surfarray.pixels2d as rows of
+    # packed pixels, so every channel byte is worked on at once in contiguous
+    # (height, width, 4) uint16 arrays; the fourth byte is unused padding.
+    def __init__(self, size, threshold=BLOOM_THRESHOLD, intensity=1.0,
+                 downsample=BLOOM_DOWNSAMPLE, radius=BLOOM_RADIUS):
+        self.threshold = threshold
+        self.intensity = intensity
+        self.downsample = downsample
+        self.kernel = blur_kernel(radius)
+        self.resize(size)
+
+    def resize(self, size):
+        # Scratch surfaces and arrays are allocated here, never per frame
+        self.size = tuple(size)
+        width = max(1, self.size[0] // self.downsample)
+        height = max(1, self.size[1] // self.downsample)
+        self.small_size = (width, height)
+        # Scaling goes through a half-resolution step both ways: a plain
+        # scale between full and half size, smoothscale only at the small end
+        self.half_size = (max(1, self.size[0] // 2), max(1, self.size[1] // 2))
+        self.half = surface_pool.new(self.half_size).convert()
+        self.small = surface_pool.new(self.small_size).convert()
+        self.glow = surface_pool.new(self.size).convert()
+
+        # Byte of each color channel within a packed pixel
+        self.channels = []
+        for shift in self.small.get_shifts()[:3]:
+            byte = shift // 8
+            self.channels.append(3 - byte if sys.byteorder == "big" else byte)
+
+        pad = len(self.kernel) // 2
+        self.bright = np.zeros((height, width, 4), dtype=np.uint16)
+        self.scratch = np.zeros((height, width, 4), dtype=np.uint16)
+        self.luma = np.zeros((height, width), dtype=np.uint16)
+        self.out = np.zeros((height, width, 4), dtype=np.uint32)
+        # Zero borders, so light fades out at the screen edges
+        self.padded_x = np.zeros((height, width + 2 * pad, 4), dtype=np.uint16)
+        self.padded_y = np.zeros((height + 2 * pad, width, 4), dtype=np.uint16)
+
+    def pixels(self):
+        # The downsampled frame as a (height, width, 4) uint8 view
+        packed = pygame.surfarray.pixels2d(self.small).T
+        return packed.view(np.uint8).reshape(self.small_size[1], self.small_size[0], 4)
+
+    def bright_pass(self, pixels):
+        # Full color at white, nothing at or below the threshold
+        bright, luma, scratch = self.bright, self.luma, self.scratch[..., 0]
+        np.copyto(bright, pixels)
+        luma.fill(0)
+        for channel, weight in zip(self.channels, LUMA):
+            np.multiply(bright[..., channel], weight, out=scratch)
+            luma += scratch
+        luma >>= 8
+        np.maximum(luma, self.threshold, out=luma)
+        luma -= self.threshold
+        luma <<= 8
+        luma //= max(1, 255 - self.threshold)
+        bright *= luma[..., None]
+        bright >>= 8
+
+    def blur(self):
+        # Horizontal then vertical pass over self.bright, in place
+        kernel = self.kernel
+        pad = len(kernel) // 2
+        height, width = self.bright.shape[:2]
+        bright, scratch = self.bright, self.scratch
+
+        self.padded_x[:, pad:pad + width] = bright
+        bright.fill(0)
+        for tap, weight in enumerate(kernel):
+            np.multiply(self.padded_x[:, tap:tap + width], weight, out=scratch)
+            bright += scratch
+        bright >>= 8
+
+        self.padded_y[pad:pad + height] = bright
+        bright.fill(0)
+        for tap, weight in enumerate(kernel):
+            np.multiply(self.padded_y[tap:tap + height], weight, out=scratch)
+            bright += scratch
+        bright >>= 8
+
+    def apply(self, surface):
+        # Add the bloom of what is on surface so far onto it. Returns the rect
+        # changed, for the render queue's stats and dirty rects
+        if self.intensity <= 0:
+            return None
+        if surface.get_size() != self.size:
+            self.resize(surface.get_size())
+
+        pygame.transform.scale(surface, self.half_size, self.half)
+        pygame.transform.smoothscale(self.half, self.small_size, self.small)
+        pixels = self.pixels()
+        self.bright_pass(pixels)
+        self.blur()
+        np.multiply(self.bright, int(self.intensity * 256), out=self.out, dtype=np.uint32)
+        self.out >>= 8
+        np.minimum(self.out, 255, out=self.out)
+        pixels[...] = self.out
+        del pixels  # Release the surface lock
+
+        pygame.transform.smoothscale(self.small, self.half_size, self.half)
+        pygame.transform.scale(self.half, self.size, self.glow)
+        return surface.blit(self.glow, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
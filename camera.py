@@ -0,0 +1,79 @@
+import numpy as np
+import pygame
+
+# Zoom moves in half-octave steps, one per mouse wheel notch: step k shows the
+# solar system at 2 ** (k / 2) times its normal size. Images are pre-scaled
+# per step (see mipmap.py), so zooming never rescales anything per frame
+ZOOM_STEP_MIN = -2   # 0.5x, the outer orbits with room to spare
+ZOOM_STEP_MAX = 4    # 4x
+ZOOM_STEPS = range(ZOOM_STEP_MIN, ZOOM_STEP_MAX + 1)
+
+
+def zoom_for_step(step):
+    return 2 ** (step / 2)
+
+
+class Camera:
+    # Zoom and pan for the solar system view. World coordinates are the
+    # layout coordinates the view has always used (the Sun at the middle of a
+    # WIDTH x HEIGHT screen); home is the world point the view starts centered
+    # on, so at step 0 with no pan on a screen of that size the camera is the
+    # identity. center is the world point shown at the middle of the screen.
+    def __init__(self, size, home):
+        self.home = home
+        self.resize(size)
+        self.reset()
+
+    def resize(self, size):
+        self.viewport = pygame.Rect((0, 0), size)
+
+    def reset(self):
+        self.center = self.home
+        self.step = 0
+
+    @property
+    def zoom(self):
+        return zoom_for_step(self.step)
+
+    @property
+    def state(self):
+        # Changes whenever the view does, for caching what is drawn through it
+        return (self.center, self.step, self.viewport.size)
+
+    def to_screen(self, x, y):
+        zoom = self.zoom
+        return ((x - self.center[0]) * zoom + self.viewport.centerx,
+                (y - self.center[1]) * zoom + self.viewport.centery)
+
+    def to_world(self, x, y):
+        zoom = self.zoom
+        return ((x - self.viewport.centerx) / zoom + self.center[0],
+                (y - self.viewport.centery) / zoom + self.center[1])
+
+    def points_to_screen(self, points):
+        # (n, 2) array of world points
+        offset = np.array([self.viewport.centerx, self.viewport.centery], dtype=np.float32)
+        center = np.array(self.center, dtype=np.float32)
+        return (points - center) * np.float32(self.zoom) + offset
+
+    def visible(self, x, y, radius):
+        # Whether a body of radius (screen pixels) at screen position x, y
+        # touches the viewport; everything else is culled
+        return (x + radius > 0 and x - radius < self.viewport.width
+                and y + radius > 0 and y - radius < self.viewport.height)
+
+    def zoom_at(self, pos, steps):
+        # Zoom by whole steps keeping the world point under pos (the mouse) in place
+        step = max(ZOOM_STEP_MIN, min(ZOOM_STEP_MAX, self.step + steps))
+        if step == self.step:
+            return
+        anchor = self.to_world(*pos)
+        self.step = step
+        moved = self.to_world(*pos)
+        self.center = (self.center[0] + anchor[0] - moved[0],
+                       self.center[1] + anchor[1] - moved[1])
+
+    def pan(self, dx, dy):
+        # Drag the view by dx, dy screen pixels
+        zoom = self.zoom
+        self.center = (self.center[0] - dx / zoom, self.center[1] - dy / zoom)
@@ -0,0 +1,100 @@
+import numpy as np
+
+# Grid cell size in pixels; about the diameter of the largest asteroid
+COLLISION_CELL_SIZE = 64
+
+# Cell coordinates are packed into one integer key per circle
+_KEY_OFFSET = 1 << 20
+_KEY_STRIDE = 1 << 21
+
+
+class SpatialHash:
+    # Uniform grid broadphase over circles. build() hashes every circle by the
+    # cell of its center and sorts them by cell, so each cell is a contiguous
+    # run found with searchsorted. query() looks up the cells around each query
+    # circle and keeps the candidates that pass a squared-distance test, so the
+    # cost grows with the number of circles instead of the number of pairs.
+    def __init__(self, cell_size=COLLISION_CELL_SIZE):
+        self.cell_size = cell_size
+        self.build([], [], [])
+
+    def __len__(self):
+        return len(self.order)
+
+    def cells(self, x, y):
+        cx = np.floor(np.asarray(x, dtype=np.float64) / self.cell_size).astype(np.int64)
+        cy = np.floor(np.asarray(y, dtype=np.float64) / self.cell_size).astype(np.int64)
+        return cx, cy
+
+    def key(self, cx, cy):
+        return (cx + _KEY_OFFSET) * _KEY_STRIDE + (cy + _KEY_OFFSET)
+
+    def build(self, x, y, radius):
+        # Rebuilt from scratch every frame; sorting a few hundred keys is
+        # cheaper than tracking which circles changed cell
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.radius = np.asarray(radius, dtype=np.float64)
+        self.max_radius = float(self.radius.max()) if len(self.radius) else 0.0
+        keys = self.key(*self.cells(self.x, self.y))
+        self.order = np.argsort(keys, kind="stable")
+        self.keys = keys[self.order]
+
+    def query(self, x, y, radius):
+        # Returns (query index, circle index) arrays for every overlapping pair,
+        # ordered by query index and then by circle index
+        x = np.atleast_1d(np.asarray(x, dtype=np.float64))
+        y = np.atleast_1d(np.asarray(y, dtype=np.float64))
+        radius = np.broadcast_to(np.asarray(radius, dtype=np.float64), x.shape)
+        empty = np.zeros(0, dtype=np.int64)
+        if len(x) == 0 or len(self.order) == 0:
+            return empty, empty
+
+        # Every circle that can touch a query has its center within reach
+        reach = float(radius.max()) + self.max_radius
+        span = int(np.ceil(reach / self.cell_size))
+        cx, cy = self.cells(x, y)
+        queries = []
+        circles = []
+        for dx in range(-span, span + 1):
+            for dy in range(-span, span + 1):
+                keys = self.key(cx + dx, cy + dy)
+                start = np.searchsorted(self.keys, keys, side="left")
+                end = np.searchsorted(self.keys, keys, side="right")
+                counts = end - start
+                total = int(counts.sum())
+                if total == 0:
+                    continue
+                # Expand each [start, end) run into one candidate per circle
+                query = np.repeat(np.arange(len(x)), counts)
+                first = np.repeat(start - np.cumsum(counts) + counts, counts)
+                queries.append(query)
+                circles.append(self.order[first + np.arange(total)])
+        if not queries:
+            return empty, empty
+        query = np.concatenate(queries)
+        circle = np.concatenate(circles)
+
+        # Narrowphase on squared distances
+        dx = x[query] - self.x[circle]
+        dy = y[query] - self.y[circle]
+        limit = radius[query] + self.radius[circle]
+        hit = dx * dx + dy * dy < limit * limit
+        query = query[hit]
+        circle = circle[hit]
+        order = np.lexsort((circle, query))
+        return query[order], circle[order]
+
+
+def circle_pairs(ax, ay, ar, bx, by, br, cell_size=COLLISION_CELL_SIZE):
+    # Overlapping pairs between two sets of circles, as (a index, b index)
+    # arrays ordered by a and then b
+    grid = SpatialHash(cell_size)
+    grid.build(bx, by, br)
+    return grid.query(ax, ay, ar)
+
+
+def first_hit(x, y, radius, bx, by, br):
+    # Index of the first circle of b overlapping the circle at (x, y), or None
+    _, hits = circle_pairs([x], [y], [radius], bx, by, br)
+    return int(hits[0]) if len(hits) else None
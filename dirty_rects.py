@@ -0,0 +1,125 @@
+import pygame
+
+# Above this fraction of the screen a full flip is cheaper than a rect list
+DIRTY_FULL_THRESHOLD = 0.4
+
+
+def crop_layer(layer):
+    # A mostly transparent full-screen layer cut down to its visible pixels,
+    # as (surface, pos), so full frames do not blend the empty parts
+    bounds = layer.get_bounding_rect()
+    return layer.subsurface(bounds).copy(), bounds.topleft
+
+
+class DirtyRects:
+    # Opt-in dirty rectangle presenting. Each frame, drawables report the
+    # rects they drew (add). The next frame restores the static background
+    # under those rects only (clear), and present() pushes the union of the
+    # previous and current rects with pygame.display.update instead of
+    # flipping the whole screen. Scenes that redraw everything call
+    # invalidate(), and present() falls back to a flip whenever the dirty
+    # area passes the threshold.
+    def __init__(self, screen, enabled=False, threshold=DIRTY_FULL_THRESHOLD):
+        self.enabled = enabled
+        self.threshold = threshold
+        self.resize(screen)
+
+    def resize(self, screen):
+        self.screen = screen
+        self.bounds = screen.get_rect()
+        self.previous = []
+        self.current = []
+        self.full = True
+        self.scene = None
+        self.flips = 0
+        self.updates = 0
+
+    @property
+    def active(self):
+        # True when this frame is drawn incrementally on top of the last one
+        return self.enabled and not self.full
+
+    def set_scene(self, scene):
+        # A different scene means nothing on screen can be reused
+        if scene is not self.scene:
+            self.scene = scene
+            self.invalidate()
+
+    def invalidate(self):
+        self.full = True
+
+    def add(self, rects):
+        # A Rect, None, or an iterable of them
+        if rects is None:
+            return
+        if isinstance(rects, pygame.Rect):
+            rects = (rects,)
+        for rect in rects:
+            if rect is not None:
+                rect = self.bounds.clip(rect)
+                if rect.width and rect.height:
+                    self.current.append(rect)
+
+    def clear(self, background):
+        # Start a frame: restore the static background (a surface the size of
+        # the screen, or a fill color) under last frame's drawables, or
+        # everywhere on a full frame
+        if isinstance(background, (tuple, pygame.Color)):
+            for rect in (self.previous if self.active else (self.bounds,)):
+                self.screen.fill(background, rect)
+        elif self.active:
+            self.screen.blits([(background, rect.topleft, rect) for rect in self.previous],
+                              doreturn=False)
+        else:
+            self.screen.blit(background, (0, 0))
+
+    def overlay(self, foreground, pos=(0, 0)):
+        # Redraw a static transparent layer (title, buttons) at pos on top of
+        # whatever was restored or drawn so far this frame, keeping it above
+        # the stars
+        if not self.active:
+            self.screen.blit(foreground, pos)
+            return
+        bounds = foreground.get_rect(topleft=pos)
+        blits = []
+        for rect in self.previous + self.current:
+            rect = bounds.clip(rect)
+            if rect.width and rect.height:
+                blits.append((foreground, rect.topleft, rect.move(-pos[0], -pos[1])))
+        self.screen.blits(blits, doreturn=False)
+
+    def queue_clear(self, queue, background, layer):
+        # Submit the frame clear to a RenderQueue: restore under last frame's
+        # rects while active, a plain full-screen fill or blit otherwise
+        if self.active:
+            queue.call(self.clear, background, layer=layer)
+        elif isinstance(background, (tuple, pygame.Color)):
+            queue.fill(background, layer=layer)
+        else:
+            queue.blit(background, (0, 0), layer=layer)
+
+    def queue_overlay(self, queue, foreground, pos, layer):
+        if self.active:
+            queue.call(self.overlay, foreground, pos, layer=layer)
+        else:
+            queue.blit(foreground, pos, layer=layer)
+
+    def present(self):
+        # Drawables that stayed put report the same rect twice; display.update
+        # takes overlapping rects, so duplicates are dropped but nothing is merged
+        rects = None
+        if self.active:
+            rects = list({tuple(rect): rect for rect in self.previous + self.current}.values())
+        if rects is not None:
+            area = sum(rect.width * rect.height for rect in rects)
+            if area > self.threshold * self.bounds.width * self.bounds.height:
+                rects = None
+        if rects is None:
+            pygame.display.flip()
+            self.flips += 1
+        else:
+            pygame.display.update(rects)
+            self.updates += 1
+        self.previous = self.current
+        self.current = []
+        self.full = False
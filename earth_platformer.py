@@ -4,6 +4,10 @@ import os
 from PIL import Image
 import io
 import math
+from text_cache import text_cache
+from surface_pool import surface_pool
+from render_queue import RenderQueue, LAYER_BACKGROUND, LAYER_OBJECTS, LAYER_UI
+from timestep import FixedTimestep, SIMULATION_HZ
 
 # Initialize Pygame
 pygame.init()
@@ -45,7 +49,7 @@ class Background:
             
         except pygame.error as e:
             print(f"Could not load background image: {e}")
-            self.image = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            self.image = surface_pool.new((SCREEN_WIDTH, SCREEN_HEIGHT))
             self.image.fill((135, 206, 235))  # Sky blue color
             self.width = SCREEN_WIDTH
     
@@ -93,13 +97,13 @@ class InfoButton(pygame.sprite.Sprite):
         super().__init__()
         self.width = TILE_SIZE
         self.height = TILE_SIZE // 2
-        self.image = pygame.Surface((self.width, self.height))
+        self.image = surface_pool.new((self.width, self.height))
         self.image.fill((255, 0, 0))  # Red color
         
         # Add glow effect
         self.glow_images = []
         for i in range(5):
-            glow_surf = pygame.Surface((self.width + i*4, self.height + i*4), pygame.SRCALPHA)
+            glow_surf = surface_pool.new((self.width + i*4, self.height + i*4), pygame.SRCALPHA)
             alpha = 100 - i * 20
             pygame.draw.rect(glow_surf, (255, 50, 50, alpha), 
                            glow_surf.get_rect(), border_radius=5)
@@ -170,8 +174,7 @@ class InfoBubble(pygame.sprite.Sprite):
         current_width = 0
         
         for word in words:
-            word_surface = self.font.render(word + " ", True, BLACK)
-            word_width = word_surface.get_width()
+            word_width = self.font.size(word + " ")[0]  # Measure without rendering
             
             if current_width + word_width <= self.max_width:
                 current_line.append(word)
@@ -192,7 +195,7 @@ class InfoBubble(pygame.sprite.Sprite):
         total_height = (len(self.wrapped_text) * line_height) + (self.padding * 2)
         
         # Create surface
-        self.image = pygame.Surface((self.max_width + self.padding * 2, total_height), pygame.SRCALPHA)
+        self.image = surface_pool.new((self.max_width + self.padding * 2, total_height), pygame.SRCALPHA)
         
         # Draw background with gradient
         for i in range(3):
@@ -208,7 +211,7 @@ class InfoBubble(pygame.sprite.Sprite):
                 break
             render_text = line[:max(0, self.text_index - i * len(line))]
             if render_text:
-                text_surface = self.font.render(render_text, True, BLACK)
+                text_surface = text_cache.render(self.font, render_text, BLACK)
                 self.image.blit(text_surface, (self.padding, y_offset))
             y_offset += line_height
 
@@ -247,6 +250,9 @@ class Player(pygame.sprite.Sprite):
     def __init__(self, x, y):
         super().__init__()
         self.load_animations()
+        # Left-facing copies made once instead of flipping every animation step
+        self.flipped_animations = {name: [pygame.transform.flip(frame, True, False) for frame in frames]
+                                   for name, frames in self.animations.items()}
         self.current_frame = 0
         self.animation_timer = 0
         self.animation_speed = 150  # Slowed down animation speed for better visibility
@@ -318,14 +324,14 @@ class Player(pygame.sprite.Sprite):
                 
                 # If no frames were loaded, create a fallback
                 if frame_count == 0:
-                    fallback = pygame.Surface((PLAYER_WIDTH, PLAYER_HEIGHT), pygame.SRCALPHA)
+                    fallback = surface_pool.new((PLAYER_WIDTH, PLAYER_HEIGHT), pygame.SRCALPHA)
                     fallback.fill((0, 0, 255, 128))  # Semi-transparent blue
                     self.animations[anim_name] = [fallback]
                     
             except Exception as e:
                 print(f"Error loading animation {filename}: {e}")
                 # Create fallback surface
-                fallback = pygame.Surface((PLAYER_WIDTH, PLAYER_HEIGHT), pygame.SRCALPHA)
+                fallback = surface_pool.new((PLAYER_WIDTH, PLAYER_HEIGHT), pygame.SRCALPHA)
                 fallback.fill((0, 0, 255, 128))  # Semi-transparent blue
                 self.animations[anim_name] = [fallback]
 
@@ -340,7 +346,7 @@ class Player(pygame.sprite.Sprite):
                 
                 # Flip the image if facing left
                 if not self.facing_right:
-                    self.image = pygame.transform.flip(current_anim, True, False)
+                    self.image = self.flipped_animations[self.state][self.current_frame]
                 else:
                     self.image = current_anim
 
@@ -421,9 +427,13 @@ class Platform(pygame.sprite.Sprite):
         self.rect.y = y
 
 class EarthPlatformer:
-    def __init__(self):
+    def __init__(self, backend=None):
+        # backend is the game's TextureBackend, or None to draw to the display surface
+        self.backend = backend
         self.screen = pygame.display.get_surface()
+        self.render_queue = RenderQueue(self.screen.get_size())
         self.clock = pygame.time.Clock()
+        self.timestep = FixedTimestep()
         self.font = pygame.font.Font(None, 36)
         
         # Earth facts that will appear in bubbles
@@ -460,7 +470,7 @@ class EarthPlatformer:
             self.tree_image = pygame.transform.scale(self.tree_image, (tree_width, tree_height))
         except pygame.error as e:
             print(f"Could not load textures: {e}")
-            self.floor_image = pygame.Surface((TILE_SIZE, TILE_SIZE))
+            self.floor_image = surface_pool.new((TILE_SIZE, TILE_SIZE))
             self.floor_image.fill(GREEN)
             self.tree_image = None
         
@@ -551,10 +561,12 @@ class EarthPlatformer:
 
     def run(self):
         running = True
+        self.clock.tick()
+        elapsed = 0.0  # Seconds the last frame took
         while running:
             # Event handling
             for event in pygame.event.get():
-                if event.type == pygame.QUIT:
+                if event.type in (pygame.QUIT, pygame.WINDOWCLOSE):
                     return False
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_SPACE:
@@ -571,16 +583,19 @@ class EarthPlatformer:
             if not (keys[pygame.K_LEFT] or keys[pygame.K_RIGHT] or keys[pygame.K_a] or keys[pygame.K_d]):
                 self.player.stop()
 
-            # Update
-            self.all_sprites.update()
-            self.camera.update(self.player)
-            self.check_button_collisions()
+            # Update in fixed steps, as many as the last frame took
+            for _ in range(self.timestep.advance(elapsed)):
+                self.all_sprites.update()
+                self.camera.update(self.player)
+                self.check_button_collisions()
 
-            # Draw
-            self.screen.fill((135, 206, 235))  # Sky blue background
+            # Draw, through the render queue so every sprite goes out in one blits call
+            queue = self.render_queue
+            queue.fill((135, 206, 235), layer=LAYER_BACKGROUND)  # Sky blue background
             
             # Draw the mountain background with parallax
-            self.background.draw(self.screen, self.camera.x)
+            queue.layer = LAYER_BACKGROUND
+            self.background.draw(queue, self.camera.x)
             
             # Draw button glow effects first (behind other sprites)
             for button in self.info_buttons:
@@ -588,7 +603,7 @@ class EarthPlatformer:
                     button_pos = self.camera.apply(button)
                     glow_image = button.glow_images[button.glow_index]
                     glow_rect = glow_image.get_rect(center=button_pos.center)
-                    self.screen.blit(glow_image, glow_rect)
+                    queue.blit(glow_image, glow_rect, layer=LAYER_OBJECTS)
             
             # Draw all sprites with camera offset
             for sprite in self.all_sprites:
@@ -596,12 +611,19 @@ class EarthPlatformer:
                     # Special handling for info bubbles to keep them on screen
                     bubble_pos = sprite.rect.copy()
                     bubble_pos.centerx = SCREEN_WIDTH // 2
-                    self.screen.blit(sprite.image, bubble_pos)
+                    queue.blit(sprite.image, bubble_pos, layer=LAYER_UI)
                 else:
                     sprite_pos = self.camera.apply(sprite)
-                    self.screen.blit(sprite.image, sprite_pos)
+                    queue.blit(sprite.image, sprite_pos, layer=LAYER_OBJECTS)
 
-            pygame.display.flip()
-            self.clock.tick(60)
+            if self.backend:
+                self.backend.present(queue)
+            else:
+                queue.flush(self.screen)
+                pygame.display.flip()
+            surface_pool.end_frame()
+            # The platformers draw without interpolation, so frames are capped at
+            # the step rate: any faster repeats the same positions and judders
+            elapsed = self.clock.tick(SIMULATION_HZ) / 1000
 
         return True 
\ No newline at end of file
@@ -0,0 +1,127 @@
+import numpy as np
+
+
+class Entity:
+    # Base for game objects kept in an EntityStore. A freshly constructed
+    # entity holds its spawn values as ordinary attributes; once it has been
+    # appended, the instances handed out by the store are views whose
+    # attributes read and write the store's columns.
+    _store = None
+    _index = 0
+
+    def __getattr__(self, name):
+        # Only called when normal lookup fails, i.e. for bound views
+        store = self._store
+        if store is None or name not in store.data:
+            raise AttributeError(name)
+        return store.get(self._index, name)
+
+    def __setattr__(self, name, value):
+        store = self._store
+        if store is not None and name in store.data:
+            store.data[name][self._index] = value
+        else:
+            object.__setattr__(self, name, value)
+
+    def __eq__(self, other):
+        if self._store is None or not isinstance(other, Entity):
+            return self is other
+        return self._store is other._store and self._index == other._index
+
+    def __hash__(self):
+        if self._store is None:
+            return id(self)
+        return hash((id(self._store), self._index))
+
+    @classmethod
+    def view(cls, store, index):
+        entity = cls.__new__(cls)
+        object.__setattr__(entity, "_store", store)
+        object.__setattr__(entity, "_index", index)
+        return entity
+
+
+class EntityStore:
+    # One kind of entity in NumPy column arrays, so updates, culling and
+    # removal run as vectorized passes over every entity at once. Subclasses
+    # list their columns as (name, dtype, shape) and set entity to the Entity
+    # subclass they store. Spawning (append) and iterating work like a list.
+    # Columns with dtype object hold per-entity Python objects such as sprites.
+    columns = ()
+    entity = Entity
+
+    def __init__(self, capacity=16):
+        self.capacity = capacity
+        self.count = 0
+        self.data = {name: np.zeros((capacity, *shape), dtype=dtype)
+                     for name, dtype, shape in self.columns}
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        # Views are taken up front, so removing while iterating is safe as long
+        # as removed entities are not read afterwards
+        return iter([self.entity.view(self, index) for index in range(self.count)])
+
+    def __getitem__(self, index):
+        if not -self.count <= index < self.count:
+            raise IndexError(index)
+        return self.entity.view(self, index % self.count)
+
+    def column(self, name):
+        # Live slice of a column, writes go straight into the store
+        return self.data[name][:self.count]
+
+    def get(self, index, name):
+        value = self.data[name][index]
+        if isinstance(value, np.generic):
+            return value.item()
+        return value  # Row of a shaped column or an object column entry
+
+    def append(self, entity):
+        if self.count == self.capacity:
+            self.grow(self.capacity * 2)
+        index = self.count
+        self.count += 1
+        for name in self.data:
+            self.data[name][index] = self.spawn_value(entity, name)
+        return self.entity.view(self, index)
+
+    def spawn_value(self, entity, name):
+        # Column value for a newly appended entity; override for columns that
+        # are not plain attributes of the spawned object
+        return getattr(entity, name)
+
+    def grow(self, capacity):
+        for name, array in self.data.items():
+            grown = np.zeros((capacity, *array.shape[1:]), dtype=array.dtype)
+            grown[:self.count] = array[:self.count]
+            self.data[name] = grown
+        self.capacity = capacity
+
+    def clear(self):
+        for array in self.data.values():
+            if array.dtype == object:
+                array[:self.count] = None
+        self.count = 0
+
+    def remove(self, entity):
+        keep = np.ones(self.count, dtype=bool)
+        keep[entity._index] = False
+        self.keep(keep)
+
+    def keep(self, alive):
+        # Swap-remove every entity where alive is False: live entities past the
+        # new end fill the dead slots before it, nothing else moves
+        n = self.count
+        live = int(np.count_nonzero(alive))
+        if live == n:
+            return
+        holes = np.flatnonzero(~alive[:live])
+        movers = live + np.flatnonzero(alive[live:])
+        for array in self.data.values():
+            array[holes] = array[movers]
+            if array.dtype == object:
+                array[live:n] = None  # Drop references held by removed rows
+        self.count = live
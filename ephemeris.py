@@ -0,0 +1,242 @@
+import math
+import numpy as np
+
+# Newton steps of Kepler's equation after the first guess M + e sin M. One
+# is within 1e-4 radians for the eccentricities of the planets (Mercury's
+# 0.21 is the largest), a small fraction of a pixel on the widest orbit
+KEPLER_ITERATIONS = 1
+# Simulation steps a body's mean anomaly is carried in float32 from its
+# epoch value before the epoch is moved to the time asked for. Keeps the
+# single precision angles exact to well under a pixel at any date
+EPOCH_SPAN = 4096
+# Ephemerides of up to TABLE_BODIES bodies asked for one step after another
+# solve the next TABLE_STEPS steps in one pass: with few bodies a NumPy pass
+# costs about the same for 16 times as for one
+TABLE_BODIES = 64
+TABLE_STEPS = 16
+
+
+class Ephemeris:
+    # Closed-form positions of a hierarchy of Kepler orbits at any time t,
+    # counted in simulation steps: every body of the solar system in one
+    # NumPy pass, with nothing accumulated from step to step, so the bodies
+    # are where they should be after any number of steps at any time warp
+    # and can be put at any date at once. Planets orbit the Sun at the
+    # origin and moons orbit their planet; positions are 3D, z out of the
+    # plane of the Earth's orbit, for project() to tilt onto the screen.
+    def __init__(self):
+        self.bodies = []  # Ephemeris.add arguments, by index
+        self.built = False
+
+    def __len__(self):
+        return len(self.bodies)
+
+    def add(self, orbit, speed, eccentricity=0.0, inclination=0.0, node=0.0, periapsis=0.0,
+            phase=0.0, parent=None):
+        # One body; returns its index. orbit is the semi-major axis in
+        # pixels, speed the mean motion in radians per step and phase the
+        # mean anomaly at t = 0. inclination, node (longitude of the
+        # ascending node) and periapsis (argument of periapsis) are in
+        # radians. A moon's parent is the index of its planet, added before it
+        if parent is not None and not 0 <= parent < len(self.bodies):
+            raise ValueError(f"Parent {parent} has not been added")
+        self.bodies.append((orbit, speed, eccentricity, inclination, node, periapsis, phase,
+                            -1 if parent is None else parent))
+        self.built = False
+        return len(self.bodies) - 1
+
+    def build(self):
+        # Per-body arrays, rebuilt after bodies are added
+        (orbit, speed, eccentricity, inclination, node, periapsis, phase,
+         parent) = (np.array(column) for column in zip(*self.bodies))
+        self.eccentricity = eccentricity.astype(np.float32)
+        self.parent = parent.astype(np.intp)
+
+        cos_w, sin_w = np.cos(periapsis), np.sin(periapsis)
+        cos_n, sin_n = np.cos(node), np.sin(node)
+        cos_i, sin_i = np.cos(inclination), np.sin(inclination)
+        # A body at eccentric anomaly E is at A (cos E - e) + B sin E: A
+        # points to periapsis with the length of the semi-major axis, B along
+        # the direction of motion with the length of the semi-minor axis.
+        # Both are stored as (3, n) rows of x, y and z, the layout NumPy
+        # multiplies fastest by one value per body
+        p = np.stack((cos_w * cos_n - sin_w * sin_n * cos_i,
+                      cos_w * sin_n + sin_w * cos_n * cos_i,
+                      sin_w * sin_i))
+        q = np.stack((-sin_w * cos_n - cos_w * sin_n * cos_i,
+                      -sin_w * sin_n + cos_w * cos_n * cos_i,
+                      cos_w * sin_i))
+        self.a = (p * orbit).astype(np.float32)
+        self.b = (q * orbit * np.sqrt(1 - eccentricity ** 2)).astype(np.float32)
+
+        # A moon is at its own orbit's position plus its planet's, and a
+        # moon of a moon plus its planet's and that planet's. Rather than
+        # gather those from the planets' columns, every level's ancestors
+        # are solved a second time, as extra columns after the bodies in
+        # the order of the level's moons, and added to the moons as one
+        # slice each. The moons are a slice too when they were added one
+        # after another (all the moons after all the planets)
+        depth = np.zeros(len(self.bodies), dtype=np.intp)
+        for index, up in enumerate(self.parent.tolist()):
+            if up >= 0:
+                depth[index] = depth[up] + 1
+        columns = [np.arange(len(self.bodies))]
+        count = len(self.bodies)
+        self.levels = []
+        for level in range(1, int(depth.max()) + 1):
+            children = ancestors = np.flatnonzero(depth == level)
+            if children[-1] - children[0] == len(children) - 1:
+                children = slice(int(children[0]), int(children[-1]) + 1)
+            for _ in range(level):
+                ancestors = self.parent[ancestors]
+                columns.append(ancestors)
+                self.levels.append((children, slice(count, count + len(ancestors))))
+                count += len(ancestors)
+        columns = np.concatenate(columns)
+
+        # Per-column arrays. The rows of two are for solving sin and cos in
+        # one np.sin, of the angles and the angles plus pi / 2
+        self.speed = speed.astype(np.float64)[columns]
+        self.phase = phase.astype(np.float64)[columns]
+        self.speed2 = np.tile(self.speed.astype(np.float32), (2, 1))
+        self.e = self.eccentricity[columns]
+        self.e2 = np.tile(self.e, (2, 1))
+        self.ba = np.stack((self.b[:, columns], self.a[:, columns]))
+        # Circular orbits only: E is M, with no Newton step to take
+        self.eccentric = bool(self.e.any())
+        self.work = Buffers((), len(columns), len(self.bodies), self.levels)
+        self.table = None  # positions at table_start + table_spacing * k
+        self.table_start = self.table_spacing = 0.0
+        self.times = (None, None)  # The last two times asked for
+
+        self.set_epoch(0.0)
+        self.built = True
+
+    def set_epoch(self, t):
+        # Mean anomaly of every column at t, reduced in double precision
+        self.epoch = t
+        anomaly = np.remainder(self.phase + self.speed * t, 2 * math.pi)
+        self.anomaly2 = np.stack((anomaly, anomaly + math.pi / 2)).astype(np.float32)
+
+    def positions(self, t):
+        # (n, 3) float32 positions of every body at time t relative to the
+        # Sun, or (len(t), n, 3) for an array of times. The positions at one
+        # time can be a view of buffers the next call overwrites
+        if not self.built:
+            self.build()
+        if (isinstance(t, (int, float)) or not np.ndim(t)) and len(self.bodies) <= TABLE_BODIES:
+            return self.tabled(t)
+        return self.solve(t)
+
+    def tabled(self, t):
+        # Positions at one time from the table, which is solved again when a
+        # time continues the spacing of the last two past its end
+        before, last = self.times
+        self.times = (last, t)
+        if self.table_spacing:
+            index = (t - self.table_start) / self.table_spacing
+            if 0 <= index < TABLE_STEPS and index == int(index):
+                return self.table[int(index)]
+        if before is None or t == last or t - last != last - before:
+            return self.solve(t)
+        self.table_start, self.table_spacing = t, t - last
+        self.table = self.solve(t + self.table_spacing * np.arange(TABLE_STEPS))
+        return self.table[0]
+
+    def solve(self, t):
+        # positions() computed, for one time in the preallocated buffers
+        if isinstance(t, (int, float)) or not np.ndim(t):
+            if abs(t - self.epoch) > EPOCH_SPAN:
+                self.set_epoch(float(t))
+            work = self.work
+            work.step[()] = t - self.epoch
+        else:
+            t = np.asarray(t, dtype=np.float64)
+            if abs(t[-1] - self.epoch) > EPOCH_SPAN:
+                self.set_epoch(float(t[-1]))
+            work = Buffers(t.shape, len(self.e), len(self.bodies), self.levels)
+            work.step[:, 0, 0] = t - self.epoch
+
+        # Mean anomaly M and M + pi / 2
+        np.multiply(self.speed2, work.step, work.mean)
+        np.add(work.mean, self.anomaly2, work.mean)
+        if self.eccentric:
+            # First guess E = M + e sin M, kept as E - M
+            np.sin(work.anomaly, work.difference)
+            np.multiply(work.difference, self.e, work.difference)
+            np.add(work.mean, work.offset, work.angle)
+            np.sin(work.angle, work.sincos)
+            for _ in range(KEPLER_ITERATIONS):
+                # E -= (e sin E - E + M) / (e cos E - 1)
+                np.multiply(work.sincos, self.e2, work.newton)
+                np.subtract(work.newton, work.offsets, work.newton)
+                np.divide(work.error, work.slope, work.error)
+                np.subtract(work.difference, work.error, work.difference)
+                np.add(work.mean, work.offset, work.angle)
+                np.sin(work.angle, work.sincos)
+            np.subtract(work.cos, self.e, work.cos)
+        else:
+            np.sin(work.mean, work.sincos)
+
+        # B sin E + A (cos E - e), as (..., 3, columns) while it is summed
+        np.multiply(self.ba, work.sincos3, work.products)
+        np.add(work.sines, work.cosines, work.points)
+        if work.sums is None:
+            for children, parents in self.levels:
+                work.points[..., children] += work.points[..., parents]
+        else:
+            for children, parents in work.sums:
+                np.add(children, parents, children)
+        return work.positions
+
+    def orbit(self, index, samples=128):
+        # (samples, 3) points around the orbit of a body, relative to its parent
+        if not self.built:
+            self.build()
+        eccentric = np.linspace(0, 2 * math.pi, samples, endpoint=False, dtype=np.float32)
+        cos = np.cos(eccentric) - self.eccentricity[index]
+        return cos[:, None] * self.a[:, index] + np.sin(eccentric)[:, None] * self.b[:, index]
+
+
+class Buffers:
+    # What Ephemeris.positions computes in for one time, shape (), or an
+    # array of times: every NumPy step writes into one of these instead of
+    # allocating, through views of their rows made once. The rows of two are
+    # the angles and the angles plus pi / 2, or values that go with them
+    def __init__(self, shape, columns, bodies, levels):
+        rows = shape + (2, columns)
+        self.step = np.empty(shape + (1, 1) if shape else (), dtype=np.float32)  # t - epoch
+        self.mean = np.empty(rows, dtype=np.float32)  # M
+        self.anomaly = self.mean[..., 0, :]
+        self.offsets = np.ones(rows, dtype=np.float32)  # E - M, and 1 for the slope
+        self.difference = self.offsets[..., 0, :]
+        self.offset = self.offsets[..., :1, :]
+        self.angle = np.empty(rows, dtype=np.float32)  # E
+        self.sincos = np.empty(rows, dtype=np.float32)  # sin E, cos E
+        self.cos = self.sincos[..., 1, :]
+        self.sincos3 = self.sincos[..., None, :]
+        self.newton = np.empty(rows, dtype=np.float32)  # error, slope
+        self.error = self.newton[..., 0, :]
+        self.slope = self.newton[..., 1, :]
+        self.products = np.empty(shape + (2, 3, columns), dtype=np.float32)
+        self.sines = self.products[..., 0, :, :]
+        self.cosines = self.products[..., 1, :, :]
+        self.points = np.empty(shape + (3, columns), dtype=np.float32)
+        self.positions = np.swapaxes(self.points[..., :bodies], -1, -2)
+        # The levels' adds as views of the moons and their ancestors' copies,
+        # unless some level's moons are an index array
+        self.sums = None
+        if all(isinstance(children, slice) for children, _ in levels):
+            self.sums = [(self.points[..., children], self.points[..., parents])
+                         for children, parents in levels]
+
+
+def project(points, center, tilt):
+    # Screen positions of (..., 3) positions in the view looking down at the
+    # orbits tilted towards the viewer: the orbital plane is squashed to tilt
+    # of its depth and z, out of it, goes up the screen
+    x = points[..., 0] + center[0]
+    y = points[..., 1] * tilt
+    y -= points[..., 2] * math.sqrt(1 - tilt * tilt)
+    y += center[1]
+    return np.stack((x, y), axis=-1)
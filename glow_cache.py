@@ -0,0 +1,84 @@
+import pygame
+from surface_pool import surface_pool
+
+
+class GlowCache:
+    # Pre-rendered halos, rings and coronas. Every image here is a pure function
+    # of its key, so it is rasterized once and then only blitted.
+    def __init__(self):
+        self.surfaces = {}
+
+    def get(self, key, build):
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = build()
+            self.surfaces[key] = surface
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+    def planet_glow(self, color, radius):
+        # Concentric alpha circles around a planet, surface is radius * 4 wide
+        def build():
+            surface = surface_pool.new((radius * 4, radius * 4), pygame.SRCALPHA)
+            for r in range(radius + 10, radius - 2, -2):
+                alpha = int(100 * (r / (radius + 10)))
+                pygame.draw.circle(surface, (*color, alpha), (radius * 2, radius * 2), r)
+            return surface
+        return self.get(("glow", tuple(color), radius), build)
+
+    def planet_rings(self, color, radius):
+        # Saturn style ring ellipses, surface is radius * 4 by radius * 2
+        def build():
+            surface = surface_pool.new((radius * 4, radius * 2), pygame.SRCALPHA)
+            for r in range(radius + 15, radius + 25):
+                alpha = int(150 * (1 - (r - radius - 15) / 10))
+                pygame.draw.ellipse(surface, (*color, alpha),
+                                    (0, radius - r // 4, radius * 4, r // 2), 1)
+            return surface
+        return self.get(("rings", tuple(color), radius), build)
+
+    def corona(self, color, size, base_radius, layers=5, step=10):
+        # All corona layers composited into one square surface of the given size
+        def build():
+            surface = surface_pool.new((size, size), pygame.SRCALPHA)
+            for i in range(layers):
+                layer = surface_pool.new((size, size), pygame.SRCALPHA)
+                alpha = int(100 * (1 - i / layers))
+                pygame.draw.circle(layer, (*color, alpha), (size // 2, size // 2),
+                                   base_radius + i * step)
+                surface.blit(layer, (0, 0))
+            return surface
+        return self.get(("corona", tuple(color), size, base_radius, layers, step), build)
+
+    def disc(self, color, radius):
+        # Filled circle; used for the pulsing sun core, one variant per whole
+        # pixel of radius. Blit at (center - radius) to match pygame.draw.circle
+        radius = int(radius)
+
+        def build():
+            surface = surface_pool.new((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surface, color, (radius, radius), radius)
+            return surface
+        return self.get(("disc", tuple(color), radius), build)
+
+    def particle(self, color, radius, alpha):
+        # Particle glow: circles from radius down to 1, the inner ones fainter.
+        # Blit at (center - radius)
+        def build():
+            surface = surface_pool.new((radius * 2, radius * 2), pygame.SRCALPHA)
+            for r in range(radius, 0, -1):
+                pygame.draw.circle(surface, (*color, int(alpha * r / radius)),
+                                   (radius, radius), r)
+            return surface
+        return self.get(("particle", tuple(color), radius, alpha), build)
+
+    def prewarm_discs(self, color, min_radius, max_radius):
+        # Build every pulse variant of a disc up front
+        for radius in range(int(min_radius), int(max_radius) + 1):
+            self.disc(color, radius)
+
+
+# Shared by every screen
+glow_cache = GlowCache()
@@ -0,0 +1,107 @@
+import string
+import numpy as np
+import pygame
+from surface_pool import surface_pool
+
+WHITE = (255, 255, 255)
+
+# Characters rasterized up front; anything else is added the first time it is drawn
+ATLAS_CHARS = string.digits + string.ascii_letters + string.punctuation + " "
+
+
+def box_blur(alpha, radius, passes=2):
+    # Repeated box blur of a 2D array, close to a gaussian after two passes
+    alpha = alpha.astype(np.float32)
+    size = radius * 2 + 1
+    for _ in range(passes):
+        for axis in (0, 1):
+            padded = np.pad(alpha, [(radius + 1, radius) if a == axis else (0, 0) for a in (0, 1)])
+            total = np.cumsum(padded, axis=axis)
+            if axis == 0:
+                alpha = (total[size:] - total[:-size]) / size
+            else:
+                alpha = (total[:, size:] - total[:, :-size]) / size
+    return alpha
+
+
+class GlyphAtlas:
+    # Every glyph of one font rasterized once, white, into a single atlas
+    # surface, next to a pre-blurred glow atlas with the same layout. A string
+    # is drawn as one Surface.blits call of atlas areas, so text that changes
+    # every frame (the score, popups) costs a few glyph blits instead of a
+    # Font.render. Colors are cached tinted copies of the atlas and alpha is
+    # applied per draw.
+    def __init__(self, font, glow_radius=0, glow_strength=1.0, chars=ATLAS_CHARS):
+        self.font = font
+        self.glow_radius = glow_radius
+        self.glow_strength = glow_strength
+        self.height = font.get_height()
+        self.build(chars)
+
+    def build(self, chars):
+        self.chars = "".join(dict.fromkeys(chars))
+        pad = self.glow_radius
+        glyphs = [self.font.render(char, True, WHITE) for char in self.chars]
+        width = sum(glyph.get_width() + pad * 2 for glyph in glyphs)
+        self.atlas = surface_pool.new((max(1, width), self.height + pad * 2), pygame.SRCALPHA)
+
+        # Glyph cells side by side, each padded so glows do not overlap
+        self.cells = {}
+        x = 0
+        for char, glyph in zip(self.chars, glyphs):
+            cell = pygame.Rect(x, 0, glyph.get_width() + pad * 2, self.height + pad * 2)
+            self.atlas.blit(glyph, (x + pad, pad))
+            self.cells[char] = (cell, glyph.get_width())
+            x += cell.width
+
+        self.glow_atlas = None
+        if pad:
+            self.glow_atlas = self.atlas.copy()
+            # Make the transparent background white too, so the blurred edges
+            # do not pick up black
+            self.glow_atlas.fill((255, 255, 255, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            alpha = pygame.surfarray.pixels_alpha(self.glow_atlas)
+            alpha[:] = np.clip(box_blur(alpha, max(1, pad // 2)) * self.glow_strength, 0, 255)
+            del alpha
+        self.tinted = {}
+
+    def tint(self, atlas, color):
+        # White atlas multiplied by color, one copy per atlas and color
+        key = (atlas is self.glow_atlas, tuple(color[:3]))
+        surface = self.tinted.get(key)
+        if surface is None:
+            surface = atlas.copy()
+            surface.fill((*color[:3], 255), special_flags=pygame.BLEND_RGBA_MULT)
+            self.tinted[key] = surface
+        return surface
+
+    def size(self, text):
+        missing = [char for char in text if char not in self.cells]
+        if missing:
+            self.build(self.chars + "".join(missing))
+        return sum(self.cells[char][1] for char in text), self.height
+
+    def draw(self, surface, text, pos, color=WHITE, alpha=255, glow=False, anchor="topleft"):
+        # pos is the anchor point of the text's rect (e.g. "midtop", "center").
+        # Returns the rect drawn, including the glow
+        rect = pygame.Rect((0, 0), self.size(text))
+        setattr(rect, anchor, pos)
+        alpha = max(0, min(255, int(alpha)))
+        if alpha == 0 or not text:
+            return rect
+
+        pad = self.glow_radius
+        atlases = [self.tint(self.atlas, color)]
+        if glow and self.glow_atlas is not None:
+            atlases.insert(0, self.tint(self.glow_atlas, color))
+
+        blits = []
+        for atlas in atlases:
+            atlas.set_alpha(alpha)
+            x = rect.x
+            for char in text:
+                cell, advance = self.cells[char]
+                blits.append((atlas, (x - pad, rect.y - pad), cell))
+                x += advance
+        surface.blits(blits, doreturn=False)
+        return rect.inflate(pad * 2, pad * 2) if len(atlases) > 1 else rect
@@ -0,0 +1,27 @@
+import pygame
+from camera import ZOOM_STEPS, zoom_for_step
+
+
+class Mipmap:
+    # One pre-scaled copy of an image per camera zoom step, built up front so
+    # a wheel notch only switches which copy is blitted. base is the image as
+    # drawn at step 0 and is used unchanged there; the other levels are
+    # smoothscaled from source (the full resolution file when there is one),
+    # so reduced levels are filtered and enlarged ones use every source pixel.
+    def __init__(self, base, source=None, steps=ZOOM_STEPS):
+        source = base if source is None else source
+        width, height = base.get_size()
+        self.levels = {}
+        for step in steps:
+            if step == 0:
+                self.levels[step] = base
+                continue
+            zoom = zoom_for_step(step)
+            size = (max(1, round(width * zoom)), max(1, round(height * zoom)))
+            self.levels[step] = pygame.transform.smoothscale(source, size)
+
+    def level(self, step):
+        # The copy for a zoom step, or the nearest one that was built
+        if step not in self.levels:
+            step = min(self.levels, key=lambda built: abs(built - step))
+        return self.levels[step]
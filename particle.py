@@ -1,24 +1,134 @@
+import numpy as np
 import pygame
-import random
-
-class Particle:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.size = random.randint(2, 5)  # Random size for particles
-        self.color = (0, 0, 0)  # Black color
-        self.lifetime = random.randint(20, 50)  # Lifetime of the particle
-        self.age = 0
-        self.velocity_x = random.uniform(-1, 1)  # Random horizontal velocity
-        self.velocity_y = random.uniform(-1, -3)  # Random upward velocity
+from glow_cache import glow_cache
+
+# Number of alpha levels a glow sprite is baked at
+PARTICLE_ALPHA_STEPS = 16
+
+
+class ParticleSystem:
+    # Every particle of one emitter kept in preallocated NumPy arrays. Updating
+    # is a handful of vectorized steps, dead particles are swap-removed by
+    # moving live ones from the end into their slots, and drawing is a single
+    # Surface.blits call of prebaked glow sprites.
+    #
+    # Each particle fades by fade per frame and shrinks by shrink per frame
+    # down to min_size. A particle with life max_life is fully opaque and its
+    # glow radius is size * glow.
+    def __init__(self, capacity, colors, max_life=20, shrink=0.1, min_size=0.1,
+                 glow=2, gravity=0.0, seed=None):
+        self.capacity = capacity
+        self.colors = [tuple(color[:3]) for color in colors]
+        self.max_life = max_life
+        self.shrink = shrink
+        self.min_size = min_size
+        self.glow = glow
+        self.gravity = gravity
+        self.rng = np.random.default_rng(seed)
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.dx = np.zeros(capacity, dtype=np.float32)
+        self.dy = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.fade = np.zeros(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros(capacity, dtype=np.int32)
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def emit(self, x, y, dx, dy, size, life, fade, color):
+        # Every argument is a scalar or an array of the same length; particles
+        # that do not fit in the capacity are dropped
+        dx = np.atleast_1d(dx)
+        count = min(len(dx), self.capacity - self.count)
+        if count <= 0:
+            return
+        start = self.count
+        end = start + count
+        for array, values in ((self.x, x), (self.y, y), (self.dx, dx), (self.dy, dy),
+                              (self.size, size), (self.life, life), (self.fade, fade),
+                              (self.color, color)):
+            values = np.asarray(values)
+            array[start:end] = values if values.ndim == 0 else values[:count]
+        self.count = end
+
+    def emit_cone(self, x, y, angle, count, spread=20, speed=(5, 10), size=(1, 4),
+                  life=None, fade=(0.05, 0.15)):
+        # Spray count particles from (x, y) in directions angle +- spread
+        # degrees (whole degrees, like randint). Ranges are (low, high).
+        rng = self.rng
+        direction = np.radians(angle + rng.integers(-spread, spread + 1, count))
+        speeds = rng.uniform(*speed, count)
+        self.emit(x, y,
+                  np.cos(direction) * speeds,
+                  np.sin(direction) * speeds,
+                  rng.uniform(*size, count),
+                  self.max_life if life is None else life,
+                  rng.uniform(*fade, count),
+                  rng.integers(0, len(self.colors), count))
 
     def update(self):
-        self.x += self.velocity_x
-        self.y += self.velocity_y
-        self.age += 1
+        n = self.count
+        if n == 0:
+            return
+        self.dy[:n] += self.gravity
+        self.x[:n] += self.dx[:n]
+        self.y[:n] += self.dy[:n]
+        self.life[:n] -= self.fade[:n]
+        np.maximum(self.size[:n] - self.shrink, self.min_size, out=self.size[:n])
+
+        # Swap-remove: live particles past the new end fill the dead slots
+        # before it, so nothing else is moved
+        alive = self.life[:n] > 0
+        live = int(alive.sum())
+        if live == n:
+            return
+        holes = np.flatnonzero(~alive[:live])
+        movers = live + np.flatnonzero(alive[live:])
+        for array in (self.x, self.y, self.dx, self.dy, self.life, self.fade,
+                      self.size, self.color):
+            array[holes] = array[movers]
+        self.count = live
+
+    def prewarm(self, max_size):
+        # Build every glow sprite draw() can ask for with particles up to
+        # max_size, so the first bursts do not rasterize any
+        for color in self.colors:
+            for radius in range(1, int(max_size * self.glow) + 1):
+                for level in range(1, PARTICLE_ALPHA_STEPS + 1):
+                    glow_cache.particle(color, radius, int(255 * level / PARTICLE_ALPHA_STEPS))
+
+    def draw(self, surface, lag=0.0):
+        # Returns the rect covering every particle drawn, or None. lag draws
+        # the particles that fraction of an update back along their velocity,
+        # for drawing between two fixed simulation steps
+        n = self.count
+        if n == 0:
+            return None
+        radius = (self.size[:n] * self.glow).astype(np.int32)
+        alpha = np.clip(self.life[:n] / self.max_life, 0, 1)
+        level = np.ceil(alpha * PARTICLE_ALPHA_STEPS).astype(np.int32)
+        visible = np.flatnonzero((radius > 0) & (level > 0))
+        if len(visible) == 0:
+            return None
 
-    def is_alive(self):
-        return self.age < self.lifetime
+        x = self.x[visible] - self.dx[visible] * lag
+        y = self.y[visible] - self.dy[visible] * lag
+        left = (x - radius[visible]).astype(np.int32).tolist()
+        top = (y - radius[visible]).astype(np.int32).tolist()
+        keys = zip(self.color[:n][visible].tolist(), radius[visible].tolist(),
+                   level[visible].tolist())
+        colors = self.colors
+        surface.blits([(glow_cache.particle(colors[color], r, int(255 * a / PARTICLE_ALPHA_STEPS)),
+                        (lx, ty))
+                       for (color, r, a), lx, ty in zip(keys, left, top)],
+                      doreturn=False)
+        right = int((x + radius[visible]).max()) + 1
+        bottom = int((y + radius[visible]).max()) + 1
+        return pygame.Rect(min(left), min(top), right - min(left), bottom - min(top))
 
-    def draw(self, surface):
-        pygame.draw.circle(surface, self.color, (int(self.x), int(self.y)), self.size) 
\ No newline at end of file
@@ -5,6 +5,10 @@ from PIL import Image
 import io
 import math
 import sys
+from text_cache import text_cache
+from surface_pool import surface_pool
+from render_queue import RenderQueue, LAYER_BACKGROUND, LAYER_STARS, LAYER_OBJECTS
+from timestep import FixedTimestep, SIMULATION_HZ
 
 # Initialize Pygame
 pygame.init()
@@ -343,8 +347,8 @@ class InfoButton(pygame.sprite.Sprite):
         except pygame.error as e:
             print(f"Error loading button images: {e}")
             # Fallback to simple colored rectangles if images fail to load
-            self.button_normal = pygame.Surface((self.width, self.height))
-            self.button_pressed = pygame.Surface((self.width, self.height))
+            self.button_normal = surface_pool.new((self.width, self.height))
+            self.button_pressed = surface_pool.new((self.width, self.height))
             self.button_normal.fill((200, 0, 0))
             self.button_pressed.fill((150, 0, 0))
         
@@ -364,7 +368,7 @@ class InfoButton(pygame.sprite.Sprite):
         # Update glow effect for larger size
         self.glow_images = []
         for i in range(5):
-            glow_surf = pygame.Surface((self.width + i*4, self.height + i*4), pygame.SRCALPHA)
+            glow_surf = surface_pool.new((self.width + i*4, self.height + i*4), pygame.SRCALPHA)
             alpha = 100 - i * 20
             pygame.draw.rect(glow_surf, (255, 50, 50, alpha), 
                            glow_surf.get_rect(), border_radius=5)
@@ -391,7 +395,7 @@ class InfoButton(pygame.sprite.Sprite):
         # Validate image is a surface
         if not isinstance(self.image, pygame.Surface):
             print(f"Warning: Button image is not a valid surface")
-            self.image = pygame.Surface((self.width, self.height))
+            self.image = surface_pool.new((self.width, self.height))
             self.image.fill((255, 0, 0))  # Red fallback
 
 class InfoBubble(pygame.sprite.Sprite):
@@ -459,8 +463,7 @@ class InfoBubble(pygame.sprite.Sprite):
         current_width = 0
         
         for word in words:
-            word_surface = self.font.render(word + " ", True, BLACK)
-            word_width = word_surface.get_width()
+            word_width = self.font.size(word + " ")[0]  # Measure without rendering
             
             if current_width + word_width <= self.max_width:
                 current_line.append(word)
@@ -481,7 +484,7 @@ class InfoBubble(pygame.sprite.Sprite):
         total_height = (len(self.wrapped_text) * line_height) + (self.padding * 2)
         
         # Create surface
-        self.image = pygame.Surface((self.max_width + self.padding * 2, total_height), pygame.SRCALPHA)
+        self.image = surface_pool.new((self.max_width + self.padding * 2, total_height), pygame.SRCALPHA)
         
         # Draw background with gradient
         for i in range(3):
@@ -497,14 +500,14 @@ class InfoBubble(pygame.sprite.Sprite):
                 break
             render_text = line[:max(0, self.text_index - i * len(line))]
             if render_text:
-                text_surface = self.font.render(render_text, True, BLACK)
+                text_surface = text_cache.render(self.font, render_text, BLACK)
                 self.image.blit(text_surface, (self.padding, y_offset))
             y_offset += line_height
             
         # Validate image is a surface
         if not isinstance(self.image, pygame.Surface):
             print(f"Warning: Created invalid surface in InfoBubble")
-            self.image = pygame.Surface((self.max_width + self.padding * 2, total_height))
+            self.image = surface_pool.new((self.max_width + self.padding * 2, total_height))
             self.image.fill((200, 200, 200))  # Gray fallback
 
     def handle_key_press(self, key):
@@ -615,7 +618,7 @@ class InfoBubble(pygame.sprite.Sprite):
 class Platform(pygame.sprite.Sprite):
     def __init__(self, x, y, width, height, color, planet_name=""):
         super().__init__()
-        self.image = pygame.Surface((width, height))
+        self.image = surface_pool.new((width, height))
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
@@ -714,10 +717,10 @@ class Player(pygame.sprite.Sprite):
         super().__init__()
         self.width = PLAYER_WIDTH
         self.height = PLAYER_HEIGHT
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        self.image = surface_pool.new((self.width, self.height), pygame.SRCALPHA)
         
         # Create a fallback frame
-        self.fallback_frame = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        self.fallback_frame = surface_pool.new((self.width, self.height), pygame.SRCALPHA)
         pygame.draw.rect(self.fallback_frame, (255, 0, 0), self.fallback_frame.get_rect())
         
         # Load all animations
@@ -727,6 +730,9 @@ class Player(pygame.sprite.Sprite):
             'jumping': []
         }
         self.load_all_animations()
+        # Left-facing copies made once instead of flipping every frame
+        self.flipped_animations = {name: [pygame.transform.flip(frame, True, False) for frame in frames]
+                                   for name, frames in self.animations.items()}
         
         self.current_animation = 'idle'
         self.current_frame_index = 0
@@ -879,7 +885,7 @@ class Player(pygame.sprite.Sprite):
                 
                 # Flip the frame if facing left
                 if not self.facing_right:
-                    self.image = pygame.transform.flip(current_frame, True, False)
+                    self.image = self.flipped_animations[self.current_animation][frame_index]
                 else:
                     self.image = current_frame
             else:
@@ -920,18 +926,22 @@ class StarrySky:
             for _ in range(num_stars)
         ]
 
-    def draw(self, screen, camera_x):
+    def draw(self, queue, camera_x):
         for x, y, radius, color in self.stars:
             parallax_x = (-camera_x * 0.2)
             star_x = (x + parallax_x) % self.width
             brightness = abs(math.sin(pygame.time.get_ticks() * 0.001 + x * 0.1))
             twinkle_color = tuple(int(c * brightness) for c in color)
-            pygame.draw.circle(screen, twinkle_color, (int(star_x), y), radius)
+            queue.draw(pygame.draw.circle, twinkle_color, (int(star_x), y), radius, layer=LAYER_STARS)
 
 class PlanetPlatformer:
-    def __init__(self, planet_name, planet_color, planet_facts, background_color=(0, 0, 0)):
+    def __init__(self, planet_name, planet_color, planet_facts, background_color=(0, 0, 0), backend=None):
+        # backend is the game's TextureBackend, or None to draw to the display surface
+        self.backend = backend
         self.screen = pygame.display.get_surface()
+        self.render_queue = RenderQueue(self.screen.get_size())
         self.clock = pygame.time.Clock()
+        self.timestep = FixedTimestep()
         self.font = pygame.font.Font(None, 36)
         
         self.planet_name = planet_name
@@ -968,7 +978,7 @@ class PlanetPlatformer:
         # Add menu text
         self.menu_font = pygame.font.Font(None, 32)
         self.menu_text = "Press Escape to go back to menu"
-        self.menu_surface = self.menu_font.render(self.menu_text, True, (255, 255, 255))
+        self.menu_surface = text_cache.render(self.menu_font, self.menu_text, (255, 255, 255))
         self.menu_rect = self.menu_surface.get_rect()
         
         # Position at bottom right of the screen
@@ -1033,7 +1043,7 @@ class PlanetPlatformer:
 
     def handle_events(self):
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+            if event.type in (pygame.QUIT, pygame.WINDOWCLOSE):
                 return False
                 
             if event.type == pygame.KEYDOWN:
@@ -1070,36 +1080,48 @@ class PlanetPlatformer:
 
     def run(self):
         running = True
+        self.clock.tick()
+        elapsed = 0.0  # Seconds the last frame took
         while running:
             if self.game_state == "menu":
                 # Menu state code
                 running = self.run_menu()
             else:
                 # Game state code
-                self.screen.fill(BLACK)
-                self.check_collisions()
-                self.check_button_collisions()
-                self.player.update()
-                self.all_sprites.update()
-                
-                # Update camera
-                self.camera.update(self.player)
+                queue = self.render_queue
+                queue.fill(BLACK, layer=LAYER_BACKGROUND)
+                # Update in fixed steps, as many as the last frame took
+                for _ in range(self.timestep.advance(elapsed)):
+                    self.check_collisions()
+                    self.check_button_collisions()
+                    self.player.update()
+                    self.all_sprites.update()
+                    
+                    # Update camera
+                    self.camera.update(self.player)
                 
-                # Draw everything
-                self.starry_sky.draw(self.screen, self.camera.x)
+                # Draw everything, the sprites in one blits call
+                self.starry_sky.draw(queue, self.camera.x)
                 for entity in self.all_sprites:
-                    self.screen.blit(entity.image, self.camera.apply(entity))
+                    queue.blit(entity.image, self.camera.apply(entity), layer=LAYER_OBJECTS)
+                if self.backend:
+                    self.backend.present(queue)
+                else:
+                    queue.flush(self.screen)
+                    pygame.display.flip()
+                surface_pool.end_frame()
                 
                 # Handle events
                 for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
+                    if event.type in (pygame.QUIT, pygame.WINDOWCLOSE):
                         running = False
                     elif event.type == pygame.KEYDOWN:
                         if event.key == pygame.K_ESCAPE:
                             self.game_state = "menu"
             
-            pygame.display.flip()
-            self.clock.tick(60)
+            # The platformers draw without interpolation, so frames are capped at
+            # the step rate: any faster repeats the same positions and judders
+            elapsed = self.clock.tick(SIMULATION_HZ) / 1000
             
         return True
 
@@ -0,0 +1,67 @@
+from collections import deque
+
+# Quality tiers, lowest first. Star and asteroid entries scale the full
+# counts; exhaust is particles per thrusting frame and trail the number of
+# points kept per planet trail. glow turns the planet halos, sun corona and
+# bloom pass on or off.
+QUALITY_TIERS = {
+    "low": {"exhaust": 2, "trail": 15, "stars": 0.4, "glow": False, "asteroids": 0.4},
+    "medium": {"exhaust": 3, "trail": 30, "stars": 0.7, "glow": True, "asteroids": 0.6},
+    "high": {"exhaust": 5, "trail": 50, "stars": 1.0, "glow": True, "asteroids": 1.0},
+}
+QUALITY_NAMES = list(QUALITY_TIERS)
+QUALITY_AUTO = "auto"
+
+QUALITY_WINDOW = 60      # Frames averaged before deciding anything
+QUALITY_SLOW = 0.9       # Step down when frames take this share of the budget
+QUALITY_FAST = 0.5       # Step up only when they take less than this share
+QUALITY_COOLDOWN = 180   # Frames to wait after a change before stepping up again
+
+
+class QualityController:
+    # Keeps the frame rate by stepping through QUALITY_TIERS. frame() is fed
+    # the time each frame took to update and draw (without the tick's sleep);
+    # once a window of frames is in, the tier drops when their average uses
+    # most of the frame budget and rises when there is plenty of room. The
+    # gap between the two thresholds, starting a new window after every
+    # change and the cooldown before stepping back up keep it from
+    # oscillating between two tiers. A fixed preset never changes.
+    def __init__(self, quality=QUALITY_AUTO, fps=60, window=QUALITY_WINDOW,
+                 slow=QUALITY_SLOW, fast=QUALITY_FAST, cooldown=QUALITY_COOLDOWN):
+        self.adaptive = quality == QUALITY_AUTO
+        self.index = len(QUALITY_NAMES) - 1 if self.adaptive else QUALITY_NAMES.index(quality)
+        self.budget = 1000 / fps
+        self.slow = slow
+        self.fast = fast
+        self.cooldown = cooldown
+        self.times = deque(maxlen=window)
+        self.since_change = cooldown
+
+    @property
+    def name(self):
+        return QUALITY_NAMES[self.index]
+
+    @property
+    def settings(self):
+        return QUALITY_TIERS[self.name]
+
+    def frame(self, milliseconds):
+        # Returns True when the tier changed and its settings must be applied
+        self.since_change += 1
+        if not self.adaptive:
+            return False
+        self.times.append(milliseconds)
+        if len(self.times) < self.times.maxlen:
+            return False
+
+        average = sum(self.times) / len(self.times)
+        if average > self.budget * self.slow and self.index > 0:
+            self.index -= 1
+        elif (average < self.budget * self.fast and self.index < len(QUALITY_NAMES) - 1
+              and self.since_change >= self.cooldown):
+            self.index += 1
+        else:
+            return False
+        self.times.clear()
+        self.since_change = 0
+        return True
@@ -0,0 +1,102 @@
+# Offscreen batch renderer: draws many states with SpaceExplorer.render_frame
+# across a pool of processes and saves each frame as a PNG, for lesson
+# handouts and thumbnails. The same arguments always give the same images.
+#
+#   python render_batch.py year [frames]   the solar system over one Earth year
+#   python render_batch.py quiz            every quiz card of every planet
+#   python render_batch.py planets         the planet view of every planet
+#
+# Options: --out DIR (default "renders"), --size WIDTHxHEIGHT to scale the
+# frames down (thumbnails), --workers N processes (default one per CPU).
+# Run from the repository root; no window is opened.
+import argparse
+import math
+import multiprocessing
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import space
+from surface_pool import surface_pool
+
+YEAR_FRAMES = 12  # Default frames over the year, one per month
+
+# The explorer of each worker process, built once by init_worker
+explorer = None
+
+
+def year_states(count):
+    # Evenly spaced over one orbit of the Earth, the first at frame 0
+    year = 2 * math.pi / space.planets["Earth"]["speed"]
+    return [(f"year_{index:03d}.png", {"view": "main", "frame": round(index * year / count)})
+            for index in range(count)]
+
+
+def quiz_states():
+    states = []
+    for name in space.planets:
+        for index, _ in enumerate(space.QuizScreen.get_questions_for_planet(name)):
+            states.append((f"quiz_{name.lower()}_{index}.png",
+                           {"view": "quiz", "planet": name, "question": index}))
+    return states
+
+
+def planet_states():
+    return [(f"planet_{name.lower()}.png", {"view": "planet", "planet": name})
+            for name in space.planets]
+
+
+JOBS = {"year": year_states, "quiz": quiz_states, "planets": planet_states}
+
+
+def init_worker(quality):
+    global explorer
+    explorer = space.SpaceExplorer(quality=quality)
+
+
+def render(task):
+    # Runs in a worker: one state to one PNG, returns the path
+    path, state, size = task
+    surface = surface_pool.new(size).convert()
+    explorer.render_frame(surface, state)
+    pygame.image.save(surface, path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render Space Explorer frames to PNG files")
+    parser.add_argument("job", choices=list(JOBS))
+    parser.add_argument("frames", type=int, nargs="?", default=YEAR_FRAMES,
+                        help="frames of the year job")
+    parser.add_argument("--out", default="renders", help="output directory")
+    parser.add_argument("--size", default=f"{space.WIDTH}x{space.HEIGHT}",
+                        help="image size, WIDTHxHEIGHT")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="worker processes")
+    parser.add_argument("--quality", choices=space.QUALITY_NAMES, default="high")
+    args = parser.parse_args()
+
+    size = tuple(int(value) for value in args.size.lower().split("x"))
+    states = JOBS[args.job](args.frames) if args.job == "year" else JOBS[args.job]()
+    os.makedirs(args.out, exist_ok=True)
+    tasks = [(os.path.join(args.out, name), state, size) for name, state in states]
+
+    # Spawned workers start from a clean pygame instead of a fork of this one
+    start = time.perf_counter()
+    context = multiprocessing.get_context("spawn")
+    pool = context.Pool(args.workers, initializer=init_worker, initargs=(args.quality,))
+    for path in pool.imap_unordered(render, tasks):
+        print(path)
+    # close and join rather than terminate: SDL turns the SIGTERM sent by
+    # terminate into a quit event, so the workers would never exit
+    pool.close()
+    pool.join()
+    elapsed = time.perf_counter() - start
+    print(f"{len(tasks)} frames in {elapsed:.1f} s with {args.workers} workers")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+from operator import itemgetter
+import pygame
+from sprite_cache import sprite_cache
+
+# Draw order, lowest first. Commands on the same layer keep their submit order
+LAYER_BACKGROUND = 0  # Clears, background images and layers
+LAYER_STARS = 10
+LAYER_WORLD = 20      # Sun, planets, trails, planet screen
+LAYER_OBJECTS = 30    # Comets, asteroids, bullets, platformer sprites
+LAYER_PLAYER = 40     # Rocket and its exhaust, platformer player
+LAYER_EFFECTS = 45    # Screen-space passes over everything drawn so far (bloom)
+LAYER_UI = 50         # Buttons, text, score
+LAYER_OVERLAY = 60    # Fades drawn over everything
+
+BLIT, FILL, DRAW, CALL, TRANSFORM = range(5)
+
+
+class RenderQueue:
+    # Deferred drawing for one frame. Scene code submits blits (and fills and
+    # immediate-mode calls such as pygame.draw) with a layer instead of drawing
+    # directly; flush() sorts the commands by layer and submits every run of
+    # consecutive blits with a single Surface.blits call. blit, blits, fill
+    # and the size getters mirror Surface, so widgets and atlases that only
+    # blit can be handed the queue in place of the screen, on the current
+    # layer. The stats of the last flush are kept as attributes. flush() draws
+    # onto a Surface; TextureBackend.present() draws the same commands with
+    # the GPU renderer.
+    def __init__(self, size):
+        self.layer = LAYER_WORLD
+        self.commands = []
+        self.resize(size)
+        self.command_count = 0
+        self.bounds = self.rect
+        self.draw_calls = 0
+        self.pixels = 0
+        self.overdraw = 0.0
+
+    def resize(self, size):
+        self.rect = pygame.Rect((0, 0), size)
+
+    def get_size(self):
+        return self.rect.size
+
+    def get_width(self):
+        return self.rect.width
+
+    def get_height(self):
+        return self.rect.height
+
+    def get_rect(self, **kwargs):
+        rect = self.rect.copy()
+        for name, value in kwargs.items():
+            setattr(rect, name, value)
+        return rect
+
+    def blit(self, source, dest, area=None, special_flags=0, layer=None, static=True):
+        # Returns the rect the blit will cover, like Surface.blit. Pass
+        # static=False for surfaces redrawn in place, which the texture backend
+        # must not keep as textures
+        if isinstance(dest, pygame.Rect):
+            dest = dest.topleft
+        rect = pygame.Rect(dest, pygame.Rect(area).size if area is not None else source.get_size())
+        self.commands.append((self.layer if layer is None else layer, BLIT,
+                              (source, dest, area, special_flags, static), rect))
+        return rect
+
+    def blit_transformed(self, image, center, angle, scale=1.0, angle_step=1, layer=None,
+                         cache=None):
+        # image rotated by angle degrees and scaled, centered on center. The
+        # Surface path takes the transform from cache, the shared sprite cache
+        # by default (quantized to angle_step), the texture backend lets the
+        # renderer do it
+        self.commands.append((self.layer if layer is None else layer, TRANSFORM,
+                              (image, center, angle, scale, angle_step, cache), None))
+
+    def blits(self, blit_sequence, doreturn=True, layer=None):
+        # Items are (source, dest), (source, dest, area) or (source, dest, area, flags)
+        rects = [self.blit(*item, layer=layer) for item in blit_sequence]
+        return rects if doreturn else None
+
+    def fill(self, color, rect=None, special_flags=0, layer=None):
+        rect = self.rect.copy() if rect is None else pygame.Rect(rect)
+        self.commands.append((self.layer if layer is None else layer, FILL,
+                              (color, rect, special_flags), rect))
+        return rect
+
+    def draw(self, function, *args, layer=None):
+        # Deferred immediate-mode drawing: function(target, *args) runs in
+        # order at flush time, e.g. draw(pygame.draw.circle, color, pos, radius)
+        self.commands.append((self.layer if layer is None else layer, DRAW, (function, args), None))
+
+    def call(self, function, *args, layer=None):
+        # Like draw, for functions that do not take the target
+        self.commands.append((self.layer if layer is None else layer, CALL, (function, args), None))
+
+    def clear(self):
+        self.commands = []
+
+    def sorted_commands(self, bounds):
+        # Take this frame's commands in draw order and start new stats
+        commands = sorted(self.commands, key=itemgetter(0))
+        self.commands = []
+        self.layer = LAYER_WORLD
+        self.command_count = len(commands)
+        self.draw_calls = 0
+        self.pixels = 0
+        self.bounds = bounds
+        return commands
+
+    def execute(self, target, kind, payload):
+        # Run one non-batched command on target, returns what it drew
+        self.draw_calls += 1
+        if kind == BLIT:
+            source, dest, area, flags, _ = payload
+            drawn = target.blit(source, dest, area, flags)
+        elif kind == FILL:
+            color, rect, flags = payload
+            drawn = target.fill(color, rect, flags)
+        elif kind == DRAW:
+            function, args = payload
+            drawn = function(target, *args)
+        else:
+            function, args = payload
+            drawn = function(*args)
+
+        # pygame.draw functions and most drawables return what they covered
+        self.count_pixels(drawn)
+        return drawn
+
+    def flush(self, target, dirty=None):
+        # Draw everything onto target in layer order and empty the queue. The
+        # rects drawn are reported to dirty (a DirtyRects) when it is enabled,
+        # so a frame drawn through the queue needs no other bookkeeping
+        report = dirty is not None and dirty.enabled
+        batch = []
+        for _, kind, payload, rect in self.sorted_commands(target.get_rect()):
+            if kind == TRANSFORM:
+                image, center, angle, scale, angle_step, cache = payload
+                if cache is None:
+                    cache = sprite_cache
+                source, rect = cache.get(image, angle, scale, center=center, angle_step=angle_step)
+                payload = (source, rect.topleft, None, 0, True)
+                kind = BLIT
+            if kind == BLIT:
+                batch.append(payload[:4])
+                self.count_pixels(rect)
+                if report:
+                    dirty.add(rect)
+                continue
+
+            if batch:
+                target.blits(batch, doreturn=False)
+                self.draw_calls += 1
+                batch = []
+            drawn = self.execute(target, kind, payload)
+            if report:
+                dirty.add(drawn)
+
+        if batch:
+            target.blits(batch, doreturn=False)
+            self.draw_calls += 1
+        self.finish()
+
+    def finish(self):
+        bounds = self.bounds
+        self.overdraw = self.pixels / max(1, bounds.width * bounds.height)
+
+    def count_pixels(self, drawn):
+        # drawn is a Rect, a list of them or None
+        if isinstance(drawn, pygame.Rect):
+            drawn = (drawn,)
+        elif not isinstance(drawn, list):
+            return
+        for rect in drawn:
+            if rect is not None:
+                rect = self.bounds.clip(rect)
+                self.pixels += rect.width * rect.height
+
+    def stats(self):
+        return (f"{self.command_count} commands, {self.draw_calls} draw calls, "
+                f"{self.pixels} pixels, {self.overdraw:.2f}x overdraw")
@@ -4,8 +4,32 @@ import sys
 from random import randint, choice, random, shuffle  # Add shuffle to the imports
 import time
 import os
+import argparse
+import numpy as np
 from earth_platformer import EarthPlatformer
 from planet_platformer import PlanetPlatformer, Player
+from trails import TrailBuffer, TrailRenderer
+from entities import Entity, EntityStore
+from collision import circle_pairs, first_hit
+from glow_cache import glow_cache
+from particle import ParticleSystem
+from starfield import Starfield
+from sprite_cache import sprite_cache, SpriteCache
+from widgets import Button
+from text_cache import text_cache, HINT_GLOW, TITLE_GLOW
+from glyph_atlas import GlyphAtlas
+from surface_pool import surface_pool
+from dirty_rects import DirtyRects, crop_layer
+from render_queue import (RenderQueue, LAYER_BACKGROUND, LAYER_STARS, LAYER_WORLD,
+                          LAYER_OBJECTS, LAYER_PLAYER, LAYER_EFFECTS, LAYER_UI, LAYER_OVERLAY)
+from sphere_renderer import SphereRenderer, map_from_disc, procedural_map
+from bloom import Bloom
+from camera import Camera, ZOOM_STEPS, zoom_for_step
+from mipmap import Mipmap
+from quality import QualityController, QUALITY_NAMES, QUALITY_AUTO
+from split_screen import SplitScreen
+from timestep import FixedTimestep, MAX_FPS
+from ephemeris import Ephemeris, project
 
 # Initialize Pygame
 pygame.init()
@@ -13,7 +37,11 @@ pygame.init()
 # Set up the display
 WIDTH = 1200
 HEIGHT = 800
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
+# "surface" blits in software to the window surface, "texture" draws through
+# the SDL renderer (texture_backend.py) at a logical size of WIDTH x HEIGHT.
+# The display mode is still set, hidden, so surfaces can be converted
+RENDER_BACKEND = "surface"
+screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.HIDDEN if RENDER_BACKEND == "texture" else 0)
 pygame.display.set_caption("Space Explorer")
 
 # Colors
@@ -40,6 +68,44 @@ ASTEROID_SPEED_MAX = 3
 MAX_ASTEROIDS = 5
 ASTEROID_SPAWN_RATE = 0.02  # 2% chance per frame to spawn new asteroid
 BULLET_LIFETIME = 60  # frames
+ROCKET_TURN_STEP = 5  # Degrees per frame, rotated sprites are cached per step
+SUN_ANGLE_STEP = 2  # Degrees between cached sun rotations
+SUN_PULSE_STEP = 0.05  # Scale between cached sun pulse sizes, three over the pulse
+SUN_SPRITE_BYTES = 8 * 1024 * 1024  # The sun's own sprite cache, so it never evicts the rocket's
+SPRITE_PREWARM_BUDGET = 8  # Cached sprites built per menu frame
+PLANET_RENDERER = "sphere"  # "sphere" spins planets as lit globes, "sprite" rotates the image
+DIRTY_RECTS = False  # Update only the changed parts of the screen in the menu, info and quiz screens
+RENDER_STATS = False  # Print draw calls, overdraw and CPU use once a second, and quality changes
+IDLE_THROTTLE = True  # Redraw static screens at IDLE_FPS and stop while minimized or unfocused
+IDLE_FPS = 10  # Redraw rate of static screens; input still wakes the loop at once
+SURFACE_DEBUG = False  # Report frames that construct pygame.Surface objects
+# One screen-space bloom pass glows the space view instead of per-object halos.
+# Off by default: bench_bloom.py has it about 5x slower at the normal scene
+# (5.3 ms against 1.05 ms for 9 planets and 100 particles). It only wins at
+# stress counts (21.9 ms against 41.2 ms for 1000 planets, 4000 particles)
+BLOOM = False
+BLOOM_INTENSITY = 3.0  # Strength of the bloom, 0 draws the space view without any glow
+
+# Rocket keys per action. One player steers with either the arrows or WASD;
+# in two player split screen each player gets one set
+ROCKET_CONTROLS = {
+    "left": (pygame.K_LEFT, pygame.K_a),
+    "right": (pygame.K_RIGHT, pygame.K_d),
+    "forward": (pygame.K_UP, pygame.K_w),
+    "reverse": (pygame.K_DOWN, pygame.K_s),
+    "fire": (pygame.K_SPACE,),
+}
+PLAYER_CONTROLS = [
+    {"left": (pygame.K_a,), "right": (pygame.K_d,), "forward": (pygame.K_w,),
+     "reverse": (pygame.K_s,), "fire": (pygame.K_SPACE,)},
+    {"left": (pygame.K_LEFT,), "right": (pygame.K_RIGHT,), "forward": (pygame.K_UP,),
+     "reverse": (pygame.K_DOWN,), "fire": (pygame.K_RCTRL, pygame.K_RETURN)},
+]
+PLAYER_HOMES = [(100, 100), (WIDTH - 100, HEIGHT - 100)]  # Solar system view start positions
+ORBIT_TILT = 0.5  # How much the orbits' plane is squashed vertically, the tilt of the solar system view
+# Orbital steps per simulation step, chosen with , and . in the solar system
+# view: negative runs the orbits backwards and 0 stops them
+TIME_WARPS = (-16, -4, -1, 0, 1, 2, 4, 8, 16)
 
 # Planet data with extended information
 planets = {
@@ -64,6 +130,10 @@ planets = {
         "radius": 10,
         "orbit": 100,
         "speed": 0.02,
+        "eccentricity": 0.206,  # Kepler orbit: angles in degrees
+        "inclination": 7.0,
+        "node": 48.3,
+        "periapsis": 29.1,
         "image": "Murcury.png",  # Small image for solar system view
         "stage2_image": "MercuryStage2.png",  # Large image for planet screen
         "info": [
@@ -86,6 +156,10 @@ planets = {
         "radius": 15,
         "orbit": 150,
         "speed": 0.015,
+        "eccentricity": 0.007,
+        "inclination": 3.4,
+        "node": 76.7,
+        "periapsis": 54.9,
         "image": "Venus.png",
         "stage2_image": "VenusStage2.png",
         "info": [
@@ -105,6 +179,15 @@ planets = {
         "radius": 18,
         "orbit": 200,
         "speed": 0.01,
+        "eccentricity": 0.017,
+        "inclination": 0.0,
+        "node": 0.0,
+        "periapsis": 102.9,
+        # Moons orbit the planet the way it orbits the Sun, drawn as discs
+        "moons": {
+            "Moon": {"color": (200, 200, 200), "radius": 4, "orbit": 30, "speed": 0.05,
+                     "eccentricity": 0.055, "inclination": 5.1},
+        },
         "image": "Earth.png",
         "stage2_image": "EarthStage2.png",
         "info": [
@@ -124,6 +207,10 @@ planets = {
         "radius": 14,
         "orbit": 250,
         "speed": 0.008,
+        "eccentricity": 0.093,
+        "inclination": 1.9,
+        "node": 49.6,
+        "periapsis": 286.5,
         "image": "Mars.png",
         "stage2_image": "MarsStage2.png",
         "info": [
@@ -143,6 +230,20 @@ planets = {
         "radius": 40,
         "orbit": 320,
         "speed": 0.005,
+        "eccentricity": 0.049,
+        "inclination": 1.3,
+        "node": 100.5,
+        "periapsis": 273.9,
+        # The Galilean moons, Io, Europa and Ganymede in their 1:2:4 resonance
+        "moons": {
+            "Io": {"color": (240, 220, 110), "radius": 3, "orbit": 52, "speed": 0.08},
+            "Europa": {"color": (210, 190, 160), "radius": 3, "orbit": 60, "speed": 0.04,
+                       "inclination": 0.5},
+            "Ganymede": {"color": (160, 150, 140), "radius": 4, "orbit": 70, "speed": 0.02,
+                         "inclination": 0.2},
+            "Callisto": {"color": (110, 100, 90), "radius": 4, "orbit": 82, "speed": 0.0086,
+                         "inclination": 0.3},
+        },
         "image": "Jupiter.png",
         "stage2_image": "JupiterStage2.png",
         "info": [
@@ -162,6 +263,14 @@ planets = {
         "radius": 35,
         "orbit": 400,
         "speed": 0.003,
+        "eccentricity": 0.057,
+        "inclination": 2.5,
+        "node": 113.7,
+        "periapsis": 339.4,
+        "moons": {
+            "Titan": {"color": (230, 170, 80), "radius": 4, "orbit": 80, "speed": 0.03,
+                      "eccentricity": 0.029, "inclination": 0.3},
+        },
         "image": "Saturn.png",
         "stage2_image": "SaturnStage2.png",
         "info": [
@@ -181,6 +290,10 @@ planets = {
         "radius": 25,
         "orbit": 470,
         "speed": 0.002,
+        "eccentricity": 0.046,
+        "inclination": 0.8,
+        "node": 74.0,
+        "periapsis": 97.0,
         "image": "Uranus.png",
         "stage2_image": "UranusStage2.png",
         "info": [
@@ -200,6 +313,15 @@ planets = {
         "radius": 24,
         "orbit": 520,
         "speed": 0.001,
+        "eccentricity": 0.011,
+        "inclination": 1.8,
+        "node": 131.8,
+        "periapsis": 273.2,
+        # Triton's orbit is inclined past 90 degrees: it goes round backwards
+        "moons": {
+            "Triton": {"color": (200, 210, 220), "radius": 3, "orbit": 38, "speed": 0.04,
+                       "inclination": 157.0},
+        },
         "image": "Neptune.png",
         "stage2_image": "NeptuneStage2.png",
         "info": [
@@ -216,37 +338,18 @@ planets = {
     }
 }
 
-class Star:
-    def __init__(self):
-        self.x = randint(0, WIDTH)
-        self.y = randint(0, HEIGHT)
-        self.size = random() * 2
-        self.color = choice(STAR_COLORS)
-        self.twinkle_speed = random() * 0.1
-        self.brightness = random()
-        self.flash_chance = 0.005  # Chance to start flashing
-        self.is_flashing = False
-        self.flash_brightness = 0
-        
-    def update(self):
-        # Regular twinkling
-        self.brightness = abs(math.sin(time.time() * self.twinkle_speed))
-        
-        # Random flashing
-        if not self.is_flashing and random() < self.flash_chance:
-            self.is_flashing = True
-            self.flash_brightness = 2.0  # Start with bright flash
-            
-        if self.is_flashing:
-            self.flash_brightness *= 0.9  # Fade out
-            if self.flash_brightness < 0.1:
-                self.is_flashing = False
-        
-    def draw(self, screen):
-        # Combine regular brightness with flash brightness
-        final_brightness = min(self.brightness + self.flash_brightness, 2.0)
-        color = [min(255, c * final_brightness) for c in self.color]
-        pygame.draw.circle(screen, color, (int(self.x), int(self.y)), int(self.size))
+def orbit_elements(data):
+    # Ephemeris.add arguments of a planet or moon in planets, whose angles
+    # are in degrees
+    return {
+        "orbit": data["orbit"],
+        "speed": data["speed"],
+        "eccentricity": data.get("eccentricity", 0.0),
+        "inclination": math.radians(data.get("inclination", 0.0)),
+        "node": math.radians(data.get("node", 0.0)),
+        "periapsis": math.radians(data.get("periapsis", 0.0)),
+    }
+
 
 class Planet:
     def __init__(self, name, data):
@@ -255,7 +358,9 @@ class Planet:
         self.radius = data["radius"]
         self.orbit = data["orbit"]
         self.speed = data["speed"]
-        self.angle = randint(0, 360)
+        # Moved by SpaceExplorer's ephemeris, this planet's body index in it
+        self.elements = orbit_elements(data)
+        self.index = None
         self.x = 0
         self.y = 0
         
@@ -266,157 +371,267 @@ class Planet:
         # Load planet image if available
         self.image = None
         self.original_image = None  # Store the original image for rotation
+        self.mipmap = None  # The image pre-scaled for every camera zoom step
         if "image" in data:
             try:
                 image_path = os.path.join(ASSETS_DIR, data["image"])
                 if os.path.exists(image_path):
-                    self.original_image = pygame.image.load(image_path).convert_alpha()
+                    source = pygame.image.load(image_path).convert_alpha()
                     # Scale image to match planet size
                     self.original_image = pygame.transform.scale(
-                        self.original_image, 
+                        source, 
                         (self.radius * 2, self.radius * 2)
                     )
                     self.image = self.original_image.copy()
+                    self.mipmap = Mipmap(self.original_image, source)
             except pygame.error:
                 print(f"Could not load image for {name}")
         
-        self.tilt_factor = 0.5
-        self.trail = []
+        # Sphere-mapped globe; planets without an image get a procedural map
+        self.sphere = None
+        if self.original_image:
+            if PLANET_RENDERER == "sphere":
+                self.sphere = SphereRenderer(map_from_disc(self.original_image, self.radius), self.radius)
+        else:
+            self.sphere = SphereRenderer(
+                procedural_map(self.color, self.radius, stripes=name in ["Jupiter", "Saturn"]),
+                self.radius
+            )
+            self.image = self.sphere.render(0)
+        # Globes per camera zoom step, each rendered at its own radius
+        self.spheres = {0: self.sphere} if self.sphere else {}
+        self.light = None
+        
+        self.tilt_factor = ORBIT_TILT
         self.trail_length = 50
+        self.trail = TrailBuffer(self.trail_length)
         self.rotation = 0
 
-    def update(self):
-        self.angle += self.speed
-        
-        # Calculate position with tilt effect
-        base_x = math.cos(self.angle) * self.orbit
-        base_y = math.sin(self.angle) * self.orbit
-        
-        # Apply perspective transformation
-        self.x = WIDTH // 2 + base_x
-        self.y = HEIGHT // 2 + (base_y * self.tilt_factor)  # Compress y-coordinate for tilt effect
-        
-        # Update trail
-        self.trail.append((self.x, self.y))
-        if len(self.trail) > self.trail_length:
-            self.trail.pop(0)
+    def update(self, position, offset, warp=1):
+        # One step at warp orbital steps per step; position and offset come
+        # from the ephemeris. A stopped planet leaves no trail
+        self.place(position, offset, trail=warp != 0)
 
         # Update rotation
-        self.rotation_angle = (self.rotation_angle + self.rotation_speed) % 360
-        if self.original_image:
-            self.image = pygame.transform.rotate(self.original_image, self.rotation_angle)
-
-    def draw(self, screen):
-        # Draw orbit trail
-        if len(self.trail) > 2:
-            trail_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            for i in range(len(self.trail) - 1):
-                alpha = int(255 * (i / len(self.trail)))
-                pygame.draw.line(trail_surface, (*self.color, alpha),
-                               self.trail[i], self.trail[i + 1], 2)
-            screen.blit(trail_surface, (0, 0))
-
-        # Draw tilted orbit
-        rect = pygame.Rect(
-            WIDTH//2 - self.orbit, 
-            HEIGHT//2 - (self.orbit * self.tilt_factor),
-            self.orbit * 2, 
-            self.orbit * 2 * self.tilt_factor
-        )
-        pygame.draw.ellipse(screen, (*self.color, 30), rect, 1)
-
-        # Draw planet glow
-        glow_surface = pygame.Surface((self.radius * 4, self.radius * 4), pygame.SRCALPHA)
-        for r in range(self.radius + 10, self.radius - 2, -2):
-            alpha = int(100 * (r / (self.radius + 10)))
-            pygame.draw.circle(glow_surface, (*self.color, alpha),
-                             (self.radius * 2, self.radius * 2), r)
-        
-        screen.blit(glow_surface, 
-                   (self.x - self.radius * 2, self.y - self.radius * 2))
+        self.rotation_angle = (self.rotation_angle + self.rotation_speed * warp) % 360
+
+    def set_path(self, path, offset, t):
+        # Put the planet at the end of path, the (n, 2) positions it passed
+        # oldest first, at orbital step t, with path as its trail
+        self.trail.clear()
+        for point in path[-self.trail.capacity:-1]:
+            self.trail.append(point)
+        self.place(path[-1], offset)
+        self.rotation_angle = (self.rotation_speed * t) % 360
+
+    def place(self, position, offset, trail=True):
+        # position is where the ephemeris puts the planet on screen, offset
+        # its (x, y, z) from the Sun
+        self.x, self.y = position
+
+        # Update trail (ring buffer drops the oldest point itself)
+        if trail:
+            self.trail.append(position)
+
+        if self.sphere:
+            # Light comes from the Sun: the reverse of the orbit offset, tilted
+            # into screen space the same way as the orbit. The globe is
+            # rendered when drawn, and only if it is on screen
+            x, y, z = offset
+            depth = math.sqrt(1 - self.tilt_factor ** 2)
+            self.light = (-x, -(y * self.tilt_factor - z * depth), -(y * depth + z * self.tilt_factor))
+
+    def sphere_for(self, step):
+        # The globe for a camera zoom step, built from that step's image
+        sphere = self.spheres.get(step)
+        if sphere is None:
+            radius = max(1, round(self.radius * zoom_for_step(step)))
+            if self.mipmap:
+                texture = map_from_disc(self.mipmap.level(step), radius)
+            else:
+                texture = procedural_map(self.color, radius,
+                                         stripes=self.name in ["Jupiter", "Saturn"])
+            sphere = self.spheres[step] = SphereRenderer(texture, radius)
+        return sphere
+
+    def draw_orbit(self, surface, camera, path):
+        # Draw tilted orbit (baked into SpaceExplorer's static background
+        # layer) through path, the (n, 2) positions around it
+        points = camera.points_to_screen(path)
+        low, high = points.min(axis=0), points.max(axis=0)
+        rect = pygame.Rect(low.tolist(), (high - low + 1).tolist())
+        if rect.colliderect(surface.get_rect()):
+            pygame.draw.lines(surface, (*self.color, 30), True, points.tolist(), 1)
+
+    def draw(self, queue, camera, glow=True, position=None):
+        # Orbit trails are drawn by the shared TrailRenderer and the orbit
+        # ellipse lives in the static background layer. position is where
+        # to draw the planet, between two updates, if not where it is
+        x, y = camera.to_screen(*(position or (self.x, self.y)))
+        radius = max(1, round(self.radius * camera.zoom))
+        if not camera.visible(x, y, radius * 2):
+            return
 
-        if self.image:
-            # Get the rect of the rotated image
+        # Draw planet glow (pre-rendered once per color and radius), unless
+        # the bloom pass provides it
+        if glow:
+            glow_surface = glow_cache.planet_glow(self.color, radius)
+            queue.blit(glow_surface, 
+                       (x - radius * 2, y - radius * 2))
+
+        if self.sphere:
+            # Fixed-size globe centered on the planet's position. The sphere
+            # renderer redraws the same surface every frame
+            self.image = self.sphere_for(camera.step).render(self.rotation_angle, self.light)
             rect = self.image.get_rect()
-            # Center the rect on the planet's position
-            rect.center = (self.x, self.y)
-            # Draw rotated planet image
-            screen.blit(self.image, rect)
+            rect.center = (x, y)
+            queue.blit(self.image, rect, static=False)
         else:
-            # Draw default planet circle and details
-            planet_surface = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(planet_surface, self.color,
-                             (self.radius, self.radius), self.radius)
-            
-            # Add surface details for gas giants
-            if self.name in ["Jupiter", "Saturn"]:
-                for i in range(-self.radius, self.radius, 4):
-                    stripe_color = (min(255, self.color[0] + 20),
-                                  min(255, self.color[1] + 20),
-                                  min(255, self.color[2] + 20))
-                    pygame.draw.line(planet_surface, stripe_color,
-                                   (0, self.radius + i),
-                                   (self.radius * 2, self.radius + i), 2)
-            
-            screen.blit(planet_surface, (self.x - self.radius, self.y - self.radius))
+            queue.blit_transformed(self.mipmap.level(camera.step), (x, y), self.rotation_angle)
 
         # Draw Saturn's rings if applicable
         if self.name == "Saturn":
-            ring_surface = pygame.Surface((self.radius * 4, self.radius * 2), pygame.SRCALPHA)
-            for r in range(self.radius + 15, self.radius + 25):
-                alpha = int(150 * (1 - (r - self.radius - 15) / 10))
-                pygame.draw.ellipse(ring_surface, (*self.color, alpha),
-                                  (0, self.radius - r//4, self.radius * 4, r//2), 1)
-            screen.blit(ring_surface,
-                       (self.x - self.radius * 2, self.y - self.radius))
-
-class Bullet:
+            ring_surface = glow_cache.planet_rings(self.color, radius)
+            queue.blit(ring_surface,
+                       (x - radius * 2, y - radius))
+
+class Moon:
+    # A moon drawn as a small disc, moved around its planet by the ephemeris
+    def __init__(self, name, data, planet):
+        self.name = name
+        self.color = data["color"]
+        self.radius = data["radius"]
+        self.planet = planet
+        self.elements = orbit_elements(data)
+        self.index = None
+        self.x = 0
+        self.y = 0
+
+    def draw(self, queue, camera, position=None):
+        x, y = camera.to_screen(*(position or (self.x, self.y)))
+        radius = max(1, round(self.radius * camera.zoom))
+        if camera.visible(x, y, radius):
+            disc = glow_cache.disc(self.color, radius)
+            queue.blit(disc, (x - radius, y - radius))
+
+
+def drawn_positions(store, lag):
+    # x and y columns of a store of entities moving by (dx, dy) * speed per
+    # update, taken lag of an update back, for drawing between two steps
+    x, y = store.column("x"), store.column("y")
+    if not lag:
+        return x, y
+    back = store.column("speed") * lag
+    return x - store.column("dx") * back, y - store.column("dy") * back
+
+
+class Bullet(Entity):
     def __init__(self, x, y, angle):
         self.x = x
         self.y = y
-        self.angle = angle
+        # Unit velocity, computed once instead of every frame
+        self.dx = math.cos(math.radians(angle))
+        self.dy = math.sin(math.radians(angle))
         self.speed = BULLET_SPEED
         self.lifetime = BULLET_LIFETIME
         self.size = 3
         self.bounces = 0  # Track number of bounces
         self.max_bounces = 3  # Maximum number of bounces before disappearing
 
-    def update(self):
-        # Update position
-        self.x += math.cos(math.radians(self.angle)) * self.speed
-        self.y += math.sin(math.radians(self.angle)) * self.speed
-        self.lifetime -= 1
-        
-        # Check for wall collisions and bounce
-        if self.x <= 0 or self.x >= WIDTH:
-            self.angle = 180 - self.angle  # Reverse horizontal direction
-            self.bounces += 1
-            # Add slight random angle variation on bounce
-            self.angle += random() * 10 - 5
-        
-        if self.y <= 0 or self.y >= HEIGHT:
-            self.angle = -self.angle  # Reverse vertical direction
-            self.bounces += 1
-            # Add slight random angle variation on bounce
-            self.angle += random() * 10 - 5
-        
-        # Keep angle in range 0-360
-        self.angle = self.angle % 360
-        
-        # Reduce speed slightly with each bounce
-        if self.bounces > 0:
-            self.speed = max(BULLET_SPEED * (0.8 ** self.bounces), 3)
+    @property
+    def angle(self):
+        return math.degrees(math.atan2(self.dy, self.dx)) % 360
+
+    @staticmethod
+    def bounce_color(bounces):
+        # Bullet color based on bounce count
+        return (
+            min(255, 255 - bounces * 30),  # Reduce red
+            min(255, 255 - bounces * 30),  # Reduce yellow
+            min(255, bounces * 50)         # Add blue
+        )
 
     def draw(self, screen):
-        # Draw bullet with color based on bounce count
-        color = (
-            min(255, 255 - self.bounces * 30),  # Reduce red
-            min(255, 255 - self.bounces * 30),  # Reduce yellow
-            min(255, self.bounces * 50)         # Add blue
-        )
-        pygame.draw.circle(screen, color, (int(self.x), int(self.y)), self.size)
+        pygame.draw.circle(screen, self.bounce_color(self.bounces),
+                           (int(self.x), int(self.y)), self.size)
 
-class Asteroid:
+
+class BulletStore(EntityStore):
+    columns = (("x", np.float32, ()), ("y", np.float32, ()),
+               ("dx", np.float32, ()), ("dy", np.float32, ()),
+               ("speed", np.float32, ()), ("lifetime", np.int32, ()),
+               ("size", np.int32, ()), ("bounces", np.int32, ()),
+               ("max_bounces", np.int32, ()))
+    entity = Bullet
+
+    def update(self):
+        if not self.count:
+            return
+        x, y = self.column("x"), self.column("y")
+        dx, dy = self.column("dx"), self.column("dy")
+        speed, bounces = self.column("speed"), self.column("bounces")
+
+        # Update position
+        x += dx * speed
+        y += dy * speed
+        self.column("lifetime")[:] -= 1
+
+        # Bounce off the walls: flip the velocity, count the bounce and add a
+        # slight random angle variation
+        hit_x = (x <= 0) | (x >= WIDTH)
+        dx[hit_x] *= -1
+        hit_y = (y <= 0) | (y >= HEIGHT)
+        dy[hit_y] *= -1
+        hits = hit_x.astype(np.int32) + hit_y
+        bounced = np.flatnonzero(hits)
+        if len(bounced):
+            bounces[bounced] += hits[bounced]
+            turn = np.radians(np.random.uniform(-5, 5, len(bounced)) * hits[bounced])
+            cos, sin = np.cos(turn), np.sin(turn)
+            old_dx = dx[bounced].copy()
+            dx[bounced] = old_dx * cos - dy[bounced] * sin
+            dy[bounced] = old_dx * sin + dy[bounced] * cos
+            # Reduce speed slightly with each bounce
+            speed[bounced] = np.maximum(BULLET_SPEED * 0.8 ** bounces[bounced], 3)
+
+        self.keep((self.column("lifetime") > 0) & (bounces < self.column("max_bounces")))
+
+    def draw(self, queue, lag=0.0):
+        x, y = drawn_positions(self, lag)
+        for x, y, size, bounces in zip(x.astype(int).tolist(),
+                                       y.astype(int).tolist(),
+                                       self.column("size").tolist(),
+                                       self.column("bounces").tolist()):
+            queue.draw(pygame.draw.circle, Bullet.bounce_color(bounces), (x, y), size,
+                       layer=LAYER_OBJECTS)
+
+
+ASTEROID_MAX_POINTS = 10
+ASTEROID_COLOR = (169, 169, 169)
+# "batch" rotates every outline in one NumPy pass and draws the polygons,
+# "frames" blits one of ASTEROID_ROTATION_FRAMES outlines pre-rendered at spawn
+ASTEROID_RENDERER = "batch"
+ASTEROID_ROTATION_FRAMES = 24
+
+
+def render_asteroid_frames(points, frames=ASTEROID_ROTATION_FRAMES):
+    # Outline of one asteroid at evenly spaced rotations, each on a small
+    # colorkeyed surface centered on the asteroid
+    points = np.asarray(points, dtype=np.float32)
+    reach = int(np.ceil(np.abs(points).max())) + 2
+    angles = np.radians(np.arange(frames) * 360 / frames)
+    cos, sin = np.cos(angles)[:, None], np.sin(angles)[:, None]
+    xs = (points[:, 0] * cos - points[:, 1] * sin + reach).tolist()
+    ys = (points[:, 0] * sin + points[:, 1] * cos + reach).tolist()
+    sprites = []
+    for frame_x, frame_y in zip(xs, ys):
+        sprite = surface_pool.new((reach * 2, reach * 2))
+        sprite.set_colorkey(BLACK, pygame.RLEACCEL)
+        pygame.draw.polygon(sprite, ASTEROID_COLOR, list(zip(frame_x, frame_y)), 2)
+        sprites.append(sprite)
+    return sprites
+
+class Asteroid(Entity):
     def __init__(self):
         # Spawn from edge of screen
         if random() < 0.5:
@@ -431,13 +646,15 @@ class Asteroid:
         # Angle towards center of screen with some randomness
         target_x = WIDTH//2 + randint(-200, 200)
         target_y = HEIGHT//2 + randint(-200, 200)
-        self.angle = math.degrees(math.atan2(target_y - self.y, target_x - self.x))
+        angle = math.atan2(target_y - self.y, target_x - self.x)
+        self.dx = math.cos(angle)
+        self.dy = math.sin(angle)
         self.rotation = 0
         self.rotation_speed = random() * 2 - 1  # Random rotation speed
         
         # Create irregular shape
         self.points = []
-        num_points = randint(6, 10)
+        num_points = randint(6, ASTEROID_MAX_POINTS)
         for i in range(num_points):
             angle = i * (360 / num_points)
             distance = self.size * (0.8 + random() * 0.4)
@@ -445,29 +662,124 @@ class Asteroid:
                 math.cos(math.radians(angle)) * distance,
                 math.sin(math.radians(angle)) * distance  
             ))
+        self.point_count = num_points
 
-    def update(self):
-        self.x += math.cos(math.radians(self.angle)) * self.speed
-        self.y += math.sin(math.radians(self.angle)) * self.speed
-        self.rotation += self.rotation_speed
+    def outline(self):
+        # Rotate and translate points
+        points = np.asarray(self.points)[:self.point_count]
+        cos = math.cos(math.radians(self.rotation))
+        sin = math.sin(math.radians(self.rotation))
+        return np.column_stack((points[:, 0] * cos - points[:, 1] * sin + self.x,
+                                points[:, 0] * sin + points[:, 1] * cos + self.y))
 
     def draw(self, screen):
-        # Rotate and translate points
-        rotated_points = []
-        for x, y in self.points:
-            # Rotate
-            rot_x = x * math.cos(math.radians(self.rotation)) - y * math.sin(math.radians(self.rotation))
-            rot_y = x * math.sin(math.radians(self.rotation)) + y * math.cos(math.radians(self.rotation))
-            # Translate
-            rotated_points.append((rot_x + self.x, rot_y + self.y))
-        
-        # Draw asteroid
-        pygame.draw.polygon(screen, (169, 169, 169), rotated_points, 2)
+        pygame.draw.polygon(screen, ASTEROID_COLOR, self.outline().tolist(), 2)
 
     def check_collision(self, x, y, size):
         return math.sqrt((self.x - x)**2 + (self.y - y)**2) < self.size + size
 
-class Comet:
+
+class AsteroidStore(EntityStore):
+    columns = (("x", np.float32, ()), ("y", np.float32, ()),
+               ("dx", np.float32, ()), ("dy", np.float32, ()),
+               ("speed", np.float32, ()), ("size", np.float32, ()),
+               ("rotation", np.float32, ()), ("rotation_speed", np.float32, ()),
+               ("points", np.float32, (ASTEROID_MAX_POINTS, 2)),
+               ("point_count", np.int32, ()),
+               ("frames", object, ()))
+    entity = Asteroid
+
+    def __init__(self, capacity=16, renderer=ASTEROID_RENDERER):
+        super().__init__(capacity)
+        self.renderer = renderer
+
+    def spawn_value(self, entity, name):
+        if name == "points":
+            points = np.zeros((ASTEROID_MAX_POINTS, 2), dtype=np.float32)
+            points[:len(entity.points)] = entity.points
+            return points
+        if name == "frames":
+            if self.renderer != "frames":
+                return None
+            return render_asteroid_frames(entity.points)
+        return getattr(entity, name)
+
+    def update(self):
+        if not self.count:
+            return
+        x, y = self.column("x"), self.column("y")
+        speed = self.column("speed")
+        x += self.column("dx") * speed
+        y += self.column("dy") * speed
+        self.column("rotation")[:] += self.column("rotation_speed")
+
+        # Remove asteroids that are far off screen
+        self.keep((x >= -100) & (x <= WIDTH + 100) & (y >= -100) & (y <= HEIGHT + 100))
+
+    def hit_by(self, bullets):
+        # Each asteroid is destroyed by the first live bullet touching it, and
+        # that bullet is spent. Returns how many asteroids were destroyed.
+        if not self.count or not bullets.count:
+            return 0
+        hit_asteroids, hit_bullets = circle_pairs(
+            self.column("x"), self.column("y"), self.column("size"),
+            bullets.column("x"), bullets.column("y"), bullets.column("size"))
+        if not len(hit_asteroids):
+            return 0
+
+        # Pairs come ordered by asteroid, then bullet
+        asteroids_alive = np.ones(self.count, dtype=bool)
+        bullets_alive = np.ones(bullets.count, dtype=bool)
+        for asteroid, bullet in zip(hit_asteroids.tolist(), hit_bullets.tolist()):
+            if asteroids_alive[asteroid] and bullets_alive[bullet]:
+                asteroids_alive[asteroid] = False
+                bullets_alive[bullet] = False
+        self.keep(asteroids_alive)
+        bullets.keep(bullets_alive)
+        return int(np.count_nonzero(~asteroids_alive))
+
+    def draw(self, queue, lag=0.0):
+        if self.renderer == "frames":
+            self.draw_frames(queue, lag)
+        else:
+            self.draw_batch(queue, lag)
+
+    def drawn_rotations(self, lag):
+        return self.column("rotation") - self.column("rotation_speed") * lag
+
+    def draw_frames(self, queue, lag=0.0):
+        # Nearest pre-rendered rotation of every asteroid, batched by the queue
+        if not self.count:
+            return
+        frame = (np.round(self.drawn_rotations(lag) * ASTEROID_ROTATION_FRAMES / 360)
+                 .astype(np.int32) % ASTEROID_ROTATION_FRAMES).tolist()
+        x, y = drawn_positions(self, lag)
+        blits = []
+        for frames, index, x, y in zip(self.column("frames"), frame, x.tolist(), y.tolist()):
+            sprite = frames[index]
+            reach = sprite.get_width() // 2
+            blits.append((sprite, (int(x) - reach, int(y) - reach)))
+        queue.blits(blits, doreturn=False, layer=LAYER_OBJECTS)
+
+    def draw_batch(self, queue, lag=0.0):
+        n = self.count
+        if not n:
+            return
+        # Rotate every outline in one pass
+        rotation = np.radians(self.drawn_rotations(lag))[:, None]
+        cos, sin = np.cos(rotation), np.sin(rotation)
+        points = self.column("points")
+        x, y = drawn_positions(self, lag)
+        px = points[:, :, 0] * cos - points[:, :, 1] * sin + x[:, None]
+        py = points[:, :, 0] * sin + points[:, :, 1] * cos + y[:, None]
+        outlines = np.stack((px, py), axis=2).tolist()
+        for outline, count in zip(outlines, self.column("point_count").tolist()):
+            queue.draw(pygame.draw.polygon, ASTEROID_COLOR, outline[:count], 2, layer=LAYER_OBJECTS)
+
+
+COMET_TRAIL_LENGTH = 20
+
+class Comet(Entity):
     def __init__(self):
         # Determine spawn position (from edges only)
         if random() < 0.5:
@@ -493,46 +805,80 @@ class Comet:
             if dist_to_center > avoid_radius:
                 break
         
-        # Calculate angle towards target
-        self.angle = math.degrees(math.atan2(target_y - self.y, target_x - self.x))
+        # Unit velocity towards the target
+        angle = math.atan2(target_y - self.y, target_x - self.x)
+        self.dx = math.cos(angle)
+        self.dy = math.sin(angle)
         
-        # Trail properties
-        self.trail = []
-        self.trail_length = 20
+        # Trail properties, newest point last
+        self.trail_points = np.zeros((COMET_TRAIL_LENGTH, 2), dtype=np.float32)
+        self.trail_count = 0
         self.size = random() * 2 + 1  # Comet size between 1 and 3
 
-    def update(self):
-        # Update position
-        self.x += math.cos(math.radians(self.angle)) * self.speed
-        self.y += math.sin(math.radians(self.angle)) * self.speed
-        
-        # Update trail
-        self.trail.append((self.x, self.y))
-        if len(self.trail) > self.trail_length:
-            self.trail.pop(0)
+    @property
+    def trail(self):
+        # Trail points ordered from oldest to newest
+        return self.trail_points[COMET_TRAIL_LENGTH - self.trail_count:]
 
     def draw(self, screen):
-        # Draw trail with fade effect
-        if len(self.trail) > 2:
-            for i in range(len(self.trail) - 1):
-                alpha = int(255 * (i / len(self.trail)))
-                pygame.draw.line(screen, (255, 255, 255, alpha),
-                               self.trail[i], self.trail[i + 1], 2)
-        
+        # The faded trail is drawn by the shared TrailRenderer
+
         # Draw comet head
         pygame.draw.circle(screen, WHITE, (int(self.x), int(self.y)), int(self.size))
 
+
+class CometStore(EntityStore):
+    columns = (("x", np.float32, ()), ("y", np.float32, ()),
+               ("dx", np.float32, ()), ("dy", np.float32, ()),
+               ("speed", np.float32, ()), ("size", np.float32, ()),
+               ("trail_points", np.float32, (COMET_TRAIL_LENGTH, 2)),
+               ("trail_count", np.int32, ()))
+    entity = Comet
+
+    def update(self):
+        if not self.count:
+            return
+        x, y = self.column("x"), self.column("y")
+        speed = self.column("speed")
+        x += self.column("dx") * speed
+        y += self.column("dy") * speed
+
+        # Update trail: shift every trail by one point and add the new head
+        trails = self.column("trail_points")
+        trails[:, :-1] = trails[:, 1:]
+        trails[:, -1, 0] = x
+        trails[:, -1, 1] = y
+        counts = self.column("trail_count")
+        np.minimum(counts + 1, COMET_TRAIL_LENGTH, out=counts)
+
+        # Remove comets that left the screen
+        self.keep((x >= -50) & (x <= WIDTH + 50) & (y >= -50) & (y <= HEIGHT + 50))
+
+    def trails(self):
+        # Trail point arrays, oldest first, for the TrailRenderer
+        trails = self.column("trail_points")
+        return [trails[index, COMET_TRAIL_LENGTH - count:]
+                for index, count in enumerate(self.column("trail_count").tolist())]
+
+    def draw(self, queue, lag=0.0):
+        # Draw comet heads
+        x, y = drawn_positions(self, lag)
+        for x, y, size in zip(x.astype(int).tolist(),
+                              y.astype(int).tolist(),
+                              self.column("size").astype(int).tolist()):
+            queue.draw(pygame.draw.circle, WHITE, (x, y), size, layer=LAYER_OBJECTS)
+
 class Rocket:
-    def __init__(self):
-        self.x = 100  # Changed from WIDTH // 2
-        self.y = 100  # Changed from HEIGHT // 4
+    def __init__(self, home=PLAYER_HOMES[0], controls=ROCKET_CONTROLS):
+        self.home = home  # Where the rocket starts in the solar system view
+        self.x, self.y = home
+        self.controls = controls
         self.angle = 0
         self.speed = 0
         self.acceleration = 0.1
         self.max_speed = 5
         self.size = 20
         self.thrust = False
-        self.particles = []
         self.thrust_start_time = 0
         self.fire_colors = [
             (255, 69, 0),    # Red-Orange
@@ -540,6 +886,12 @@ class Rocket:
             (255, 215, 0),   # Yellow
             (255, 255, 255)  # White (core)
         ]
+        # Up to 5 particles a step living up to 400 steps (life 20 fading
+        # 0.05 a step) are 2000 alive at once: any fewer and the newest,
+        # at the nozzle, are the ones dropped
+        self.particles = ParticleSystem(2048, self.fire_colors, max_life=20)
+        self.particles.prewarm(4)
+        self.exhaust = 5  # Particles sprayed per thrusting frame, set by the quality tier
         
         # Load rocket images for different stages
         try:
@@ -559,32 +911,35 @@ class Rocket:
             self.stage2_image = None
             self.stage3_image = None
         
-        self.bullets = []
+        self.bullets = BulletStore()
         self.shoot_cooldown = 0
         self.shoot_delay = 15  # Frames between shots
+        self.previous = None  # x, y and angle before the last update, for drawing between updates
+
+    def pressed(self, keys, action):
+        return any(keys[key] for key in self.controls[action])
 
     def update(self, keys):
-        # Rotation with both arrow keys and A/D
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            self.angle -= 5
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            self.angle += 5
+        self.previous = (self.x, self.y, self.angle)
+
+        # Rotation with the left and right keys (arrows or A/D)
+        if self.pressed(keys, "left"):
+            self.angle -= ROCKET_TURN_STEP
+        if self.pressed(keys, "right"):
+            self.angle += ROCKET_TURN_STEP
 
         # Shooting
         if self.shoot_cooldown > 0:
             self.shoot_cooldown -= 1
-        if keys[pygame.K_SPACE] and self.shoot_cooldown == 0:
+        if self.pressed(keys, "fire") and self.shoot_cooldown == 0:
             self.bullets.append(Bullet(self.x, self.y, self.angle))
             self.shoot_cooldown = self.shoot_delay
         
         # Update bullets
-        for bullet in self.bullets[:]:
-            bullet.update()
-            if bullet.lifetime <= 0 or bullet.bounces >= bullet.max_bounces:
-                self.bullets.remove(bullet)
+        self.bullets.update()
 
-        # Forward thrust with both UP and W
-        if keys[pygame.K_UP] or keys[pygame.K_w]:
+        # Forward thrust with UP or W
+        if self.pressed(keys, "forward"):
             if not self.thrust:
                 self.thrust_start_time = time.time()
                 self.thrust = True
@@ -594,26 +949,13 @@ class Rocket:
             back_x = self.x - math.cos(math.radians(self.angle)) * self.size
             back_y = self.y - math.sin(math.radians(self.angle)) * self.size
             
-            # Add multiple particles per frame
-            for _ in range(5):
-                spread_angle = self.angle + randint(-20, 20)  # Random spread
-                speed = random() * 5 + 5  # Original speed range
-                size = random() * 3 + 1   # Original size range
-                color = choice(self.fire_colors)
-                
-                self.particles.append({
-                    'x': back_x,
-                    'y': back_y,
-                    'dx': -math.cos(math.radians(spread_angle)) * speed,
-                    'dy': -math.sin(math.radians(spread_angle)) * speed,
-                    'size': size,
-                    'color': color,
-                    'life': 20,  # Original life
-                    'fade_rate': random() * 0.1 + 0.05  # Original fade rate
-                })
+            # Add multiple particles per frame, sprayed out of the back
+            self.particles.emit_cone(back_x, back_y, self.angle + 180, self.exhaust,
+                                     speed=(5, 10), size=(1, 4), life=20,
+                                     fade=(0.05, 0.15))
         
-        # Backward thrust with DOWN and S
-        elif keys[pygame.K_DOWN] or keys[pygame.K_s]:
+        # Backward thrust with DOWN or S
+        elif self.pressed(keys, "reverse"):
             if not self.thrust:
                 self.thrust_start_time = time.time()
                 self.thrust = True
@@ -623,23 +965,11 @@ class Rocket:
             front_x = self.x + math.cos(math.radians(self.angle)) * self.size
             front_y = self.y + math.sin(math.radians(self.angle)) * self.size
             
-            # Add multiple particles for reverse thrust
-            for _ in range(5):
-                spread_angle = self.angle + 180 + randint(-20, 20)
-                speed = random() * 3 + 3  # Reduced speed range
-                size = random() * 1.5 + 0.5   # Smaller size range
-                color = choice(self.fire_colors)
-                
-                self.particles.append({
-                    'x': front_x,
-                    'y': front_y,
-                    'dx': math.cos(math.radians(spread_angle)) * speed,
-                    'dy': math.sin(math.radians(spread_angle)) * speed,
-                    'size': size,
-                    'color': color,
-                    'life': 15,  # Shorter life
-                    'fade_rate': random() * 0.15 + 0.1  # Faster fade
-                })
+            # Add multiple particles for reverse thrust: slower, smaller,
+            # shorter lived and fading faster
+            self.particles.emit_cone(front_x, front_y, self.angle + 180, self.exhaust,
+                                     speed=(3, 6), size=(0.5, 2), life=15,
+                                     fade=(0.1, 0.25))
         else:
             self.thrust = False
             self.thrust_start_time = 0
@@ -658,45 +988,34 @@ class Rocket:
         self.y = self.y % HEIGHT
 
         # Update particles
-        for particle in self.particles[:]:
-            particle['x'] += particle['dx']
-            particle['y'] += particle['dy']
-            particle['life'] -= particle['fade_rate']
-            particle['size'] = max(0.1, particle['size'] - 0.1)
-            
-            # Remove dead particles
-            if particle['life'] <= 0:
-                self.particles.remove(particle)
-
-    def draw(self, screen):
+        self.particles.update()
+
+    def at_rest(self):
+        # Not moving and nothing left flying around
+        return (not self.thrust and abs(self.speed) < 0.05
+                and not len(self.particles) and not len(self.bullets))
+
+    def pose(self, lag):
+        # x, y and angle to draw the rocket at, lag of an update back towards
+        # the previous one. A rocket that jumped (wrapped around the screen
+        # or was reset) is drawn where it is
+        if not lag or self.previous is None:
+            return self.x, self.y, self.angle
+        x, y, angle = self.previous
+        jump = self.max_speed * 2
+        if abs(self.x - x) > jump or abs(self.y - y) > jump:
+            return self.x, self.y, self.angle
+        return (self.x + (x - self.x) * lag, self.y + (y - self.y) * lag,
+                self.angle + (angle - self.angle) * lag)
+
+    def draw(self, queue, lag=0.0):
         # Draw bullets
-        for bullet in self.bullets:
-            bullet.draw(screen)
+        self.bullets.draw(queue, lag)
 
         # Draw particles first (behind rocket)
-        for particle in self.particles:
-            alpha = int(255 * (particle['life'] / 20))  # Back to original life value
-            color = (*particle['color'], alpha)
-            
-            # Create a surface for the glowing particle
-            size = int(particle['size'] * 4)  # Original glow size multiplier
-            particle_surf = pygame.Surface((size, size), pygame.SRCALPHA)
-            
-            # Draw multiple circles for glow effect
-            for radius in range(int(particle['size'] * 2), 0, -1):  # Original glow radius
-                glow_alpha = int(alpha * (radius / (particle['size'] * 2)))
-                pygame.draw.circle(
-                    particle_surf,
-                    (*particle['color'], glow_alpha),
-                    (size//2, size//2),
-                    radius
-                )
-            
-            # Draw the particle
-            screen.blit(
-                particle_surf,
-                (int(particle['x'] - size//2), int(particle['y'] - size//2))
-            )
+        queue.layer = LAYER_PLAYER
+        self.particles.draw(queue, lag)
+        x, y, angle = self.pose(lag)
 
         # Draw rocket image based on stage
         if self.stage1_image and self.stage2_image and self.stage3_image:
@@ -710,22 +1029,21 @@ class Rocket:
                 else:
                     self.current_image = self.stage3_image
             
-            # Rotate image
-            rotated_image = pygame.transform.rotate(self.current_image, -self.angle - 90)
-            # Get rect for centered drawing
-            rect = rotated_image.get_rect(center=(self.x, self.y))
-            screen.blit(rotated_image, rect)
+            # Rotated image centered on the rocket (from the sprite cache, or
+            # rotated by the texture renderer)
+            queue.blit_transformed(self.current_image, (x, y), -angle - 90,
+                                   angle_step=ROCKET_TURN_STEP)
         else:
             # Fallback to original triangle drawing if images not available
             points = [
-                (self.x + math.cos(math.radians(self.angle)) * self.size,
-                 self.y + math.sin(math.radians(self.angle)) * self.size),
-                (self.x + math.cos(math.radians(self.angle + 140)) * self.size,
-                 self.y + math.sin(math.radians(self.angle + 140)) * self.size),
-                (self.x + math.cos(math.radians(self.angle + 220)) * self.size,
-                 self.y + math.sin(math.radians(self.angle + 220)) * self.size)
+                (x + math.cos(math.radians(angle)) * self.size,
+                 y + math.sin(math.radians(angle)) * self.size),
+                (x + math.cos(math.radians(angle + 140)) * self.size,
+                 y + math.sin(math.radians(angle + 140)) * self.size),
+                (x + math.cos(math.radians(angle + 220)) * self.size,
+                 y + math.sin(math.radians(angle + 220)) * self.size)
             ]
-            pygame.draw.polygon(screen, WHITE, points)
+            queue.draw(pygame.draw.polygon, WHITE, points)
 
 class InfoScreen:
     def __init__(self, planet_name, info):
@@ -740,21 +1058,37 @@ class InfoScreen:
             self.font_title = pygame.font.SysFont('courier', 48)
             self.font_info = pygame.font.SysFont('courier', 36)
 
-    def draw(self, screen):
-        screen.fill(BLACK)
+        self.layer = None
+
+    def build_layer(self, size):
+        # The whole screen is static text, rendered once
+        layer = surface_pool.new(size).convert()
+        layer.fill(BLACK)
         
         # Draw title
-        title = self.font_title.render(self.info[0], True, WHITE)
-        screen.blit(title, (WIDTH//2 - title.get_width()//2, 50))
+        title = text_cache.render(self.font_title, self.info[0], WHITE)
+        layer.blit(title, (WIDTH//2 - title.get_width()//2, 50))
 
         # Draw info lines
         for i, line in enumerate(self.info[1:], 1):
-            text = self.font_info.render(line, True, WHITE)
-            screen.blit(text, (WIDTH//2 - text.get_width()//2, 100 + i * 40))
+            text = text_cache.render(self.font_info, line, WHITE)
+            layer.blit(text, (WIDTH//2 - text.get_width()//2, 100 + i * 40))
 
         # Draw exit instruction
-        exit_text = self.font_info.render("Press ESC to return to space", True, WHITE)
-        screen.blit(exit_text, (WIDTH//2 - exit_text.get_width()//2, HEIGHT - 100))
+        exit_text = text_cache.render(self.font_info, "Press ESC to return to space", WHITE)
+        layer.blit(exit_text, (WIDTH//2 - exit_text.get_width()//2, HEIGHT - 100))
+        self.layer = layer
+
+    def draw(self, queue, dirty=None):
+        # With dirty rects only the areas under last frame's drawables are restored
+        if self.layer is None or self.layer.get_size() != queue.get_size():
+            self.build_layer(queue.get_size())
+            if dirty:
+                dirty.invalidate()
+        if dirty:
+            dirty.queue_clear(queue, self.layer, LAYER_BACKGROUND)
+        else:
+            queue.blit(self.layer, (0, 0), layer=LAYER_BACKGROUND)
 
 
 
@@ -772,8 +1106,10 @@ class QuizScreen:
         self.current_animation = 'idle'  # Initialize current_animation
         
         # Initialize stars for background
-        self.stars = [(randint(0, WIDTH), randint(0, HEIGHT), random() * 2, choice(STAR_COLORS)) 
-                     for _ in range(100)]
+        self.stars = Starfield.shimmering(int(100 * parent.quality.settings["stars"]),
+                                          WIDTH, HEIGHT, STAR_COLORS)
+        self.layer = None
+        self.layer_state = None
 
         # Initialize font
         try:
@@ -813,6 +1149,9 @@ class QuizScreen:
             'answer4': {'rect': pygame.Rect(WIDTH*3//4 - 200, HEIGHT//2 + 50, 400, 50), 'color': (100, 100, 200)},
             'back': {'rect': pygame.Rect(WIDTH//2 - 120, HEIGHT - 60, 240, 40), 'color': (100, 100, 200)}
         }
+        for key, data in self.options.items():
+            data['button'] = Button(data['rect'], "BACK" if key == 'back' else "",
+                                    data['color'], self.font)
 
     def get_new_question(self):
         try:
@@ -872,23 +1211,16 @@ class QuizScreen:
                 return 'back'
         return None
 
-    def draw(self, screen, rocket):
-        # Draw background
-        screen.fill(BLACK)
-        
-        # Draw stars
-        for x, y, size, color in self.stars:
-            star_x = (x - rocket.x/16) % WIDTH
-            star_y = (y - rocket.y/16) % HEIGHT
-            brightness = 0.7 + (math.sin(time.time() * 2 + x * y) * 0.3)
-            star_color = tuple(int(c * brightness) for c in color)
-            pygame.draw.circle(screen, star_color, (int(star_x), int(star_y)), size)
+    def build_layer(self, size):
+        # Question and answer buttons on a transparent layer, redrawn over the
+        # stars. Rebuilt only when the question or the highlight changes
+        layer = surface_pool.get(size, pygame.SRCALPHA)
 
         # Draw question
         if self.current_question:
-            question_surface = self.font.render(self.current_question["question"], True, WHITE)
+            question_surface = text_cache.render(self.font, self.current_question["question"], WHITE)
             question_rect = question_surface.get_rect(center=(WIDTH//2, HEIGHT//4))
-            screen.blit(question_surface, question_rect)
+            layer.blit(question_surface, question_rect)
         
         # Draw answer options
         for i, (key, data) in enumerate(self.options.items()):
@@ -902,25 +1234,28 @@ class QuizScreen:
             if self.show_correct_answer and i == self.current_question['correct']:
                 button_color = (100, 255, 100)
             
-            # Draw button with glow
-            glow_rect = data['rect'].inflate(8, 8)
-            for g in range(3):
-                glow_alpha = 100 - g * 30
-                glow_surface = pygame.Surface((glow_rect.width, glow_rect.height), pygame.SRCALPHA)
-                pygame.draw.rect(glow_surface, (*button_color, glow_alpha), 
-                               glow_surface.get_rect(), border_radius=10)
-                screen.blit(glow_surface, glow_rect.topleft)
-            
-            # Draw main button
-            button_surface = pygame.Surface((data['rect'].width, data['rect'].height), pygame.SRCALPHA)
-            pygame.draw.rect(button_surface, (*button_color, 200), 
-                           button_surface.get_rect(), border_radius=8)
-            screen.blit(button_surface, data['rect'].topleft)
-            
-            # Draw text
-            text_surface = self.font.render(text, True, WHITE)
-            text_rect = text_surface.get_rect(center=data['rect'].center)
-            screen.blit(text_surface, text_rect)
+            # Draw button with glow, recomposed only when its text or color changes
+            data['button'].draw(layer, text, button_color)
+        return crop_layer(layer)
+
+    def draw(self, queue, rocket):
+        dirty = self.parent.dirty
+        question = self.current_question
+        state = (question["question"], tuple(question["answers"]),
+                 self.show_correct_answer and question["correct"], queue.get_size())
+        if state != self.layer_state:
+            self.layer = self.build_layer(queue.get_size())
+            self.layer_state = state
+            dirty.invalidate()
+
+        # Draw background
+        dirty.queue_clear(queue, BLACK, LAYER_BACKGROUND)
+        
+        # Draw stars with parallax against the rocket
+        queue.draw(self.stars.draw, (rocket.x / 16, rocket.y / 16), dirty.active, layer=LAYER_STARS)
+
+        # Question and buttons stay above the stars
+        dirty.queue_overlay(queue, *self.layer, LAYER_UI)
 
         # Draw result if there is one
         if self.result is not None:
@@ -931,10 +1266,13 @@ class QuizScreen:
                 result_text = "Wrong Answer!"
                 color = (255, 100, 100)
             
-            result_surface = self.font.render(result_text, True, color)
+            result_surface = text_cache.render(self.font, result_text, color)
             result_rect = result_surface.get_rect(center=(WIDTH//2, HEIGHT//3))
-            screen.blit(result_surface, result_rect)
-            
+            queue.blit(result_surface, result_rect, layer=LAYER_UI)
+
+    def update(self):
+        self.stars.update()
+        if self.result is not None:
             self.result_timer -= 1
             if self.result_timer <= 0:
                 self.result = None
@@ -946,7 +1284,8 @@ class QuizScreen:
         rocket.speed = 0
         self.rocket_reset_position = False
 
-    def get_questions_for_planet(self, planet_name):
+    @staticmethod
+    def get_questions_for_planet(planet_name):
         """Return a list of questions for the specified planet."""
         if planet_name == "Sun":
             return [
@@ -1075,13 +1414,19 @@ class QuizScreen:
             return []
 
 class SpaceExplorer:
-    def __init__(self):
+    def __init__(self, quality=QUALITY_AUTO, players=1):
         # Add fullscreen tracking
         self.fullscreen = False
         self.window_size = (WIDTH, HEIGHT)
         
         # Initialize display
-        self.screen = pygame.display.set_mode(self.window_size)
+        self.backend = None
+        if RENDER_BACKEND == "texture":
+            from texture_backend import TextureBackend
+            self.backend = TextureBackend("Space Explorer", (WIDTH, HEIGHT))
+            self.screen = pygame.display.get_surface()
+        else:
+            self.screen = pygame.display.set_mode(self.window_size)
         pygame.display.set_caption("Space Explorer")
         
         # Load custom pixel font
@@ -1100,20 +1445,58 @@ class SpaceExplorer:
             self.score_font = pygame.font.SysFont('courier', 48)
             self.popup_font = pygame.font.SysFont('courier', 36)
         
+        # Glyph atlases for the score and popups, whose text changes constantly
+        self.score_glyphs = GlyphAtlas(self.score_font, glow_radius=4)
+        self.popup_glyphs = GlyphAtlas(self.popup_font)
+        
         # Rest of your initialization code...
         self.planets = [Planet(name, data) for name, data in planets.items() if name != "Sun"]
-        self.stars = [Star() for _ in range(200)]
-        self.rocket = Rocket()
-        self.asteroids = []
+        self.moons = [Moon(name, moon, planet) for planet in self.planets
+                      for name, moon in planets[planet.name].get("moons", {}).items()]
+        # Every planet and moon is placed by one closed-form pass over their
+        # orbits at self.orbit_time, in orbital steps: one per simulation step,
+        # time_warp with the time warp on
+        self.ephemeris = Ephemeris()
+        for planet in self.planets:
+            planet.index = self.ephemeris.add(**planet.elements)
+        for moon in self.moons:
+            moon.index = self.ephemeris.add(parent=moon.planet.index, **moon.elements)
+        self.time_warp = 1
+        self.planet_moons = {planet: [moon for moon in self.moons if moon.planet is planet]
+                             for planet in self.planets}
+        self.stars = Starfield.twinkling(200, WIDTH, HEIGHT, STAR_COLORS)
+        # One rocket per player. self.rocket is the one that drives the
+        # planet, facts and quiz screens: the one that last landed on a planet
+        if players > 1:
+            self.rockets = [Rocket(home, controls)
+                            for home, controls in zip(PLAYER_HOMES, PLAYER_CONTROLS[:players])]
+        else:
+            self.rockets = [Rocket()]
+        self.rocket = self.rockets[0]
+        # The bloom pass reads back the frame, which the texture backend does
+        # not keep in a surface
+        self.bloom = None
+        if BLOOM and self.backend:
+            print("Bloom needs the surface render backend, drawing per-object glows")
+        elif BLOOM:
+            self.bloom = Bloom((WIDTH, HEIGHT), intensity=BLOOM_INTENSITY)
+            for rocket in self.rockets:
+                rocket.particles.glow = 1  # Plain exhaust, the bloom makes it glow
+        self.asteroids = AsteroidStore()
         self.current_info_screen = None
         self.current_quiz_screen = None
         self.cooldown = 0
         self.planet_view = False
         self.current_planet = None
         self.transition_alpha = 0
-        self.planet_view_stars = [(randint(0, WIDTH), randint(0, HEIGHT), random() * 2, choice(STAR_COLORS)) 
-                                for _ in range(150)]
+        self.planet_view_stars = Starfield.shimmering(150, WIDTH, HEIGHT, STAR_COLORS)
         self.surface_details = []
+        self.stage2_images = {}
+
+        # Particle counts, trails, stars, glows and asteroids follow the
+        # quality tier, fixed or adapted to the frame times
+        self.quality = QualityController(quality)
+        self.apply_quality()
         self.options = {
             'facts': {'rect': pygame.Rect(20, 20, 100, 40), 'color': (100, 200, 100)},
             'quiz': {'rect': pygame.Rect(WIDTH - 120, 20, 100, 40), 'color': (200, 100, 100)},
@@ -1122,18 +1505,23 @@ class SpaceExplorer:
         
         # Add sun image loading
         try:
-            self.sun_image = pygame.image.load(os.path.join(ASSETS_DIR, "sun.png")).convert_alpha()
+            sun_source = pygame.image.load(os.path.join(ASSETS_DIR, "sun.png")).convert_alpha()
             # Scale the sun image (reduced size from 150 to 100)
-            self.sun_image = pygame.transform.scale(self.sun_image, (100, 100))
+            self.sun_image = pygame.transform.scale(sun_source, (100, 100))
+            self.sun_mipmap = Mipmap(self.sun_image, sun_source)
             self.use_sun_image = True
             self.sun_rotation = 0
             self.sun_rotation_speed = 0.1
+            self.sun_sprites = SpriteCache(SUN_SPRITE_BYTES)
         except pygame.error as e:
             print(f"Could not load sun image: {e}")
             self.use_sun_image = False
+            # Build the pulsing core variants now instead of mid-game
+            glow_cache.prewarm_discs(YELLOW, 50, 60)
         
         # Add menu state and font
         self.in_menu = True
+        self.sprites_warm = False
         self.menu_alpha = 0
         self.alpha_direction = 1
         
@@ -1143,15 +1531,60 @@ class SpaceExplorer:
             'color': (100, 100, 200),
             'hover': False
         }
-        self.comets = []
+        self.launch_button['button'] = Button(self.launch_button['rect'], "LAUNCH",
+                                              self.launch_button['color'], self.menu_font, glow=16)
+        self.comets = CometStore()
         self.comet_spawn_timer = 0
         
+        # Shared layer for planet and comet trails
+        self.trail_renderer = TrailRenderer(self.screen.get_size())
+        
+        # Zoom and pan of the solar system view, around the Sun
+        self.camera = Camera(self.screen.get_size(), (WIDTH // 2, HEIGHT // 2))
+
+        # Two or more players share the solar system view side by side
+        self.split_screen = SplitScreen(self.screen.get_size(), players) if players > 1 else None
+
+        # The solar system at a random date
+        self.set_orbit_time(randint(0, 100000))
+
+        # Pre-composed sky and orbit rings for the solar system view
+        self.build_background_layer()
+        
         # Add development button with increased width
         self.dev_button = {
             'rect': pygame.Rect(WIDTH//2 - 250, HEIGHT//2 + 150, 500, 80),  # Increased width from 300 to 400
             'color': (100, 200, 100),
             'hover': False
         }
+        self.dev_button['button'] = Button(self.dev_button['rect'], "DEVELOPMENT",
+                                           self.dev_button['color'], self.menu_font, glow=16)
+        self.menu_layer = None
+        self.menu_layer_state = None
+
+        # Dirty rectangle presenting for the mostly static screens
+        self.dirty = DirtyRects(self.screen, enabled=DIRTY_RECTS and not self.backend)
+
+        # Every scene submits its drawing here, flushed once per frame
+        self.render_queue = RenderQueue(self.screen.get_size())
+        self.fade_surface = surface_pool.new((WIDTH, HEIGHT)).convert()
+        self.frame_count = 0
+        self.stats_time = time.perf_counter()
+        self.stats_cpu = time.process_time()
+        self.stats_frames = 0
+
+        # The simulation advances in fixed steps; lag is how far behind the
+        # last step the frame being drawn is, as a fraction of a step
+        self.timestep = FixedTimestep()
+        self.lag = 0.0
+
+        # Idle throttling: events that woke the loop, and the window state
+        self.pending_events = []
+        self.minimized = False
+        self.focused = True
+        
+        # Retained buttons of the planet view, keyed by rect
+        self.option_buttons = {}
         
         # Add development mode properties
         self.in_dev_mode = False
@@ -1182,6 +1615,10 @@ class SpaceExplorer:
         self.planet_platformer = None
         self.score = 0
         self.score_popups = []  # List of dictionaries containing score popup info
+
+        # Clock of the frame drawn by render_frame, None while the game runs live
+        self.frame_time = None
+        self.offscreen_quizzes = {}
         
     def add_score(self, points, x, y):
         try:
@@ -1214,36 +1651,30 @@ class SpaceExplorer:
             if popup['lifetime'] <= 0:
                 self.score_popups.remove(popup)
 
-    def draw_score(self, screen):
+    def draw_score(self, queue, popups=True):
+        # Glyph atlases set the alpha of their shared atlas per draw, so they
+        # run in order at flush time instead of queueing their blits
         # Draw main score counter
         score_text = f"Score: {self.score}"
-        score_surface = self.score_font.render(score_text, True, WHITE)
-        score_rect = score_surface.get_rect(midtop=(WIDTH // 2, 10))
-        
-        # Add glow effect to score
-        glow_surface = pygame.Surface((score_rect.width + 4, score_rect.height + 4), pygame.SRCALPHA)
-        for offset in range(3):
-            glow_alpha = max(0, 100 - offset * 30)  # Prevent negative alpha
-            glow_text = self.score_font.render(score_text, True, (255, 255, 255, glow_alpha))
-            glow_rect = glow_text.get_rect(center=(glow_surface.get_width()//2, glow_surface.get_height()//2))
-            glow_surface.blit(glow_text, glow_rect)
-        
-        screen.blit(glow_surface, (score_rect.x - 2, score_rect.y - 2))
-        screen.blit(score_surface, score_rect)
-        
-        # Draw score popups with colors
+        queue.draw(self.score_glyphs.draw, score_text, (WIDTH // 2, 10), WHITE, 255, True, "midtop",
+                   layer=LAYER_UI)
+        if popups:
+            self.draw_score_popups(queue)
+
+    def draw_score_popups(self, queue):
+        # Draw score popups with colors, where the points were scored
         for popup in self.score_popups:
             alpha = max(0, min(255, int(popup['alpha'])))  # Clamp alpha between 0 and 255
-            color = (*popup['color'][:3], alpha)  # Use stored color with calculated alpha
-            popup_surface = self.popup_font.render(popup['text'], True, color)
-            popup_rect = popup_surface.get_rect(center=(popup['x'], popup['y']))
-            screen.blit(popup_surface, popup_rect)
+            queue.draw(self.popup_glyphs.draw, popup['text'], (popup['x'], popup['y']),
+                       popup['color'], alpha, False, "center", layer=LAYER_UI)
 
     def reset_rocket_position(self):
         if not self.planet_view:
-            # Position rocket in the top left of the solar system screen
-            self.rocket.x = 100
-            self.rocket.y = 100
+            # Every rocket back to its start in the solar system screen (the
+            # top left for the first player)
+            for rocket in self.rockets:
+                rocket.x, rocket.y = rocket.home
+                rocket.speed = 0
         else:
             if self.current_quiz_screen:
                 # Position rocket in the middle for quiz
@@ -1256,38 +1687,32 @@ class SpaceExplorer:
         self.rocket.speed = 0
         self.cooldown = 30
 
-    def check_collisions(self):
+    def check_collisions(self, rocket):
         if not self.planet_view:
+            rocket = (rocket.x, rocket.y, rocket.size)
+
             # Check collision with comets
-            for comet in self.comets[:]:
-                try:
-                    distance = math.sqrt(
-                        (self.rocket.x - comet.x)**2 + 
-                        (self.rocket.y - comet.y)**2
-                    )
-                    if distance < self.rocket.size + comet.size:
-                        self.comets.remove(comet)
-                        self.add_score(1, comet.x, comet.y)
-                        return None
-                except Exception as e:
-                    print(f"Error in comet collision: {e}")
-                    continue
-
-            # Existing planet collision checks
-            distance_to_sun = math.sqrt(
-                (self.rocket.x - WIDTH//2)**2 + 
-                (self.rocket.y - HEIGHT//2)**2
-            )
-            if distance_to_sun < 40 + self.rocket.size:
+            if len(self.comets):
+                index = first_hit(*rocket, self.comets.column("x"),
+                                  self.comets.column("y"), self.comets.column("size"))
+                if index is not None:
+                    comet = self.comets[index]
+                    self.add_score(1, comet.x, comet.y)
+                    self.comets.remove(comet)
+                    return None
+
+            # Planet collision checks, the Sun first, where the camera shows them
+            positions = [self.camera.to_screen(WIDTH // 2, HEIGHT // 2)]
+            positions += [self.camera.to_screen(planet.x, planet.y) for planet in self.planets]
+            zoom = self.camera.zoom
+            index = first_hit(*rocket,
+                              [x for x, _ in positions],
+                              [y for _, y in positions],
+                              [40 * zoom] + [planet.radius * zoom for planet in self.planets])
+            if index == 0:
                 return Planet("Sun", planets["Sun"])
-            
-            for planet in self.planets:
-                distance = math.sqrt(
-                    (self.rocket.x - planet.x)**2 + 
-                    (self.rocket.y - planet.y)**2
-                )
-                if distance < planet.radius + self.rocket.size:
-                    return planet
+            if index is not None:
+                return self.planets[index - 1]
         return None
 
     def enter_planet_view(self, planet):
@@ -1333,25 +1758,34 @@ class SpaceExplorer:
         return None
 
     def draw_option_button(self, screen, rect, text, color):
-        # Draw button background with glow
-        glow_rect = rect.inflate(8, 8)
-        for i in range(3):
-            glow_alpha = 100 - i * 30
-            glow_surface = pygame.Surface((glow_rect.width, glow_rect.height), pygame.SRCALPHA)
-            pygame.draw.rect(glow_surface, (*color, glow_alpha), 
-                           glow_surface.get_rect(), border_radius=10)
-            screen.blit(glow_surface, glow_rect.topleft)
-        
-        # Draw main button
-        button_surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-        pygame.draw.rect(button_surface, (*color, 200), 
-                        button_surface.get_rect(), border_radius=8)
-        screen.blit(button_surface, rect.topleft)
-        
-        # Draw text
-        text_surface = self.large_font.render(text, True, WHITE)
-        text_rect = text_surface.get_rect(center=rect.center)
-        screen.blit(text_surface, text_rect)
+        # One retained button per rect, recomposed only when its state changes
+        button = self.option_buttons.get(tuple(rect))
+        if button is None:
+            button = self.option_buttons[tuple(rect)] = Button(rect, text, color, self.large_font)
+        button.draw(screen, text, color)
+
+    def build_background_layer(self):
+        # Everything in the solar system view that never changes, drawn once and
+        # copied in place of clearing the screen. Rebuilt when the display or
+        # the camera changes (a new surface, so the texture backend uploads it).
+        self.background_layer = surface_pool.new(self.screen.get_size()).convert()
+        self.background_layer.fill(BLACK)
+        for planet in self.planets:
+            planet.draw_orbit(self.background_layer, self.camera,
+                              self.project(self.ephemeris.orbit(planet.index)))
+        self.background_state = self.camera.state
+
+    def draw_comets(self, queue):
+        # Trails go through the shared trail layer, heads are drawn on top
+        queue.draw(self.draw_comet_trails, layer=LAYER_OBJECTS)
+        self.comets.draw(queue, self.lag)
+
+    def draw_comet_trails(self, screen):
+        # Runs at flush time: the trail layer is shared with the planets and
+        # wiped every time it is composited
+        for trail in self.comets.trails():
+            self.trail_renderer.add(trail, WHITE)
+        return self.trail_renderer.draw(screen)
 
     def update_space_objects(self):
         # Update comets
@@ -1361,50 +1795,51 @@ class SpaceExplorer:
                 self.comets.append(Comet())
                 self.comet_spawn_timer = randint(120, 240)
         
-        # Update existing comets
-        for comet in self.comets[:]:
-            comet.update()
-            if (comet.x < -50 or comet.x > WIDTH + 50 or 
-                comet.y < -50 or comet.y > HEIGHT + 50):
-                self.comets.remove(comet)
+        # Update existing comets, dropping the ones that left the screen
+        self.comets.update()
         
         # Update asteroids
-        if len(self.asteroids) < MAX_ASTEROIDS and random() < ASTEROID_SPAWN_RATE:
+        max_asteroids = max(1, int(MAX_ASTEROIDS * self.quality.settings["asteroids"]))
+        if len(self.asteroids) < max_asteroids and random() < ASTEROID_SPAWN_RATE:
             self.asteroids.append(Asteroid())
 
-        for asteroid in self.asteroids[:]:
-            asteroid.update()
+        # Move asteroids, dropping the ones far off screen
+        self.asteroids.update()
             
-            # Check collision with bullets
-            for bullet in self.rocket.bullets[:]:
-                if asteroid.check_collision(bullet.x, bullet.y, bullet.size):
-                    if asteroid in self.asteroids:
-                        self.asteroids.remove(asteroid)
-                    if bullet in self.rocket.bullets:
-                        self.rocket.bullets.remove(bullet)
-                    break
-            
-            # Remove asteroids that are far off screen
-            if (asteroid.x < -100 or asteroid.x > WIDTH + 100 or 
-                asteroid.y < -100 or asteroid.y > HEIGHT + 100):
-                if asteroid in self.asteroids:
-                    self.asteroids.remove(asteroid)
+        # Check collision with bullets
+        for rocket in self.rockets:
+            self.asteroids.hit_by(rocket.bullets)
 
-    def draw_planet_screen(self, screen):
+    def draw_planet_screen(self, queue):
         # Draw a space background
-        screen.fill(BLACK)
+        queue.fill(BLACK, layer=LAYER_BACKGROUND)
 
         # Draw background stars with slower movement
-        for x, y, size, color in self.planet_view_stars:
-            star_x = (x - self.rocket.x/8) % WIDTH
-            star_y = (y - self.rocket.y/8) % HEIGHT
-            brightness = 0.7 + (math.sin(time.time() * 2 + x * y) * 0.3)
-            star_color = tuple(int(c * brightness) for c in color)
-            pygame.draw.circle(screen, star_color, (int(star_x), int(star_y)), size)
-
-        # Load and draw the Stage 2 planet image
+        queue.draw(self.planet_view_stars.draw, (self.rocket.x / 8, self.rocket.y / 8),
+                   layer=LAYER_STARS)
+
+        # Draw the Stage 2 planet image
+        planet_image = self.stage2_image(self.current_planet.name)
+        if planet_image:
+            # Center the image on screen
+            x = WIDTH // 2 - planet_image.get_width() // 2
+            y = HEIGHT // 2 - planet_image.get_height() // 2
+            queue.blit(planet_image, (x, y), layer=LAYER_WORLD)
+
+        # Draw interactive options
+        queue.layer = LAYER_UI
+        self.draw_option_button(queue, self.options['facts']['rect'], "FACTS", self.options['facts']['color'])
+        self.draw_option_button(queue, self.options['quiz']['rect'], "QUIZ", self.options['quiz']['color'])
+        self.draw_option_button(queue, self.options['back']['rect'], "BACK", self.options['back']['color'])
+
+    def stage2_image(self, name):
+        # Stage 2 planet image scaled to the screen, loaded on first use.
+        # None if it could not be loaded
+        if name in self.stage2_images:
+            return self.stage2_images[name]
+        planet_image = None
         try:
-            image_path = os.path.join(ASSETS_DIR, "stage2", planets[self.current_planet.name]["stage2_image"])
+            image_path = os.path.join(ASSETS_DIR, "stage2", planets[name]["stage2_image"])
             planet_image = pygame.image.load(image_path).convert_alpha()
             
             # Scale image to fit screen while maintaining aspect ratio
@@ -1413,159 +1848,251 @@ class SpaceExplorer:
             new_width = int(planet_image.get_width() * scale)
             new_height = int(planet_image.get_height() * scale)
             planet_image = pygame.transform.scale(planet_image, (new_width, new_height))
-            
-            # Center the image on screen
-            x = WIDTH // 2 - new_width // 2
-            y = HEIGHT // 2 - new_height // 2
-            screen.blit(planet_image, (x, y))
         except (pygame.error, FileNotFoundError) as e:
-            print(f"Could not load Stage 2 image for {self.current_planet.name}: {e}")
-            # Fallback to original drawing method if image loading fails
-            # ... existing planet drawing code ...
-
-        # Draw interactive options
-        self.draw_option_button(screen, self.options['facts']['rect'], "FACTS", self.options['facts']['color'])
-        self.draw_option_button(screen, self.options['quiz']['rect'], "QUIZ", self.options['quiz']['color'])
-        self.draw_option_button(screen, self.options['back']['rect'], "BACK", self.options['back']['color'])
-
-    def draw_sun(self):
+            print(f"Could not load Stage 2 image for {name}: {e}")
+        self.stage2_images[name] = planet_image
+        return planet_image
+
+    def draw_sun(self, queue):
+        # The Sun at its place in the camera view, at the camera's zoom
+        center_x, center_y = self.camera.to_screen(WIDTH // 2, HEIGHT // 2)
+        zoom = self.camera.zoom
+        now = time.time() if self.frame_time is None else self.frame_time
         if self.use_sun_image:
-            # Update rotation
-            self.sun_rotation = (self.sun_rotation + self.sun_rotation_speed) % 360
+            if not self.camera.visible(center_x, center_y, 100 * zoom):
+                return
             
             # Create pulsing effect for the image
-            pulse = abs(math.sin(time.time())) * 10
+            pulse = abs(math.sin(now)) * 10
             pulse_size = int(100 + pulse)  # Base size 100px + pulse
             
-            # Draw sun glow/corona
-            corona_surfaces = []
-            for i in range(5):
-                corona_surf = pygame.Surface((200, 200), pygame.SRCALPHA)
-                radius = 80 + i * 10
-                alpha = int(100 * (1 - i/5))
-                pygame.draw.circle(corona_surf, (255, 200, 50, alpha), (100, 100), radius)
-                corona_surfaces.append(corona_surf)
-            
-            # Draw corona layers
-            for surf in corona_surfaces:
-                screen.blit(surf, (WIDTH//2 - 100, HEIGHT//2 - 100))
-            
-            # Scale and rotate the sun image
-            scaled_sun = pygame.transform.scale(
-                self.sun_image, 
-                (pulse_size, pulse_size)
-            )
-            rotated_sun = pygame.transform.rotate(scaled_sun, self.sun_rotation)
-            
-            # Center the sun image
-            sun_rect = rotated_sun.get_rect(
-                center=(WIDTH // 2, HEIGHT // 2)
+            # Draw sun glow/corona (all five layers pre-composited)
+            if self.glow and not self.bloom:
+                corona = glow_cache.corona((255, 200, 50), round(200 * zoom), round(80 * zoom),
+                                           step=max(1, round(10 * zoom)))
+                queue.blit(corona, corona.get_rect(center=(center_x, center_y)))
+            
+            # Draw the sun image for the zoom step, pulsing and rotating
+            # around the center. The pulse is snapped to a few scales
+            scale = round(pulse_size / self.sun_image.get_width() / SUN_PULSE_STEP) * SUN_PULSE_STEP
+            queue.blit_transformed(
+                self.sun_mipmap.level(self.camera.step),
+                (center_x, center_y),
+                self.sun_rotation,
+                scale,
+                angle_step=SUN_ANGLE_STEP,
+                cache=self.sun_sprites
             )
             
-            # Draw the sun image
-            screen.blit(rotated_sun, sun_rect)
-            
         else:
+            if not self.camera.visible(center_x, center_y, 60 * zoom):
+                return
             # Fallback to original sun drawing code
-            corona_surfaces = []
-            for i in range(5):
-                corona_surf = pygame.Surface((100, 100), pygame.SRCALPHA)
-                radius = 60 + i * 10
-                alpha = int(100 * (1 - i/5))
-                pygame.draw.circle(corona_surf, (255, 200, 50, alpha), (50, 50), radius)
-                corona_surfaces.append(corona_surf)
+            corona = glow_cache.corona((255, 200, 50), round(100 * zoom), round(60 * zoom),
+                                       step=max(1, round(10 * zoom)))
             
-            pulse = abs(math.sin(time.time())) * 10
+            pulse = abs(math.sin(now)) * 10
             
-            for surf in corona_surfaces:
-                screen.blit(surf, (WIDTH//2 - 50, HEIGHT//2 - 50))
+            if self.glow and not self.bloom:
+                queue.blit(corona, corona.get_rect(center=(center_x, center_y)))
             
-            pygame.draw.circle(screen, YELLOW, (WIDTH//2, HEIGHT//2), 50 + pulse)
+            # Sun core, one cached disc per pulse radius
+            core = glow_cache.disc(YELLOW, (50 + pulse) * zoom)
+            queue.blit(core, core.get_rect(center=(center_x, center_y)))
             
             for i in range(8):
-                angle = time.time() + i * math.pi/4
-                x = WIDTH//2 + math.cos(angle) * 45
-                y = HEIGHT//2 + math.sin(angle) * 45
-                pygame.draw.circle(screen, (255, 200, 50), (int(x), int(y)), 10)
-
-    def draw_menu(self, screen):
-        # Draw background
-        screen.fill(BLACK)
-        
-        # Draw animated stars
-        for star in self.stars:
-            star.update()
-            star.draw(screen)
-        
-        # Draw title text with glow effect
-        title_text = self.menu_font.render("SPACE EXPLORER", True, WHITE)
-        title_rect = title_text.get_rect(center=(WIDTH // 2, HEIGHT // 3))
-        
-        # Draw title glow
-        glow_surf = pygame.Surface((title_text.get_width() + 20, title_text.get_height() + 20), pygame.SRCALPHA)
-        glow_color = (255, 255, 255, self.menu_alpha)
-        glow_text = self.menu_font.render("SPACE EXPLORER", True, glow_color)
-        glow_rect = glow_text.get_rect(center=(glow_surf.get_width() // 2, glow_surf.get_height() // 2))
-        glow_surf.blit(glow_text, glow_rect)
-        screen.blit(glow_surf, (title_rect.x - 10, title_rect.y - 10))
-        screen.blit(title_text, title_rect)
-        
-        # Update button hover state
-        mouse_pos = pygame.mouse.get_pos()
-        self.launch_button['hover'] = self.launch_button['rect'].collidepoint(mouse_pos)
-        self.dev_button['hover'] = self.dev_button['rect'].collidepoint(mouse_pos)
+                angle = now + i * math.pi/4
+                x = center_x + math.cos(angle) * 45 * zoom
+                y = center_y + math.sin(angle) * 45 * zoom
+                queue.draw(pygame.draw.circle, (255, 200, 50), (int(x), int(y)), round(10 * zoom))
+
+    def update_solar_system(self):
+        self.stars.update()
+        warp = self.time_warp
+        if self.use_sun_image:
+            self.sun_rotation = (self.sun_rotation + self.sun_rotation_speed * warp) % 360
+        self.orbit_time += warp
+        offsets = self.ephemeris.positions(self.orbit_time)
+        self.orbit_before = self.orbit_positions
+        self.orbit_positions = self.project(offsets)
+        positions = self.orbit_positions.tolist()
+        offsets = offsets.tolist()
+        for planet in self.planets:
+            planet.update(positions[planet.index], offsets[planet.index], warp)
+        for moon in self.moons:
+            moon.x, moon.y = positions[moon.index]
+
+    def project(self, offsets):
+        # Solar system view positions of offsets from the Sun
+        return project(offsets, (WIDTH // 2, HEIGHT // 2), ORBIT_TILT)
+
+    def set_orbit_time(self, t):
+        # Put every planet and moon where it is at orbital step t, jumping
+        # there at once, with the trails left over the steps before at the
+        # current time warp
+        self.orbit_time = t
+        if self.use_sun_image:
+            self.sun_rotation = (self.sun_rotation_speed * t) % 360
+        spacing = self.time_warp or 1
+        length = max(planet.trail.capacity for planet in self.planets)
+        times = t - spacing * np.arange(length - 1, -1, -1)
+        offsets = self.ephemeris.positions(times)
+        paths = self.project(offsets)
+        for planet in self.planets:
+            planet.set_path(paths[:, planet.index].tolist(), offsets[-1, planet.index].tolist(), t)
+        for moon in self.moons:
+            moon.x, moon.y = paths[-1, moon.index].tolist()
+        # Screen positions of the last two updates, drawn between
+        self.orbit_positions = paths[-1]
+        self.orbit_before = paths[-2] if self.time_warp else paths[-1]
+
+    def change_time_warp(self, steps):
+        # Move along TIME_WARPS, respacing the trails for the new speed
+        index = TIME_WARPS.index(self.time_warp) + steps
+        warp = TIME_WARPS[max(0, min(len(TIME_WARPS) - 1, index))]
+        if warp != self.time_warp:
+            self.time_warp = warp
+            self.set_orbit_time(self.orbit_time)
+
+    def draw_time_warp(self, queue):
+        # Top left, while the orbits run at anything but their normal speed
+        if self.time_warp == 1:
+            return
+        if self.time_warp == 0:
+            text = "time stopped"
+        elif self.time_warp < 0:
+            text = f"time x{-self.time_warp} backwards"
+        else:
+            text = f"time x{self.time_warp}"
+        label = text_cache.render(self.font, text, WHITE, glow=HINT_GLOW)
+        padding = HINT_GLOW[1]
+        queue.blit(label, (20 - padding, 20 - padding), layer=LAYER_UI)
+
+    def draw_solar_system(self, queue):
+        # Everything of the solar system view but the rockets and the UI
+        # Opaque copy of the static layer clears the frame
+        if self.camera.state != self.background_state:
+            self.build_background_layer()
+        queue.blit(self.background_layer, (0, 0), layer=LAYER_BACKGROUND)
+        queue.draw(self.stars.draw, layer=LAYER_STARS)
+        queue.layer = LAYER_WORLD
+        self.draw_sun(queue)
+        for planet in self.planets:
+            self.trail_renderer.add(self.camera.points_to_screen(planet.trail.points()),
+                                    planet.color)
+        queue.draw(self.trail_renderer.draw)
+        # Planets and moons between the last two updates, each moon behind its
+        # planet on the far side of its orbit. Drawn along the straight line
+        # between them, so the ephemeris is solved once per step, not per frame
+        positions = self.orbit_positions
+        if self.lag:
+            positions = positions - (positions - self.orbit_before) * self.lag
+        positions = positions.tolist()
+        for planet in self.planets:
+            x, y = positions[planet.index]
+            around = self.planet_moons[planet]
+            for moon in around:
+                if positions[moon.index][1] < y:
+                    moon.draw(queue, self.camera, positions[moon.index])
+            planet.draw(queue, self.camera, glow=self.glow and not self.bloom, position=(x, y))
+            for moon in around:
+                if positions[moon.index][1] >= y:
+                    moon.draw(queue, self.camera, positions[moon.index])
+        # Draw comets and asteroids after planets
+        self.draw_comets(queue)
+        self.asteroids.draw(queue, self.lag)
+
+        if self.bloom and self.glow:
+            # Glows everything drawn below the UI
+            queue.draw(self.bloom.apply, layer=LAYER_EFFECTS)
+
+    def draw_player_hud(self, queue, viewports):
+        # Each split screen viewport's own HUD, over its copy of the world, in
+        # its bottom left corner clear of the shared score
+        padding = HINT_GLOW[1]
+        for number, rect in enumerate(viewports, 1):
+            label = text_cache.render(self.font, f"PLAYER {number}", WHITE, glow=HINT_GLOW)
+            queue.blit(label, label.get_rect(bottomleft=(rect.left + 20 - padding,
+                                                         rect.bottom - 20 + padding)),
+                       layer=LAYER_UI)
+
+    def in_solar_system_view(self):
+        return not (self.in_menu or self.in_dev_mode or self.planet_view
+                    or self.current_info_screen or self.current_quiz_screen)
+
+    def prewarm_sprites(self, budget=SPRITE_PREWARM_BUDGET):
+        # Fill the sprite cache with every rocket rotation a few entries per
+        # menu frame, so the first turns in game don't pay for transforms, and
+        # one planet globe of another zoom step per frame, so a wheel notch
+        # doesn't either
+        if self.sprites_warm:
+            return
+        done = True
+        missing = [(planet, step) for planet in self.planets if planet.sphere
+                   for step in ZOOM_STEPS if step not in planet.spheres]
+        if missing:
+            planet, step = missing[0]
+            planet.sphere_for(step)
+            done = len(missing) == 1
+        images = [image for rocket in self.rockets
+                  for image in (rocket.stage1_image, rocket.stage2_image, rocket.stage3_image)]
+        for image in images:
+            if image:
+                done = sprite_cache.prewarm(image, range(0, 360, ROCKET_TURN_STEP),
+                                            budget=budget, angle_step=ROCKET_TURN_STEP) and done
+        self.sprites_warm = done
+
+    def build_menu_layer(self, size):
+        # Title and buttons on a transparent layer drawn over the stars, cropped
+        # out of a pooled scratch surface
+        layer = surface_pool.get(size, pygame.SRCALPHA)
+
+        # Draw title text with glow effect. Font.render ignores the alpha of
+        # the color, so the glow does not change with menu_alpha and the
+        # composite is rendered once
+        title_text = text_cache.render(self.menu_font, "SPACE EXPLORER", WHITE, glow=TITLE_GLOW)
+        layer.blit(title_text, title_text.get_rect(center=(WIDTH // 2, HEIGHT // 3)))
         
         # Draw launch button with glow effect
         button_color = (150, 150, 255) if self.launch_button['hover'] else self.launch_button['color']
-        
-        # Draw button glow
-        glow_rect = self.launch_button['rect'].inflate(16, 16)
-        for i in range(3):
-            glow_alpha = 100 - i * 30
-            glow_surface = pygame.Surface((glow_rect.width, glow_rect.height), pygame.SRCALPHA)
-            pygame.draw.rect(glow_surface, (*button_color, glow_alpha), 
-                           glow_surface.get_rect(), border_radius=10)
-            screen.blit(glow_surface, glow_rect.topleft)
-        
-        # Draw main button
-        button_surface = pygame.Surface((self.launch_button['rect'].width, self.launch_button['rect'].height), pygame.SRCALPHA)
-        pygame.draw.rect(button_surface, (*button_color, 200), 
-                        button_surface.get_rect(), border_radius=8)
-        screen.blit(button_surface, self.launch_button['rect'].topleft)
-        
-        # Draw button text
-        launch_text = self.menu_font.render("LAUNCH", True, WHITE)
-        text_rect = launch_text.get_rect(center=self.launch_button['rect'].center)
-        screen.blit(launch_text, text_rect)
+        self.launch_button['button'].draw(layer, color=button_color)
         
         # Draw development button
         dev_color = (150, 255, 150) if self.dev_button['hover'] else self.dev_button['color']
+        self.dev_button['button'].draw(layer, color=dev_color)
+        return crop_layer(layer)
+
+    def draw_menu(self, queue):
+        # Update button hover state, the layer is rebuilt only when it changes
+        mouse_pos = self.mouse_pos()
+        self.launch_button['hover'] = self.launch_button['rect'].collidepoint(mouse_pos)
+        self.dev_button['hover'] = self.dev_button['rect'].collidepoint(mouse_pos)
+        state = (self.launch_button['hover'], self.dev_button['hover'], queue.get_size())
+        if state != self.menu_layer_state:
+            self.menu_layer = self.build_menu_layer(queue.get_size())
+            self.menu_layer_state = state
+            self.dirty.invalidate()
+
+        # Draw background
+        self.dirty.queue_clear(queue, BLACK, LAYER_BACKGROUND)
         
-        # Draw button glow
-        glow_rect = self.dev_button['rect'].inflate(16, 16)
-        for i in range(3):
-            glow_alpha = 100 - i * 30
-            glow_surface = pygame.Surface((glow_rect.width, glow_rect.height), pygame.SRCALPHA)
-            pygame.draw.rect(glow_surface, (*dev_color, glow_alpha), 
-                           glow_surface.get_rect(), border_radius=10)
-            screen.blit(glow_surface, glow_rect.topleft)
-        
-        # Draw main button
-        button_surface = pygame.Surface((self.dev_button['rect'].width, self.dev_button['rect'].height), pygame.SRCALPHA)
-        pygame.draw.rect(button_surface, (*dev_color, 200), 
-                        button_surface.get_rect(), border_radius=8)
-        screen.blit(button_surface, self.dev_button['rect'].topleft)
-        
-        # Draw button text
-        dev_text = self.menu_font.render("DEVELOPMENT", True, WHITE)
-        text_rect = dev_text.get_rect(center=self.dev_button['rect'].center)
-        screen.blit(dev_text, text_rect)
+        # Draw animated stars
+        queue.draw(self.stars.draw, (0, 0), self.dirty.active, layer=LAYER_STARS)
+
+        self.dirty.queue_overlay(queue, *self.menu_layer, LAYER_UI)
+
+    def draw_escape_hint(self, queue):
+        # Bottom-right hint with its glow, composited once by the text cache
+        hint = text_cache.render(self.font, "press escape to go back to menu", WHITE, glow=HINT_GLOW)
+        padding = HINT_GLOW[1]
+        queue.blit(hint, hint.get_rect(bottomright=(WIDTH - 20 + padding, HEIGHT - 20 + padding)),
+                   layer=LAYER_UI)
 
-    def draw_dev_mode(self, screen):
+    def draw_dev_mode(self, queue):
         if not self.history_images:
-            screen.fill(BLACK)
-            text = self.large_font.render("No history images found", True, WHITE)
-            screen.blit(text, (WIDTH//2 - text.get_width()//2, HEIGHT//2))
+            queue.fill(BLACK, layer=LAYER_BACKGROUND)
+            text = text_cache.render(self.large_font, "No history images found", WHITE)
+            queue.blit(text, (WIDTH//2 - text.get_width()//2, HEIGHT//2), layer=LAYER_UI)
             return
 
         # Draw current image
@@ -1573,37 +2100,21 @@ class SpaceExplorer:
         # Center the image
         x = (WIDTH - current_img.get_width()) // 2
         y = (HEIGHT - current_img.get_height()) // 2
-        screen.blit(current_img, (x, y))
+        queue.blit(current_img, (x, y), layer=LAYER_BACKGROUND)
 
-        # Update and draw space objects
-        self.update_space_objects()  # Update asteroids and comets
-        
         # Draw comets and asteroids
-        for comet in self.comets:
-            comet.draw(screen)
-        for asteroid in self.asteroids:
-            asteroid.draw(screen)
+        self.draw_comets(queue)
+        self.asteroids.draw(queue, self.lag)
 
         # Draw rocket
-        self.rocket.draw(screen)
+        self.rocket.draw(queue, self.lag)
 
         # Draw escape text in corner with glow effect
-        escape_text = "press escape to go back to menu"
-        text_surface = self.font.render(escape_text, True, WHITE)
-        text_rect = text_surface.get_rect()
-        text_rect.bottomright = (WIDTH - 20, HEIGHT - 20)  # Position in bottom-right corner
-
-        # Add glow effect
-        glow_surface = pygame.Surface((text_rect.width + 4, text_rect.height + 4), pygame.SRCALPHA)
-        for offset in range(3):
-            glow_alpha = 100 - offset * 30
-            glow_text = self.font.render(escape_text, True, (255, 255, 255, glow_alpha))
-            glow_rect = glow_text.get_rect(center=(glow_surface.get_width()//2, glow_surface.get_height()//2))
-            glow_surface.blit(glow_text, glow_rect)
-        
-        screen.blit(glow_surface, (text_rect.x - 2, text_rect.y - 2))
-        screen.blit(text_surface, text_rect)
+        self.draw_escape_hint(queue)
 
+    def update_dev_mode(self):
+        if not self.history_images:
+            return
         # Check if rocket moves to next/previous image
         if self.rocket.x > WIDTH - 50:  # Move to next image
             self.current_image_index = (self.current_image_index + 1) % len(self.history_images)
@@ -1612,7 +2123,155 @@ class SpaceExplorer:
             self.current_image_index = (self.current_image_index - 1) % len(self.history_images)
             self.rocket.x = WIDTH - 51
 
+    def scene_idle(self):
+        # Scenes whose only motion is ambient (the title glow and the star
+        # twinkle) can be redrawn at IDLE_FPS. Comets and asteroids crossing
+        # the dev mode and info screens keep them at the full frame rate
+        if self.in_menu:
+            return True
+        if len(self.comets) or len(self.asteroids):
+            return False
+        if self.in_dev_mode:
+            return self.rocket.at_rest() and not any(pygame.key.get_pressed())
+        return self.current_info_screen is not None
+
+    def wait_for_event(self, timeout=None):
+        # Sleep until an event arrives, or for timeout ms. The event is kept
+        # for the next pass of the event loop
+        event = pygame.event.wait() if timeout is None else pygame.event.wait(timeout)
+        if event.type != pygame.NOEVENT:
+            self.pending_events.append(event)
+
+    def track_window(self, event):
+        if event.type == pygame.WINDOWMINIMIZED:
+            self.minimized = True
+        elif event.type in (pygame.WINDOWRESTORED, pygame.WINDOWMAXIMIZED):
+            self.minimized = False
+        elif event.type == pygame.WINDOWFOCUSLOST:
+            self.focused = False
+        elif event.type == pygame.WINDOWFOCUSGAINED:
+            self.focused = True
+
+    def report_stats(self, queue, idle):
+        # Once a second: the last frame's render stats, frames drawn and the
+        # CPU time the process used over the second, to compare idle screens
+        # with IDLE_THROTTLE on and off
+        now = time.perf_counter()
+        elapsed = now - self.stats_time
+        if elapsed < 1:
+            return
+        cpu = (time.process_time() - self.stats_cpu) / elapsed * 100
+        fps = (self.frame_count - self.stats_frames) / elapsed
+        print(f"Render: {queue.stats()}, {fps:.0f} fps, {cpu:.0f}% CPU{' (idle)' if idle else ''}")
+        self.stats_time = now
+        self.stats_cpu = time.process_time()
+        self.stats_frames = self.frame_count
+
+    def apply_quality(self):
+        settings = self.quality.settings
+        for rocket in self.rockets:
+            rocket.exhaust = settings["exhaust"]
+        for planet in self.planets:
+            planet.trail.resize(settings["trail"])
+        self.stars.set_count(int(200 * settings["stars"]))
+        self.planet_view_stars.set_count(int(150 * settings["stars"]))
+        self.glow = settings["glow"]
+
+    def render_frame(self, surface, state):
+        # Draw the main view, planet view or quiz screen described by state
+        # onto surface, outside of run() and without touching the window, so
+        # it works with the dummy video driver (render_batch.py). The same
+        # state always draws the same frame. state is a dict of:
+        #   view      "main" (the default), "planet" or "quiz"
+        #   frame     60 Hz orbital steps since every planet and moon was at
+        #             its periapsis, also the clock of the twinkle and the
+        #             sun's pulse
+        #   warp      time warp the planet trails are spaced for, 1 by default
+        #   planet    name of the planet shown by the planet view and quiz
+        #   question  index of the quiz question, answers in their listed order
+        #   rocket    (x, y, angle) of the rocket, by default where the view starts it
+        #   camera    (center, step) of the solar system camera
+        #   score     score to show, none when left out
+        #   seed      seed of the star positions
+        # The explorer's scene state is changed, so use one that is not running.
+        # A surface of another size gets the frame scaled to fit it
+        view = state.get("view", "main")
+        frame = state.get("frame", 0)
+        self.frame_time = frame / 60
+        self.lag = 0.0  # Drawn as of the step, not between two
+        size = self.render_queue.get_size()
+        target = surface if surface.get_size() == size else surface_pool.get(size)
+
+        rocket = self.rocket
+        homes = {"main": rocket.home, "planet": (WIDTH // 2, HEIGHT // 4),
+                 "quiz": (WIDTH // 2, HEIGHT * 3 // 4)}
+        rocket.x, rocket.y, rocket.angle = state.get("rocket", (*homes[view], 0))
+        rocket.thrust = False
+        rocket.particles.clear()
+        rocket.bullets.clear()
+        self.comets.clear()
+        self.asteroids.clear()
+        self.score_popups = []
+
+        queue = self.render_queue
+        self.dirty.invalidate()
+        if view == "main":
+            self.camera.reset()
+            if "camera" in state:
+                self.camera.center, self.camera.step = state["camera"]
+            stars = self.stars
+            self.time_warp = state.get("warp", 1)
+            self.set_orbit_time(frame)
+        else:
+            name = state["planet"]
+            self.current_planet = next((planet for planet in self.planets if planet.name == name),
+                                       None) or Planet(name, planets[name])
+        if view == "planet":
+            stars = self.planet_view_stars
+        elif view == "quiz":
+            quiz = self.offscreen_quizzes.get(name)
+            if quiz is None:
+                quiz = self.offscreen_quizzes[name] = QuizScreen(name, self)
+            # A fresh copy, the quiz shuffles the answers of the ones it asks
+            questions = quiz.get_questions_for_planet(name) or quiz.questions
+            quiz.current_question = questions[state.get("question", 0) % len(questions)]
+            quiz.result = None
+            quiz.show_correct_answer = False
+            stars = quiz.stars
+
+        # Same sky for the same seed, whatever was drawn before
+        stars.rng = np.random.default_rng(state.get("seed", 0))
+        stars.populate(len(stars))
+        stars.update(self.frame_time)
+
+        if view == "main":
+            self.draw_solar_system(queue)
+        elif view == "planet":
+            self.draw_planet_screen(queue)
+        else:
+            quiz.draw(queue, rocket)
+        rocket.draw(queue)
+        if "score" in state:
+            self.score = state["score"]
+            self.draw_score(queue)
+        queue.flush(target)
+        if target is not surface:
+            pygame.transform.smoothscale(target, surface.get_size(), surface)
+        surface_pool.end_frame()
+        self.frame_time = None
+        self.dirty.invalidate()
+
+    def mouse_pos(self):
+        # Mouse position in layout coordinates
+        if self.backend:
+            return self.backend.to_logical(pygame.mouse.get_pos())
+        return pygame.mouse.get_pos()
+
     def toggle_fullscreen(self):
+        if self.backend:
+            # The renderer scales the logical size to the window, layout is unchanged
+            self.backend.toggle_fullscreen()
+            return
         self.fullscreen = not self.fullscreen
         if self.fullscreen:
             # Store the window size before going fullscreen
@@ -1621,15 +2280,168 @@ class SpaceExplorer:
         else:
             # Return to windowed mode with previous size
             self.screen = pygame.display.set_mode(self.window_size)
+        self.trail_renderer.resize(self.screen.get_size())
+        self.camera.resize(self.screen.get_size())
+        if self.split_screen:
+            self.split_screen.resize(self.screen.get_size())
+        self.build_background_layer()
+        self.dirty.resize(self.screen)
+        self.render_queue.resize(self.screen.get_size())
+
+    def update(self):
+        # One simulation step of the current scene. Every speed, timer and
+        # cooldown counts these steps, not drawn frames
+        keys = pygame.key.get_pressed()
+        if self.in_menu:
+            self.stars.update()
+        else:
+            self.update_space_objects()
+
+        if self.in_dev_mode:
+            self.rocket.update(keys)
+            self.update_dev_mode()
+        elif self.current_quiz_screen:
+            quiz = self.current_quiz_screen
+            quiz.update()
+            if quiz.rocket_reset_position:
+                quiz.reset_rocket(self.rocket)
+            self.rocket.update(keys)
+            rocket_rect = pygame.Rect(self.rocket.x - self.rocket.size, 
+                                    self.rocket.y - self.rocket.size,
+                                    self.rocket.size * 2, 
+                                    self.rocket.size * 2)
+            if quiz.check_answer(rocket_rect) == 'back':
+                self.current_quiz_screen = None
+                self.reset_rocket_position()
+        elif not (self.in_menu or self.current_info_screen):
+            self.update_flight(keys)
+
+        # Update score popups
+        self.update_score_popups()
+
+    def update_flight(self, keys):
+        # Every player flies in the solar system view, only the one who
+        # landed on the planet screen
+        flying = [self.rocket] if self.planet_view else self.rockets
+        for rocket in flying:
+            rocket.update(keys)
+
+        if self.cooldown > 0:
+            self.cooldown -= 1
+        else:
+            if not self.planet_view:
+                for rocket in self.rockets:
+                    collided_planet = self.check_collisions(rocket)
+                    if collided_planet:
+                        self.rocket = rocket
+                        self.enter_planet_view(collided_planet)
+                        break
+            else:
+                option_hit = self.check_option_collisions()
+                if option_hit == 'facts':
+                    if self.current_planet.name == "Earth":
+                        self.earth_platformer = EarthPlatformer(backend=self.backend)
+                    else:
+                        # Create planet-specific platformer
+                        self.planet_platformer = PlanetPlatformer(
+                            self.current_planet.name,
+                            self.current_planet.color,
+                            planets[self.current_planet.name]["info"],
+                            (0, 0, 0),  # Black background
+                            backend=self.backend
+                        )
+                    self.reset_rocket_position()
+                elif option_hit == 'quiz':
+                    try:
+                        self.current_quiz_screen = QuizScreen(self.current_planet.name, self)
+                        self.reset_rocket_position()
+                    except Exception as e:
+                        print(f"Error creating quiz screen: {e}")
+                        self.current_quiz_screen = None
+                elif option_hit == 'back':
+                    self.exit_planet_view()
+
+        if self.planet_view:
+            self.planet_view_stars.update()
+        else:
+            self.update_solar_system()
+        self.transition_alpha = max(0, self.transition_alpha - 10)
+
+    def draw(self, queue):
+        # Submit the current scene to the queue, self.lag of a step behind
+        # its last update. Scenes submit their drawing to the render queue,
+        # which reports what it drew to self.dirty. Scenes that only move a
+        # few things keep dirty rects; the others redraw the whole screen
+        # every frame. Returns whether the split screen drew the score
+        # popups into its world already
+        dirty = self.dirty
+        split_view = False
+        if self.in_menu:
+            dirty.set_scene("menu")
+            self.draw_menu(queue)
+            self.prewarm_sprites()
+        elif self.in_dev_mode:
+            dirty.invalidate()
+            self.draw_dev_mode(queue)
+        elif self.current_info_screen:
+            dirty.set_scene(self.current_info_screen)
+            self.current_info_screen.draw(queue, dirty)
+            # Draw space objects in info screen
+            self.draw_comets(queue)
+            self.asteroids.draw(queue, self.lag)
+        elif self.current_quiz_screen:
+            dirty.set_scene(self.current_quiz_screen)
+            self.current_quiz_screen.draw(queue, self.rocket)
+            # Draw space objects
+            self.draw_comets(queue)
+            self.asteroids.draw(queue, self.lag)
+            self.rocket.draw(queue, self.lag)
+        else:
+            dirty.invalidate()
+            if self.planet_view:
+                self.draw_planet_screen(queue)
+                self.rocket.draw(queue, self.lag)
+            elif self.split_screen:
+                # The world and every rocket are drawn once, offscreen;
+                # the viewports copy their part of it
+                world = self.split_screen.queue
+                self.draw_solar_system(world)
+                for rocket in self.rockets:
+                    rocket.draw(world, self.lag)
+                self.draw_score_popups(world)
+                viewports = self.split_screen.draw(queue, [rocket.pose(self.lag)[0]
+                                                           for rocket in self.rockets])
+                self.draw_player_hud(queue, viewports)
+                split_view = True
+            else:
+                self.draw_solar_system(queue)
+                self.rocket.draw(queue, self.lag)
+
+            if not self.planet_view:
+                # Add escape text in corner with glow effect
+                self.draw_escape_hint(queue)
+                self.draw_time_warp(queue)
+
+            if self.transition_alpha > 0:
+                # One black surface, faded through its alpha
+                self.fade_surface.set_alpha(self.transition_alpha)
+                queue.blit(self.fade_surface, (0, 0), layer=LAYER_OVERLAY)
+        return split_view
 
     def run(self):
         pygame.init()
+        # Count surface constructions in the live loop only
+        surface_pool.set_debug(SURFACE_DEBUG)
         
         clock = pygame.time.Clock()
+        elapsed = 0.0  # Seconds the last frame took
         
         while True:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
+            events = self.pending_events + pygame.event.get()
+            self.pending_events = []
+            for event in events:
+                self.track_window(event)
+                if event.type in (pygame.QUIT, pygame.WINDOWCLOSE):
                     pygame.quit()
                     sys.exit()
                 elif event.type == pygame.KEYDOWN:
@@ -1647,10 +2459,21 @@ class SpaceExplorer:
                         elif not self.in_menu:  # If in solar system view
                             self.in_menu = True
                             self.reset_rocket_position()
+                    elif event.key == pygame.K_HOME and self.in_solar_system_view():
+                        self.camera.reset()
+                    elif event.key in (pygame.K_COMMA, pygame.K_PERIOD) and self.in_solar_system_view():
+                        self.change_time_warp(1 if event.key == pygame.K_PERIOD else -1)
+                if event.type == pygame.MOUSEWHEEL and self.in_solar_system_view():
+                    # Zoom one step per notch around the mouse
+                    self.camera.zoom_at(self.mouse_pos(), event.y)
+                elif (event.type == pygame.MOUSEMOTION and (event.buttons[1] or event.buttons[2])
+                      and self.in_solar_system_view()):
+                    # Middle or right drag pans
+                    self.camera.pan(*event.rel)
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     if event.button == 1:  # Left click
                         if self.in_menu:
-                            mouse_pos = pygame.mouse.get_pos()
+                            mouse_pos = self.mouse_pos()
                             if self.launch_button['rect'].collidepoint(mouse_pos):
                                 self.in_menu = False
                             elif self.dev_button['rect'].collidepoint(mouse_pos):
@@ -1660,157 +2483,75 @@ class SpaceExplorer:
                                 self.rocket.y = HEIGHT // 2
                 if event.type == pygame.USEREVENT + 1:
                     print("Questions loaded")       
-            # Update space objects for all game states except menu
-            if not self.in_menu:
-                self.update_space_objects()
-                #  hello Update menu alpha for glow effect
-
-            # Update button hover states in menu
-            if self.in_menu:
-                mouse_pos = pygame.mouse.get_pos()
-                self.launch_button['hover'] = self.launch_button['rect'].collidepoint(mouse_pos)
-                self.dev_button['hover'] = self.dev_button['rect'].collidepoint(mouse_pos)
-                self.draw_menu(self.screen)
-            elif self.in_dev_mode:
-                keys = pygame.key.get_pressed()
-                self.rocket.update(keys)
-                self.draw_dev_mode(self.screen)
-            elif self.current_info_screen:
-                self.current_info_screen.draw(self.screen)
-                # Draw space objects in info screen
-                for comet in self.comets:
-                    comet.draw(self.screen)
-                for asteroid in self.asteroids:
-                    asteroid.draw(self.screen)
-            elif self.current_quiz_screen:
-                self.current_quiz_screen.draw(self.screen, self.rocket)
-                
-                if self.current_quiz_screen.rocket_reset_position:
-                    self.current_quiz_screen.reset_rocket(self.rocket)
-                
-                keys = pygame.key.get_pressed()
-                self.rocket.update(keys)
-                
-                # Draw space objects
-                for comet in self.comets:
-                    comet.draw(self.screen)
-                for asteroid in self.asteroids:
-                    asteroid.draw(self.screen)
-                
-                rocket_rect = pygame.Rect(self.rocket.x - self.rocket.size, 
-                                        self.rocket.y - self.rocket.size,
-                                        self.rocket.size * 2, 
-                                        self.rocket.size * 2)
-                result = self.current_quiz_screen.check_answer(rocket_rect)
-                if result == 'back':
-                    self.current_quiz_screen = None
-                    self.reset_rocket_position()
-                
-                self.rocket.draw(self.screen)
-            elif self.earth_platformer:
-                # Run the Earth platformer game
-                continue_space = self.earth_platformer.run()
+
+            if IDLE_THROTTLE and (self.minimized or not self.focused):
+                # Neither simulate nor draw until the window is back
+                self.wait_for_event()
+                clock.tick()
+                elapsed = 0.0
+                self.timestep.reset()
+                continue
+
+            if self.earth_platformer or self.planet_platformer:
+                # The platformers run their own loops until they are left
+                self.dirty.invalidate()
+                if self.earth_platformer:
+                    continue_space = self.earth_platformer.run()
+                else:
+                    continue_space = self.planet_platformer.run()
                 if continue_space:
                     self.earth_platformer = None
-                    self.exit_planet_view()
-            elif self.planet_platformer:
-                # Run the planet platformer game
-                continue_space = self.planet_platformer.run()
-                if continue_space:
                     self.planet_platformer = None
                     self.exit_planet_view()
-            else:
-                keys = pygame.key.get_pressed()
-                self.rocket.update(keys)
-
-                if self.cooldown > 0:
-                    self.cooldown -= 1
-                else:
-                    if not self.planet_view:
-                        collided_planet = self.check_collisions()
-                        if collided_planet:
-                            self.enter_planet_view(collided_planet)
-                    else:
-                        option_hit = self.check_option_collisions()
-                        if option_hit == 'facts':
-                            if self.current_planet.name == "Earth":
-                                self.earth_platformer = EarthPlatformer()
-                            else:
-                                # Create planet-specific platformer
-                                self.planet_platformer = PlanetPlatformer(
-                                    self.current_planet.name,
-                                    self.current_planet.color,
-                                    planets[self.current_planet.name]["info"],
-                                    (0, 0, 0)  # Black background
-                                )
-                            self.reset_rocket_position()
-                        elif option_hit == 'quiz':
-                            try:
-                                self.current_quiz_screen = QuizScreen(self.current_planet.name, self)
-                                self.reset_rocket_position()
-                            except Exception as e:
-                                print(f"Error creating quiz screen: {e}")
-                                self.current_quiz_screen = None
-                        elif option_hit == 'back':
-                            self.exit_planet_view()
-
-                self.screen.fill(BLACK)
-                
-                if not self.planet_view:
-                    for star in self.stars:
-                        star.update()
-                        star.draw(self.screen)
-                    self.draw_sun()
-                    for planet in self.planets:
-                        planet.update()
-                        planet.draw(self.screen)
-                    # Draw comets and asteroids after planets
-                    for comet in self.comets:
-                        comet.draw(self.screen)
-                    for asteroid in self.asteroids:
-                        asteroid.draw(self.screen)
-                
-                    # Add escape text in corner with glow effect
-                    escape_text = "press escape to go back to menu"
-                    text_surface = self.font.render(escape_text, True, WHITE)
-                    text_rect = text_surface.get_rect()
-                    text_rect.bottomright = (WIDTH - 20, HEIGHT - 20)
-
-                    # Add glow effect
-                    glow_surface = pygame.Surface((text_rect.width + 4, text_rect.height + 4), pygame.SRCALPHA)
-                    for offset in range(3):
-                        glow_alpha = 100 - offset * 30
-                        glow_text = self.font.render(escape_text, True, (255, 255, 255, glow_alpha))
-                        glow_rect = glow_text.get_rect(center=(glow_surface.get_width()//2, glow_surface.get_height()//2))
-                        glow_surface.blit(glow_text, glow_rect)
-                    
-                    self.screen.blit(glow_surface, (text_rect.x - 2, text_rect.y - 2))
-                    self.screen.blit(text_surface, text_rect)
-                else:
-                    self.draw_planet_screen(self.screen)
-
-                self.rocket.draw(self.screen)
+                clock.tick()
+                elapsed = 0.0
+                self.timestep.reset()
+                continue
+
+            # As many simulation steps as the time since the last frame
+            # holds, then one frame drawn between the last two of them
+            for _ in range(self.timestep.advance(elapsed)):
+                self.update()
+                if self.earth_platformer or self.planet_platformer:
+                    break
+            self.lag = 1 - self.timestep.alpha
 
-                if self.transition_alpha > 0:
-                    fade_surface = pygame.Surface((WIDTH, HEIGHT))
-                    fade_surface.fill(BLACK)
-                    fade_surface.set_alpha(self.transition_alpha)
-                    self.screen.blit(fade_surface, (0, 0))
-                    
-                    if self.planet_view:
-                        self.transition_alpha = max(0, self.transition_alpha - 10)
-                    else:
-                        self.transition_alpha = max(0, self.transition_alpha - 10)
+            queue = self.render_queue
+            split_view = self.draw(queue)
 
-            # Update score popups
-            self.update_score_popups()
+            # Draw score (add this before presenting)
+            self.draw_score(queue, popups=not split_view)
             
-            # Draw score (add this before pygame.display.flip())
-            self.draw_score(self.screen)
-            
-            pygame.display.flip()
-            clock.tick(60)
+            if self.backend:
+                self.backend.present(queue)
+            else:
+                queue.flush(self.screen, self.dirty)
+                self.dirty.present()
+            surface_pool.end_frame()
+            self.frame_count += 1
+            idle = IDLE_THROTTLE and self.scene_idle()
+            if RENDER_STATS:
+                self.report_stats(queue, idle)
+            if idle:
+                # Nothing but twinkling and drifting in the background: draw
+                # the next frame after IDLE_FPS, or as soon as there is input
+                self.wait_for_event(1000 // IDLE_FPS)
+                elapsed = clock.tick() / 1000
+            else:
+                elapsed = clock.tick(MAX_FPS) / 1000
+                # Work time of the frame, without the tick's sleep
+                if self.quality.frame(clock.get_rawtime()):
+                    self.apply_quality()
+                    if RENDER_STATS:
+                        print(f"Quality: {self.quality.name}")
 
 if __name__ == "__main__":
-    explorer = SpaceExplorer()
+    parser = argparse.ArgumentParser(description="Space Explorer")
+    parser.add_argument("--quality", choices=QUALITY_NAMES + [QUALITY_AUTO], default=QUALITY_AUTO,
+                        help="fixed quality preset, or auto to adapt to the frame rate")
+    parser.add_argument("--players", type=int, choices=(1, 2), default=1,
+                        help="2 splits the solar system view between two rockets: "
+                             "WASD and space, arrows and right ctrl")
+    args = parser.parse_args()
+    explorer = SpaceExplorer(quality=args.quality, players=args.players)
     explorer.run() 
\ No newline at end of file
@@ -1,9 +1,15 @@
 import pygame
 import math
 import sys
-from random import randint, choice, random
+from random import randint
 import time
 import os
+from glow_cache import glow_cache
+from particle import ParticleSystem
+from starfield import Starfield
+from sprite_cache import sprite_cache
+from text_cache import text_cache
+from sphere_renderer import SphereRenderer, map_from_disc, procedural_map
 
 # Initialize Pygame
 pygame.init()
@@ -25,6 +31,7 @@ STAR_COLORS = [(255, 255, 255), (255, 255, 200), (200, 200, 255), (255, 200, 200
 
 # Add after other constants
 ASSETS_DIR = "assets"  # Create this directory to store your pixel art images
+ROCKET_TURN_STEP = 5  # Degrees per frame, rotated sprites are cached per step
 
 # Planet data with extended information
 planets = {
@@ -150,38 +157,6 @@ planets = {
     }
 }
 
-class Star:
-    def __init__(self):
-        self.x = randint(0, WIDTH)
-        self.y = randint(0, HEIGHT)
-        self.size = random() * 2
-        self.color = choice(STAR_COLORS)
-        self.twinkle_speed = random() * 0.1
-        self.brightness = random()
-        self.flash_chance = 0.005  # Chance to start flashing
-        self.is_flashing = False
-        self.flash_brightness = 0
-        
-    def update(self):
-        # Regular twinkling
-        self.brightness = abs(math.sin(time.time() * self.twinkle_speed))
-        
-        # Random flashing
-        if not self.is_flashing and random() < self.flash_chance:
-            self.is_flashing = True
-            self.flash_brightness = 2.0  # Start with bright flash
-            
-        if self.is_flashing:
-            self.flash_brightness *= 0.9  # Fade out
-            if self.flash_brightness < 0.1:
-                self.is_flashing = False
-                
-    def draw(self, screen):
-        # Combine regular brightness with flash brightness
-        final_brightness = min(self.brightness + self.flash_brightness, 2.0)
-        color = [min(255, c * final_brightness) for c in self.color]
-        pygame.draw.circle(screen, color, (int(self.x), int(self.y)), int(self.size))
-
 class Planet:
     def __init__(self, name, data):
         self.name = name
@@ -214,6 +189,16 @@ class Planet:
             except pygame.error:
                 print(f"Could not load image for {name}")
         
+        # Sphere-mapped globe; planets without an image get a procedural map
+        if self.original_image:
+            self.sphere = SphereRenderer(map_from_disc(self.original_image, self.radius), self.radius)
+        else:
+            self.sphere = SphereRenderer(
+                procedural_map(self.color, self.radius, stripes=name in ["Jupiter", "Saturn"]),
+                self.radius
+            )
+        self.image = self.sphere.render(0)
+        
         self.tilt_factor = 0.5
         self.trail = []
         self.trail_length = 50
@@ -237,8 +222,11 @@ class Planet:
 
         # Update rotation
         self.rotation_angle = (self.rotation_angle + self.rotation_speed) % 360
-        if self.original_image:
-            self.image = pygame.transform.rotate(self.original_image, self.rotation_angle)
+        # Light comes from the Sun: the reverse of the orbit offset, tilted
+        # into screen space the same way as the orbit
+        depth = math.sqrt(1 - self.tilt_factor ** 2)
+        light = (-base_x, -base_y * self.tilt_factor, -base_y * depth)
+        self.image = self.sphere.render(self.rotation_angle, light)
 
     def draw(self, screen):
         # Draw orbit trail
@@ -259,48 +247,17 @@ class Planet:
         )
         pygame.draw.ellipse(screen, (*self.color, 30), rect, 1)
 
-        # Draw planet glow
-        glow_surface = pygame.Surface((self.radius * 4, self.radius * 4), pygame.SRCALPHA)
-        for r in range(self.radius + 10, self.radius - 2, -2):
-            alpha = int(100 * (r / (self.radius + 10)))
-            pygame.draw.circle(glow_surface, (*self.color, alpha),
-                             (self.radius * 2, self.radius * 2), r)
-        
+        # Draw planet glow (pre-rendered once per color and radius)
+        glow_surface = glow_cache.planet_glow(self.color, self.radius)
         screen.blit(glow_surface, 
                    (self.x - self.radius * 2, self.y - self.radius * 2))
 
-        if self.image:
-            # Get the rect of the rotated image
-            rect = self.image.get_rect()
-            # Center the rect on the planet's position
-            rect.center = (self.x, self.y)
-            # Draw rotated planet image
-            screen.blit(self.image, rect)
-        else:
-            # Draw default planet circle and details
-            planet_surface = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(planet_surface, self.color,
-                             (self.radius, self.radius), self.radius)
-            
-            # Add surface details for gas giants
-            if self.name in ["Jupiter", "Saturn"]:
-                for i in range(-self.radius, self.radius, 4):
-                    stripe_color = (min(255, self.color[0] + 20),
-                                  min(255, self.color[1] + 20),
-                                  min(255, self.color[2] + 20))
-                    pygame.draw.line(planet_surface, stripe_color,
-                                   (0, self.radius + i),
-                                   (self.radius * 2, self.radius + i), 2)
-            
-            screen.blit(planet_surface, (self.x - self.radius, self.y - self.radius))
+        # Sphere-mapped planet, fixed size so it never needs recentering
+        screen.blit(self.image, (self.x - self.radius, self.y - self.radius))
 
         # Draw Saturn's rings if applicable
         if self.name == "Saturn":
-            ring_surface = pygame.Surface((self.radius * 4, self.radius * 2), pygame.SRCALPHA)
-            for r in range(self.radius + 15, self.radius + 25):
-                alpha = int(150 * (1 - (r - self.radius - 15) / 10))
-                pygame.draw.ellipse(ring_surface, (*self.color, alpha),
-                                  (0, self.radius - r//4, self.radius * 4, r//2), 1)
+            ring_surface = glow_cache.planet_rings(self.color, self.radius)
             screen.blit(ring_surface,
                        (self.x - self.radius * 2, self.y - self.radius))
 
@@ -314,7 +271,6 @@ class Rocket:
         self.max_speed = 5
         self.size = 20
         self.thrust = False
-        self.particles = []
         self.thrust_start_time = 0
         self.fire_colors = [
             (255, 69, 0),    # Red-Orange
@@ -322,6 +278,10 @@ class Rocket:
             (255, 215, 0),   # Yellow
             (255, 255, 255)  # White (core)
         ]
+        # Up to 5 particles a step living up to 400 steps (life 20 fading
+        # 0.05 a step) are 2000 alive at once: any fewer and the newest,
+        # at the nozzle, are the ones dropped
+        self.particles = ParticleSystem(2048, self.fire_colors, max_life=20)
         
         # Load rocket images for different stages
         try:
@@ -344,9 +304,9 @@ class Rocket:
     def update(self, keys):
         # Rotation with both arrow keys and A/D
         if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            self.angle -= 5
+            self.angle -= ROCKET_TURN_STEP
         if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            self.angle += 5
+            self.angle += ROCKET_TURN_STEP
 
         # Forward thrust with both UP and W
         if keys[pygame.K_UP] or keys[pygame.K_w]:
@@ -359,23 +319,10 @@ class Rocket:
             back_x = self.x - math.cos(math.radians(self.angle)) * self.size
             back_y = self.y - math.sin(math.radians(self.angle)) * self.size
             
-            # Add multiple particles per frame
-            for _ in range(5):
-                spread_angle = self.angle + randint(-20, 20)  # Random spread
-                speed = random() * 5 + 5  # Original speed range
-                size = random() * 3 + 1   # Original size range
-                color = choice(self.fire_colors)
-                
-                self.particles.append({
-                    'x': back_x,
-                    'y': back_y,
-                    'dx': -math.cos(math.radians(spread_angle)) * speed,
-                    'dy': -math.sin(math.radians(spread_angle)) * speed,
-                    'size': size,
-                    'color': color,
-                    'life': 20,  # Original life
-                    'fade_rate': random() * 0.1 + 0.05  # Original fade rate
-                })
+            # Add multiple particles per frame, sprayed out of the back
+            self.particles.emit_cone(back_x, back_y, self.angle + 180, 5,
+                                     speed=(5, 10), size=(1, 4), life=20,
+                                     fade=(0.05, 0.15))
         
         # Backward thrust with DOWN and S
         elif keys[pygame.K_DOWN] or keys[pygame.K_s]:
@@ -388,23 +335,11 @@ class Rocket:
             front_x = self.x + math.cos(math.radians(self.angle)) * self.size
             front_y = self.y + math.sin(math.radians(self.angle)) * self.size
             
-            # Add multiple particles for reverse thrust
-            for _ in range(5):
-                spread_angle = self.angle + 180 + randint(-20, 20)
-                speed = random() * 3 + 3  # Reduced speed range
-                size = random() * 1.5 + 0.5   # Smaller size range
-                color = choice(self.fire_colors)
-                
-                self.particles.append({
-                    'x': front_x,
-                    'y': front_y,
-                    'dx': math.cos(math.radians(spread_angle)) * speed,
-                    'dy': math.sin(math.radians(spread_angle)) * speed,
-                    'size': size,
-                    'color': color,
-                    'life': 15,  # Shorter life
-                    'fade_rate': random() * 0.15 + 0.1  # Faster fade
-                })
+            # Add multiple particles for reverse thrust: slower, smaller,
+            # shorter lived and fading faster
+            self.particles.emit_cone(front_x, front_y, self.angle + 180, 5,
+                                     speed=(3, 6), size=(0.5, 2), life=15,
+                                     fade=(0.1, 0.25))
         else:
             self.thrust = False
             self.thrust_start_time = 0
@@ -422,42 +357,12 @@ class Rocket:
         self.x = self.x % WIDTH
         self.y = self.y % HEIGHT
 
-        # Update existing particles
-        for particle in self.particles[:]:
-            particle['x'] += particle['dx']
-            particle['y'] += particle['dy']
-            particle['life'] -= particle['fade_rate']
-            particle['size'] = max(0.1, particle['size'] - 0.1)
-            
-            # Remove dead particles
-            if particle['life'] <= 0:
-                self.particles.remove(particle)
+        # Update particles
+        self.particles.update()
 
     def draw(self, screen):
         # Draw particles first (behind rocket)
-        for particle in self.particles:
-            alpha = int(255 * (particle['life'] / 20))  # Back to original life value
-            color = (*particle['color'], alpha)
-            
-            # Create a surface for the glowing particle
-            size = int(particle['size'] * 4)  # Original glow size multiplier
-            particle_surf = pygame.Surface((size, size), pygame.SRCALPHA)
-            
-            # Draw multiple circles for glow effect
-            for radius in range(int(particle['size'] * 2), 0, -1):  # Original glow radius
-                glow_alpha = int(alpha * (radius / (particle['size'] * 2)))
-                pygame.draw.circle(
-                    particle_surf,
-                    (*particle['color'], glow_alpha),
-                    (size//2, size//2),
-                    radius
-                )
-            
-            # Draw the particle
-            screen.blit(
-                particle_surf,
-                (int(particle['x'] - size//2), int(particle['y'] - size//2))
-            )
+        self.particles.draw(screen)
 
         # Draw rocket image based on stage
         if self.stage1_image and self.stage2_image and self.stage3_image:
@@ -471,10 +376,10 @@ class Rocket:
                 else:
                     self.current_image = self.stage3_image
             
-            # Rotate image
-            rotated_image = pygame.transform.rotate(self.current_image, -self.angle - 90)
-            # Get rect for centered drawing
-            rect = rotated_image.get_rect(center=(self.x, self.y))
+            # Rotated image from the cache, centered on the rocket
+            rotated_image, rect = sprite_cache.get(self.current_image, -self.angle - 90,
+                                                   center=(self.x, self.y),
+                                                   angle_step=ROCKET_TURN_STEP)
             screen.blit(rotated_image, rect)
         else:
             # Fallback to original triangle drawing if images not available
@@ -499,26 +404,29 @@ class InfoScreen:
         screen.fill(BLACK)
         
         # Draw title
-        title = self.font_title.render(self.info[0], True, WHITE)
+        title = text_cache.render(self.font_title, self.info[0], WHITE)
         screen.blit(title, (WIDTH//2 - title.get_width()//2, 50))
 
         # Draw info lines
         for i, line in enumerate(self.info[1:], 1):
-            text = self.font_info.render(line, True, WHITE)
+            text = text_cache.render(self.font_info, line, WHITE)
             screen.blit(text, (WIDTH//2 - text.get_width()//2, 100 + i * 40))
 
         # Draw exit instruction
-        exit_text = self.font_info.render("Press ESC to return to space", True, WHITE)
+        exit_text = text_cache.render(self.font_info, "Press ESC to return to space", WHITE)
         screen.blit(exit_text, (WIDTH//2 - exit_text.get_width()//2, HEIGHT - 100))
 
 class SpaceExplorer:
     def __init__(self):
         self.planets = [Planet(name, data) for name, data in planets.items()]
-        self.stars = [Star() for _ in range(200)]
+        self.stars = Starfield.twinkling(200, WIDTH, HEIGHT, STAR_COLORS)
         self.rocket = Rocket()
         self.font = pygame.font.Font(None, 24)
         self.current_info_screen = None
         self.cooldown = 0  # Add cooldown timer
+        
+        # Build the pulsing sun core variants up front
+        glow_cache.prewarm_discs(YELLOW, 50, 60)
 
     def reset_rocket_position(self):
         # Move rocket to center of screen, away from planets
@@ -569,9 +477,8 @@ class SpaceExplorer:
                 screen.fill(BLACK)
                 
                 # Draw stars
-                for star in self.stars:
-                    star.update()
-                    star.draw(screen)
+                self.stars.update()
+                self.stars.draw(screen)
                 
                 # Draw sun
                 self.draw_sun()
@@ -588,24 +495,18 @@ class SpaceExplorer:
             clock.tick(60)
 
     def draw_sun(self):
-        # Draw sun corona
-        corona_surfaces = []
-        for i in range(5):
-            corona_surf = pygame.Surface((150, 150), pygame.SRCALPHA)
-            radius = 60 + i * 10
-            alpha = int(100 * (1 - i/5))
-            pygame.draw.circle(corona_surf, (255, 200, 50, alpha), (75, 75), radius)
-            corona_surfaces.append(corona_surf)
+        # Draw sun corona (all five layers pre-composited)
+        corona = glow_cache.corona((255, 200, 50), 150, 60)
         
         # Create pulsing effect
         pulse = abs(math.sin(time.time())) * 10
         
         # Draw corona layers
-        for surf in corona_surfaces:
-            screen.blit(surf, (WIDTH//2 - 75, HEIGHT//2 - 75))
+        screen.blit(corona, (WIDTH//2 - 75, HEIGHT//2 - 75))
         
-        # Draw sun core
-        pygame.draw.circle(screen, YELLOW, (WIDTH//2, HEIGHT//2), 50 + pulse)
+        # Draw sun core, one cached disc per pulse radius
+        core = glow_cache.disc(YELLOW, 50 + pulse)
+        screen.blit(core, core.get_rect(center=(WIDTH//2, HEIGHT//2)))
         
         # Draw sun surface details
         for i in range(8):
@@ -0,0 +1,129 @@
+import math
+import numpy as np
+import pygame
+from surface_pool import surface_pool
+
+# Map texels per screen pixel at the center of the disc
+MAP_OVERSAMPLE = 2
+# Light that reaches the night side
+AMBIENT_LIGHT = 0.35
+
+_lookup_tables = {}
+
+
+class SphereLookup:
+    # Per-pixel lookup for an orthographic sphere of the given radius: which
+    # pixels are on the disc, their longitude/latitude and surface normal.
+    # Built once per radius and shared by every planet of that size.
+    def __init__(self, radius):
+        self.radius = radius
+        size = radius * 2
+        coords = (np.arange(size) + 0.5 - radius) / radius
+        nx, ny = np.meshgrid(coords, coords, indexing="ij")  # surfarray (x, y) order
+        self.mask = nx * nx + ny * ny <= 1.0
+        nx = nx[self.mask]
+        ny = ny[self.mask]
+        nz = np.sqrt(np.maximum(0.0, 1.0 - nx * nx - ny * ny))
+        self.normals = np.stack([nx, ny, nz], axis=1).astype(np.float32)
+        self.longitude = np.arctan2(nx, nz)  # -pi/2..pi/2 on the visible side
+        self.latitude = np.arcsin(np.clip(ny, -1.0, 1.0))
+
+
+def sphere_lookup(radius):
+    lookup = _lookup_tables.get(radius)
+    if lookup is None:
+        lookup = _lookup_tables[radius] = SphereLookup(radius)
+    return lookup
+
+
+def map_from_disc(image, radius):
+    # Unproject a front-facing planet sprite into an equirectangular surface
+    # map. The far hemisphere mirrors the near one, so the map wraps seamlessly
+    # and rendering at spin 0 reproduces the original sprite.
+    width = radius * 4 * MAP_OVERSAMPLE
+    height = radius * 2 * MAP_OVERSAMPLE
+    longitude = (np.arange(width) + 0.5) / width * 2 * math.pi - math.pi
+    latitude = (np.arange(height) + 0.5) / height * math.pi - math.pi / 2
+    lon, lat = np.meshgrid(longitude, latitude, indexing="ij")
+
+    source = image if image.get_size() == (radius * 2, radius * 2) else \
+        pygame.transform.scale(image, (radius * 2, radius * 2))
+    rgb = pygame.surfarray.array3d(source)
+    alpha = pygame.surfarray.array_alpha(source)
+
+    x = np.sin(lon) * np.cos(lat)
+    y = np.sin(lat)
+    px = np.clip(((x + 1) * radius).astype(np.int32), 0, radius * 2 - 1)
+    py = np.clip(((y + 1) * radius).astype(np.int32), 0, radius * 2 - 1)
+    texture = np.empty((width, height, 4), dtype=np.uint8)
+    texture[..., :3] = rgb[px, py]
+    texture[..., 3] = 255
+    # Transparent corners of the sprite would become holes once they spin to
+    # the middle of the disc; paint them with the planet's average colour
+    opaque = alpha > 0
+    if opaque.any():
+        holes = alpha[px, py] == 0
+        texture[holes, :3] = rgb[opaque].mean(axis=0).astype(np.uint8)
+    return texture
+
+
+def procedural_map(color, radius, stripes=False):
+    # Flat coloured map, optionally with the lighter bands drawn on gas giants
+    width = radius * 4 * MAP_OVERSAMPLE
+    height = radius * 2 * MAP_OVERSAMPLE
+    texture = np.empty((width, height, 4), dtype=np.uint8)
+    texture[..., :3] = color[:3]
+    texture[..., 3] = 255
+    if stripes:
+        band = tuple(min(255, c + 20) for c in color[:3])
+        rows = (np.arange(height) // MAP_OVERSAMPLE) % 4 < 2
+        texture[:, rows, :3] = band
+    return texture
+
+
+class SphereRenderer:
+    # Spins a surface map on a sphere by scrolling texture coordinates through
+    # the per-radius lookup: one array gather per frame instead of a rotozoom.
+    # The output surface has a fixed size, so it never needs recentering.
+    def __init__(self, texture, radius, shading=True, ambient=AMBIENT_LIGHT):
+        self.texture = texture
+        self.radius = radius
+        self.shading = shading
+        self.ambient = ambient
+        self.lookup = sphere_lookup(radius)
+        width, height = texture.shape[:2]
+        self.map_width = width
+        self.u = ((self.lookup.longitude + math.pi) / (2 * math.pi) * width).astype(np.int32)
+        self.v = np.clip(((self.lookup.latitude + math.pi / 2) / math.pi * height).astype(np.int32),
+                         0, height - 1)
+        self.surface = surface_pool.new((radius * 2, radius * 2), pygame.SRCALPHA)
+        self.state = None
+
+    def render(self, spin, light=None):
+        # spin is in degrees around the vertical axis; light is a direction
+        # (x, y, z) in screen space pointing towards the light source
+        shift = int(spin / 360 * self.map_width) % self.map_width
+        if light is not None and self.shading:
+            light = np.asarray(light, dtype=np.float32)
+            length = float(np.linalg.norm(light))
+            light = light / length if length else None
+        else:
+            light = None
+        state = (shift, None if light is None else tuple(np.round(light, 2)))
+        if state == self.state:
+            return self.surface
+        self.state = state
+
+        texels = self.texture[(self.u + shift) % self.map_width, self.v]
+        colors = texels[:, :3].astype(np.float32)
+        if light is not None:
+            lit = np.clip(self.lookup.normals @ light, 0.0, 1.0)
+            colors *= (self.ambient + (1.0 - self.ambient) * lit)[:, None]
+
+        pixels = pygame.surfarray.pixels3d(self.surface)
+        pixels[self.lookup.mask] = colors.astype(np.uint8)
+        del pixels
+        alpha = pygame.surfarray.pixels_alpha(self.surface)
+        alpha[self.lookup.mask] = texels[:, 3]
+        del alpha
+        return self.surface
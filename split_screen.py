@@ -0,0 +1,50 @@
+import pygame
+from render_queue import RenderQueue, LAYER_BACKGROUND, LAYER_UI
+from surface_pool import surface_pool
+
+DIVIDER_COLOR = (80, 80, 120)
+DIVIDER_WIDTH = 2
+
+
+class SplitScreen:
+    # Side by side viewports onto one shared world. The world (sky, orbits,
+    # sun, planets, trails, comets, asteroids and every rocket) is submitted
+    # to self.queue and drawn once per frame into the offscreen self.world,
+    # the size of the screen. Each viewport is a subsurface of that world,
+    # half the screen wide and following its player's rocket, copied into its
+    # half of the screen; only the player's HUD is drawn over it per
+    # viewport. A frame costs the single player frame plus one screen-sized
+    # copy, instead of drawing the world twice.
+    def __init__(self, size, players=2):
+        self.players = players
+        self.resize(size)
+
+    def resize(self, size):
+        width, height = size
+        self.world = surface_pool.new(size).convert()
+        self.queue = RenderQueue(size)
+        self.view_width = width // self.players
+        self.screen_rects = [pygame.Rect(i * self.view_width, 0, self.view_width, height)
+                             for i in range(self.players)]
+
+    def view_rect(self, x):
+        # The part of the world a viewport shows: centered on x, kept inside
+        # the world so the edges do not show past it
+        world_width, height = self.world.get_size()
+        left = int(x) - self.view_width // 2
+        left = max(0, min(world_width - self.view_width, left))
+        return pygame.Rect(left, 0, self.view_width, height)
+
+    def draw(self, queue, focus):
+        # Draw the world queued this frame, then queue each viewport's part
+        # of it onto the screen. focus is the world x each viewport follows.
+        # Returns the screen rect of each viewport, for drawing its HUD
+        self.queue.flush(self.world)
+        for screen_rect, x in zip(self.screen_rects, focus):
+            view = self.world.subsurface(self.view_rect(x))
+            queue.blit(view, screen_rect.topleft, layer=LAYER_BACKGROUND, static=False)
+        for screen_rect in self.screen_rects[1:]:
+            divider = pygame.Rect(0, 0, DIVIDER_WIDTH, screen_rect.height)
+            divider.centerx = screen_rect.left
+            queue.fill(DIVIDER_COLOR, divider, layer=LAYER_UI)
+        return self.screen_rects
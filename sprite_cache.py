@@ -0,0 +1,79 @@
+from collections import OrderedDict
+import pygame
+
+# Default memory cap for cached transforms (bytes of pixel data)
+SPRITE_CACHE_BYTES = 32 * 1024 * 1024
+
+
+class SpriteCache:
+    # Rotated and scaled copies of sprites keyed by (image, quantized angle,
+    # quantized scale). Entries are created lazily or prewarmed, and the least
+    # recently used ones are dropped once the memory cap is reached.
+    def __init__(self, max_bytes=SPRITE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def key(self, image, angle, scale, angle_step, scale_step):
+        angle = round(angle / angle_step) * angle_step % 360
+        scale = round(scale / scale_step) * scale_step
+        return (image, angle, round(scale, 4))
+
+    def build(self, image, angle, scale):
+        if scale != 1:
+            width = max(1, round(image.get_width() * scale))
+            height = max(1, round(image.get_height() * scale))
+            image = pygame.transform.scale(image, (width, height))
+        if angle:
+            image = pygame.transform.rotate(image, angle)
+        return image
+
+    def get(self, image, angle, scale=1.0, center=(0, 0), angle_step=1, scale_step=0.01):
+        # Returns the transformed surface and its rect centered on center
+        key = self.key(image, angle, scale, angle_step, scale_step)
+        surface = self.entries.get(key)
+        if surface is None:
+            self.misses += 1
+            surface = self.store(key)
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return surface, surface.get_rect(center=center)
+
+    def store(self, key):
+        image, angle, scale = key
+        surface = self.build(image, angle, scale)
+        self.entries[key] = surface
+        self.bytes += surface.get_width() * surface.get_height() * surface.get_bytesize()
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            _, old = self.entries.popitem(last=False)
+            self.bytes -= old.get_width() * old.get_height() * old.get_bytesize()
+        return surface
+
+    def prewarm(self, image, angles, scales=(1.0,), budget=None, angle_step=1, scale_step=0.01):
+        # Build missing entries, at most budget of them per call. Returns True
+        # once everything requested is cached.
+        built = 0
+        for scale in scales:
+            for angle in angles:
+                key = self.key(image, angle, scale, angle_step, scale_step)
+                if key in self.entries:
+                    continue
+                if budget is not None and built >= budget:
+                    return False
+                self.store(key)
+                built += 1
+        return True
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+
+# Shared by every screen
+sprite_cache = SpriteCache()
@@ -0,0 +1,155 @@
+import time
+import numpy as np
+import pygame
+
+# The arrays holding one value per star
+STAR_ARRAYS = ("x", "y", "size", "color", "speed", "phase", "flash", "brightness")
+
+
+def stamp_offsets(radius):
+    # Pixel offsets covered by pygame.draw.circle at an integer radius. Radius 0
+    # becomes a single pixel so the smallest stars are still visible.
+    if radius <= 0:
+        return [(0, 0)]
+    return [(dx, dy)
+            for dx in range(-radius, radius)
+            for dy in range(-radius, radius)
+            if (dx + 0.5) ** 2 + (dy + 0.5) ** 2 <= radius * radius]
+
+
+class Starfield:
+    # All stars of one sky kept in NumPy arrays. Brightness for every star is
+    # computed in one vectorized step and the pixels are written straight into
+    # the target surface through pygame.surfarray.
+    #
+    # brightness = base + amplitude * sin(time * speed + phase), optionally
+    # taking the absolute value of the sine, plus a decaying random flash.
+    def __init__(self, count, width, height, colors, max_size=2,
+                 speed_range=(0.0, 0.1), base=0.0, amplitude=1.0, absolute=True,
+                 flash_chance=0.0, flash_start=2.0, flash_decay=0.9,
+                 max_brightness=2.0, seed=None):
+        self.width = width
+        self.height = height
+        self.base = base
+        self.amplitude = amplitude
+        self.absolute = absolute
+        self.flash_chance = flash_chance
+        self.flash_start = flash_start
+        self.flash_decay = flash_decay
+        self.max_brightness = max_brightness
+        self.max_size = max_size
+        self.speed_range = speed_range
+        self.palette = np.array(colors, dtype=np.float32)
+        self.rng = np.random.default_rng(seed)
+        self.time = time.time()
+        self.drawn = (np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32))
+        self.populate(count)
+
+    @classmethod
+    def twinkling(cls, count, width, height, colors, **kwargs):
+        # Menu and solar system sky: slow |sin| twinkle with random bright flashes
+        return cls(count, width, height, colors, speed_range=(0.0, 0.1),
+                   base=0.0, amplitude=1.0, absolute=True, flash_chance=0.005, **kwargs)
+
+    @classmethod
+    def shimmering(cls, count, width, height, colors, **kwargs):
+        # Quiz and planet view sky: fast shimmer around 70% brightness
+        return cls(count, width, height, colors, speed_range=(2.0, 2.0),
+                   base=0.7, amplitude=0.3, absolute=False, **kwargs)
+
+    def __len__(self):
+        return len(self.x)
+
+    def populate(self, count):
+        # A whole new sky
+        for name, values in self.roll(count).items():
+            setattr(self, name, values)
+        self.group()
+
+    def roll(self, count):
+        # Per-star arrays of count new random stars
+        rng = self.rng
+        low, high = self.speed_range
+        return {
+            "x": rng.integers(0, self.width + 1, count).astype(np.float32),
+            "y": rng.integers(0, self.height + 1, count).astype(np.float32),
+            "size": (rng.random(count) * self.max_size).astype(np.int32),
+            "color": self.palette[rng.integers(0, len(self.palette), count)],
+            "speed": rng.uniform(low, high, count),
+            "phase": rng.uniform(0, 2 * np.pi, count),
+            "flash": np.zeros(count, dtype=np.float32),
+            "brightness": np.zeros(count, dtype=np.float32),
+        }
+
+    def group(self):
+        # Stars grouped by stamp size, so drawing is one scatter per pixel offset
+        self.groups = [(np.flatnonzero(self.size == radius), stamp_offsets(radius))
+                       for radius in range(self.max_size + 1)]
+        self.groups = [(index, offsets) for index, offsets in self.groups if len(index)]
+
+    def set_count(self, count):
+        # Keeps the stars already in the sky and drops the last ones or adds
+        # new ones, so a quality change mid-flight doesn't move the sky
+        if count < len(self):
+            for name in STAR_ARRAYS:
+                setattr(self, name, getattr(self, name)[:count])
+        elif count > len(self):
+            for name, values in self.roll(count - len(self)).items():
+                setattr(self, name, np.concatenate((getattr(self, name), values)))
+        else:
+            return
+        self.group()
+
+    def update(self, now=None):
+        self.time = time.time() if now is None else now
+
+        # Start new flashes and fade the running ones
+        if self.flash_chance > 0:
+            self.flash *= self.flash_decay
+            self.flash[self.flash < 0.1] = 0
+            starting = (self.flash == 0) & (self.rng.random(len(self)) < self.flash_chance)
+            self.flash[starting] = self.flash_start
+
+        wave = np.sin(self.time * self.speed + self.phase)
+        if self.absolute:
+            wave = np.abs(wave)
+        self.brightness = np.minimum(self.base + self.amplitude * wave + self.flash,
+                                     self.max_brightness)
+
+    def draw(self, surface, offset=(0, 0), rects=False):
+        # offset scrolls the whole sky for parallax; stars wrap around the edges.
+        # With rects, returns the rects drawn (see rects())
+        width, height = surface.get_size()
+        xs = ((self.x - offset[0]) % self.width).astype(np.int32)
+        ys = ((self.y - offset[1]) % self.height).astype(np.int32)
+        colors = np.clip(self.color * self.brightness[:, None], 0, 255).astype(np.uint8)
+
+        self.drawn = (xs, ys)
+
+        pixels = pygame.surfarray.pixels3d(surface)
+        # Stars drawn onto a transparent layer (the texture backend's canvas)
+        # must be made opaque too
+        alpha = pygame.surfarray.pixels_alpha(surface) if surface.get_flags() & pygame.SRCALPHA else None
+        for index, offsets in self.groups:
+            group_x = xs[index]
+            group_y = ys[index]
+            group_colors = colors[index]
+            for dx, dy in offsets:
+                px = group_x + dx
+                py = group_y + dy
+                visible = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+                pixels[px[visible], py[visible]] = group_colors[visible]
+                if alpha is not None:
+                    alpha[px[visible], py[visible]] = 255
+        del pixels, alpha  # Release the surface locks
+        if rects:
+            return self.rects()
+
+    def rects(self):
+        # Rects covered by the stars in the last draw, for dirty rect updates
+        xs, ys = self.drawn
+        radius = self.size
+        left = (xs - radius).tolist()
+        top = (ys - radius).tolist()
+        side = np.maximum(radius * 2, 1).tolist()
+        return [pygame.Rect(x, y, s, s) for x, y, s in zip(left, top, side)]
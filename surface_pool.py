@@ -0,0 +1,116 @@
+import sys
+import pygame
+
+# The pygame.Surface class, kept while debug mode puts a counting one in its place
+Surface = pygame.Surface
+# pygame calls that return a new Surface, counted in debug mode by name
+SURFACE_METHODS = {"copy", "convert", "convert_alpha", "subsurface", "render"}
+
+
+class SurfacePool:
+    # Scratch surfaces for things drawn fresh every frame (fades, temporary
+    # layers). get() hands out a cleared surface keyed by (size, flags) and
+    # end_frame() takes every surface handed out back, so after the first
+    # frames nothing is allocated. Surfaces that are kept (caches, layers) are
+    # built with new(). With debug on, every Surface constructed is counted,
+    # however it was made, and end_frame() reports the frames that still
+    # constructed any, and where the pool itself had to.
+    def __init__(self):
+        self.free = {}
+        self.used = []
+        self.created = 0
+        self.constructed = 0  # Surfaces constructed while debug is on
+        self.debug = False
+        self.frame = 0
+        self.frame_start = 0
+        self.frame_created = 0
+        self.leaks = 0  # Surfaces constructed during the last frame, the pool's own included
+
+    def get(self, size, flags=0, color=None):
+        # A surface cleared to color, transparent for SRCALPHA and black otherwise.
+        # Only valid until end_frame()
+        key = (tuple(size), flags)
+        free = self.free.get(key)
+        if free:
+            surface = free.pop()
+        else:
+            surface = pygame.Surface(key[0], flags)
+            if flags & pygame.SRCALPHA:
+                surface = surface.convert_alpha()
+            else:
+                surface = surface.convert()
+            self.created += 1
+        if flags & pygame.SRCALPHA:
+            surface.fill(color or (0, 0, 0, 0))
+            surface.set_alpha(255)
+        else:
+            surface.fill(color or (0, 0, 0))
+            surface.set_alpha(None)
+        self.used.append((key, surface))
+        return surface
+
+    def new(self, size, flags=0):
+        # A surface the caller keeps, for the game's modules instead of
+        # pygame.Surface(size, flags)
+        return pygame.Surface(size, flags)
+
+    def end_frame(self):
+        # Call once the frame has been drawn (after the render queue flush)
+        for key, surface in self.used:
+            self.free.setdefault(key, []).append(surface)
+        self.used = []
+        self.frame += 1
+        if self.debug:
+            self.leaks = self.constructed - self.frame_start
+            if self.leaks:
+                print(f"Frame {self.frame}: {self.leaks} pygame.Surface constructed")
+            if self.created != self.frame_created:
+                print(f"Frame {self.frame}: surface pool grew to {self.created}")
+            self.frame_start = self.constructed
+            self.frame_created = self.created
+
+    def set_debug(self, debug):
+        # Count every Surface constructed while debug is on: pygame.Surface is
+        # swapped for a subclass that counts itself, and a profile hook counts
+        # the pygame calls that return new surfaces (copies, conversions,
+        # transforms, loads and font renders). The hook slows every Python
+        # call, so turn debug on for the live loop only
+        self.debug = debug
+        if debug:
+            pygame.Surface = CountingSurface
+            sys.setprofile(self.profile)
+        else:
+            pygame.Surface = Surface
+            sys.setprofile(None)
+        self.frame_start = self.constructed
+        self.frame_created = self.created
+
+    def profile(self, frame, event, function):
+        if event != "c_call":
+            return
+        owner = getattr(function, "__self__", None)
+        if owner is pygame.transform or owner is pygame.image and function.__name__ == "load":
+            self.constructed += 1
+        elif function.__name__ in SURFACE_METHODS and isinstance(owner, (Surface, pygame.font.Font)):
+            self.constructed += 1
+
+    def clear(self):
+        self.free.clear()
+
+
+class CountingType(type):
+    # Surfaces made by pygame itself are not CountingSurfaces, but code
+    # checking isinstance(image, pygame.Surface) in debug mode still means them
+    def __instancecheck__(cls, instance):
+        return isinstance(instance, Surface)
+
+
+class CountingSurface(Surface, metaclass=CountingType):
+    # pygame.Surface while debug mode is on
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        surface_pool.constructed += 1
+
+
+# Shared by every frame loop
+surface_pool = SurfacePool()
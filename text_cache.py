@@ -0,0 +1,72 @@
+from collections import OrderedDict
+import pygame
+from surface_pool import surface_pool
+
+# Default memory cap for cached text (bytes of pixel data)
+TEXT_CACHE_BYTES = 8 * 1024 * 1024
+
+# Glow styles as (passes, padding): the text is stamped passes times onto a
+# surface padded by padding pixels on every side, and the text drawn on top
+HINT_GLOW = (3, 2)   # Escape hints and the score counter
+TITLE_GLOW = (1, 10)  # Menu title
+
+
+class TextCache:
+    # Rendered text keyed by (font, text, color, antialias, glow). Returns
+    # ready surfaces, glow variants already composited, and drops the least
+    # recently used ones once the memory cap is reached. hits and misses show
+    # whether a frame had to rasterize any text.
+    def __init__(self, max_bytes=TEXT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def render(self, font, text, color, antialias=True, glow=None):
+        # With a glow style the surface is padded; blit it at the text
+        # position minus the padding (see padding())
+        key = (font, text, tuple(color), antialias, glow)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        if glow is not None:
+            surface = self.composite_glow(surface, *glow)
+        self.entries[key] = surface
+        self.bytes += surface.get_width() * surface.get_height() * surface.get_bytesize()
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            _, old = self.entries.popitem(last=False)
+            self.bytes -= old.get_width() * old.get_height() * old.get_bytesize()
+        return surface
+
+    def composite_glow(self, text, passes, padding):
+        surface = surface_pool.new((text.get_width() + padding * 2,
+                                  text.get_height() + padding * 2), pygame.SRCALPHA)
+        for _ in range(passes):
+            surface.blit(text, (padding, padding))
+        surface.blit(text, (padding, padding))
+        return surface
+
+    @staticmethod
+    def padding(glow):
+        return glow[1] if glow else 0
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+
+# Shared by every screen
+text_cache = TextCache()
@@ -0,0 +1,138 @@
+import weakref
+import pygame
+from pygame._sdl2 import video
+from render_queue import BLIT, FILL, DRAW, TRANSFORM
+from surface_pool import surface_pool
+
+# SDL render driver to ask for ("opengl", "direct3d", "software", ...), None
+# lets SDL pick the best available and fall back to the software renderer
+TEXTURE_DRIVER = None
+
+
+class TextureBackend:
+    # Presents RenderQueue frames through pygame._sdl2.video instead of
+    # software blits to the window surface. Static surfaces (planets, rocket
+    # stages, stage 2 images, buttons, cached text and glows) are uploaded once
+    # as textures; rotation, scaling and alpha are applied by the renderer at
+    # draw time. Everything else (pygame.draw calls, the star fields, trails,
+    # surfaces that change every frame) is drawn in software onto a
+    # transparent canvas, and only the touched part of the canvas is uploaded
+    # each time the queue switches back to textures. The renderer draws at the
+    # logical size, scaled and letterboxed to any window or fullscreen size.
+    def __init__(self, title, size, driver=TEXTURE_DRIVER, vsync=False):
+        self.size = size
+        self.window = video.Window(title, size=size)
+        self.renderer = self.create_renderer(driver, vsync)
+        self.renderer.logical_size = size
+        self.renderer.draw_blend_mode = 1  # SDL_BLENDMODE_BLEND
+        self.textures = weakref.WeakKeyDictionary()
+        self.canvas = surface_pool.new(size, pygame.SRCALPHA)
+        self.canvas_texture = video.Texture(self.renderer, size, streaming=True)
+        self.canvas_texture.blend_mode = 1
+        self.canvas_rect = self.canvas.get_rect()
+        self.touched = None
+        self.fullscreen = False
+
+    def create_renderer(self, driver, vsync):
+        # Preferred driver first, then any accelerated renderer, then software
+        names = [info.name for info in video.get_drivers()]
+        attempts = []
+        if driver in names:
+            attempts.append((names.index(driver), -1))
+        attempts += [(-1, 1), (-1, 0)]
+        for index, accelerated in attempts:
+            try:
+                return video.Renderer(self.window, index=index, accelerated=accelerated, vsync=vsync)
+            except video.error as e:
+                print(f"Could not create renderer ({index}, {accelerated}): {e}")
+        raise video.error("No SDL renderer available")
+
+    def toggle_fullscreen(self):
+        self.fullscreen = not self.fullscreen
+        if self.fullscreen:
+            self.window.set_fullscreen(desktop=True)
+        else:
+            self.window.set_windowed()
+
+    def to_logical(self, pos):
+        # Window pixels (pygame.mouse.get_pos) to logical coordinates
+        window_width, window_height = self.window.size
+        width, height = self.size
+        scale = min(window_width / width, window_height / height)
+        left = (window_width - width * scale) / 2
+        top = (window_height - height * scale) / 2
+        return int((pos[0] - left) / scale), int((pos[1] - top) / scale)
+
+    def texture(self, surface):
+        # One texture per static surface, dropped when the surface is garbage collected
+        texture = self.textures.get(surface)
+        if texture is None:
+            texture = video.Texture.from_surface(self.renderer, surface)
+            texture.blend_mode = 1
+            self.textures[surface] = texture
+        return texture
+
+    def touch(self, rect):
+        # rect None means the whole canvas may have changed
+        rect = self.canvas_rect if rect is None else self.canvas_rect.clip(rect)
+        self.touched = rect if self.touched is None else self.touched.union(rect)
+
+    def upload(self, queue):
+        # Push the touched part of the canvas and clear it for the next segment
+        if self.touched is None:
+            return
+        area = self.touched
+        if area.width and area.height:
+            self.canvas_texture.update(self.canvas.subsurface(area), area)
+            self.canvas_texture.draw(srcrect=area, dstrect=area)
+            self.canvas.fill((0, 0, 0, 0), area)
+            queue.draw_calls += 1
+        self.touched = None
+
+    def present(self, queue):
+        # Draw and present one frame of queue, which is emptied
+        renderer = self.renderer
+        renderer.draw_color = (0, 0, 0, 255)
+        renderer.clear()
+        for _, kind, payload, rect in queue.sorted_commands(self.canvas_rect):
+            if kind == TRANSFORM:
+                image, center, angle, scale, _, _ = payload
+                rect = pygame.Rect(0, 0, image.get_width() * scale, image.get_height() * scale)
+                rect.center = center
+                # Surfaces rotate counter-clockwise, the renderer clockwise
+                self.draw_texture(queue, image, None, rect, -angle)
+            elif kind == BLIT and payload[4]:
+                source, _, area, _, _ = payload
+                self.draw_texture(queue, source, area, rect)
+            elif kind == FILL and len(payload[0]) < 4 and not payload[2]:
+                self.upload(queue)
+                color, rect, _ = payload
+                renderer.draw_color = (*color, 255)
+                renderer.fill_rect(rect)
+                queue.draw_calls += 1
+                queue.count_pixels(rect)
+            else:
+                # Software drawing onto the canvas
+                drawn = queue.execute(self.canvas, kind, payload)
+                if kind in (BLIT, FILL):
+                    self.touch(rect)
+                elif isinstance(drawn, pygame.Rect):
+                    self.touch(drawn)
+                elif isinstance(drawn, list):
+                    for drawn_rect in drawn:
+                        if drawn_rect is not None:
+                            self.touch(drawn_rect)
+                elif kind == DRAW:
+                    self.touch(None)
+        self.upload(queue)
+        queue.finish()
+        renderer.present()
+
+    def draw_texture(self, queue, surface, area, rect, angle=0):
+        self.upload(queue)
+        texture = self.texture(surface)
+        alpha = surface.get_alpha()
+        texture.alpha = 255 if alpha is None else alpha
+        texture.draw(srcrect=area, dstrect=rect, angle=angle)
+        queue.draw_calls += 1
+        queue.count_pixels(rect)
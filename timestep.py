@@ -0,0 +1,39 @@
+# Simulation steps per second. Every speed, drag, lifetime and cooldown in
+# the game is counted per step and tuned for this rate
+SIMULATION_HZ = 60
+# Most steps simulated for one drawn frame. Below SIMULATION_HZ / MAX_STEPS
+# frames per second the game slows down instead of falling further behind
+MAX_STEPS = 8
+# Frames drawn per second at most. Above SIMULATION_HZ the frames in between
+# steps are interpolated, for smooth motion on 120 and 144 Hz displays
+MAX_FPS = 144
+
+
+class FixedTimestep:
+    # Accumulator for a simulation that advances in fixed steps whatever the
+    # frame rate. advance() is fed the real time the last frame took and
+    # returns how many steps to simulate before drawing the next one: two on
+    # a 30 fps machine, one or none on a 120 Hz display. The time left over is
+    # kept for the next frame, and alpha is how far it reaches into the next
+    # step, so drawing can interpolate between the last two steps.
+    def __init__(self, hz=SIMULATION_HZ, max_steps=MAX_STEPS):
+        self.step = 1 / hz
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+
+    @property
+    def alpha(self):
+        return min(1.0, self.accumulator / self.step)
+
+    def reset(self):
+        # Forget the time spent away (suspended, in a platformer)
+        self.accumulator = 0.0
+
+    def advance(self, seconds):
+        self.accumulator += seconds
+        steps = min(int(self.accumulator / self.step), self.max_steps)
+        self.accumulator -= steps * self.step
+        # A machine that cannot keep up drops the backlog rather than
+        # running ever more steps per frame
+        self.accumulator = min(self.accumulator, self.step)
+        return steps
@@ -0,0 +1,114 @@
+import pygame
+import numpy as np
+from surface_pool import surface_pool
+
+# Number of alpha bands a trail is split into. Each band is drawn with a single
+# pygame.draw.lines call instead of one pygame.draw.line per segment.
+TRAIL_ALPHA_STEPS = 10
+
+
+def merge_rects(rects):
+    # Union rectangles until none of them overlap
+    merged = []
+    for rect in rects:
+        rect = rect.copy()
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+class TrailBuffer:
+    # Fixed-size ring buffer of (x, y) points. Appending never allocates and the
+    # oldest point is overwritten once the buffer is full (replaces list.pop(0)).
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.data = np.zeros((capacity, 2), dtype=np.float32)
+        self.head = 0  # Index of the next write
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, point):
+        self.data[self.head] = point
+        self.head = (self.head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+
+    def resize(self, capacity):
+        # Keep the newest points that still fit
+        points = self.points()[-capacity:]
+        self.capacity = capacity
+        self.data = np.zeros((capacity, 2), dtype=np.float32)
+        self.count = len(points)
+        self.data[:self.count] = points
+        self.head = self.count % capacity
+
+    def points(self):
+        # Points ordered from oldest to newest
+        if self.count < self.capacity:
+            return self.data[:self.count]
+        return np.roll(self.data, -self.head, axis=0)
+
+
+class TrailRenderer:
+    # Draws every trail of a frame into one shared SRCALPHA layer and blits back
+    # only the rectangles that were touched, instead of compositing a full-screen
+    # surface per trail.
+    def __init__(self, size, alpha_steps=TRAIL_ALPHA_STEPS):
+        self.alpha_steps = alpha_steps
+        self.resize(size)
+
+    def resize(self, size):
+        self.layer = surface_pool.new(size, pygame.SRCALPHA)
+        self.bounds = self.layer.get_rect()
+        self.dirty = []
+
+    def add(self, trail, color, width=2):
+        # trail is a TrailBuffer or an (n, 2) array of points, oldest first
+        points = trail.points() if isinstance(trail, TrailBuffer) else trail
+        count = len(points)
+        if count <= 2:
+            return
+
+        low = points.min(axis=0)
+        high = points.max(axis=0)
+        rect = pygame.Rect(int(low[0]) - width, int(low[1]) - width,
+                           int(high[0] - low[0]) + width * 2 + 2,
+                           int(high[1] - low[1]) + width * 2 + 2).clip(self.bounds)
+        if rect.width == 0 or rect.height == 0:
+            return
+
+        # Split the segments into bands sharing an alpha value so that each band
+        # is a single polyline, fading in from the tail towards the head
+        segments = count - 1
+        steps = min(self.alpha_steps, segments)
+        edges = np.linspace(0, segments, steps + 1).astype(int)
+        coords = points.tolist()
+        for start, end in zip(edges[:-1], edges[1:]):
+            if end <= start:
+                continue
+            alpha = int(255 * (((start + end) / 2) / count))
+            pygame.draw.lines(self.layer, (*color[:3], alpha), False,
+                              coords[start:end + 1], width)
+        self.dirty.append(rect)
+
+    def draw(self, screen):
+        # Composite the touched regions, then wipe them so the layer is
+        # transparent again for the next frame. Returns the regions drawn
+        if not self.dirty:
+            return []
+        # Overlapping regions must only be composited once
+        self.dirty = merge_rects(self.dirty)
+        screen.blits([(self.layer, rect.topleft, rect) for rect in self.dirty], doreturn=False)
+        for rect in self.dirty:
+            self.layer.fill((0, 0, 0, 0), rect)
+        drawn, self.dirty = self.dirty, []
+        return drawn
@@ -0,0 +1,56 @@
+import pygame
+from surface_pool import surface_pool
+
+WHITE = (255, 255, 255)
+
+
+class Button:
+    # Retained-mode glowing button. The glow layers, body and label are
+    # composed once into a single surface, so drawing is one blit. The surface
+    # is rebuilt only when the label, color or font changes, which covers hover
+    # and highlight states as well.
+    def __init__(self, rect, label, color, font, glow=8, text_color=WHITE):
+        self.rect = pygame.Rect(rect)
+        self.label = label
+        self.color = color
+        self.font = font
+        self.glow = glow  # How far the glow reaches past the body, both sides together
+        self.text_color = text_color
+        self.surface = None
+        self.state = None
+
+    def invalidate(self):
+        self.surface = None
+        self.state = None
+
+    def render(self, label, color, font):
+        glow_rect = self.rect.inflate(self.glow, self.glow)
+        surface = surface_pool.new(glow_rect.size, pygame.SRCALPHA)
+
+        # Glow layers, scratch surfaces from the pool
+        for i in range(3):
+            glow_alpha = 100 - i * 30
+            layer = surface_pool.get(glow_rect.size, pygame.SRCALPHA)
+            pygame.draw.rect(layer, (*color, glow_alpha), layer.get_rect(), border_radius=10)
+            surface.blit(layer, (0, 0))
+
+        # Main button
+        body = surface_pool.get(self.rect.size, pygame.SRCALPHA)
+        pygame.draw.rect(body, (*color, 200), body.get_rect(), border_radius=8)
+        surface.blit(body, (self.glow // 2, self.glow // 2))
+
+        # Label
+        text_surface = font.render(label, True, self.text_color)
+        surface.blit(text_surface, text_surface.get_rect(center=(glow_rect.width // 2,
+                                                                glow_rect.height // 2)))
+        return surface
+
+    def draw(self, screen, label=None, color=None, font=None):
+        # label, color and font override the button's own for this state
+        state = (self.label if label is None else label,
+                 self.color if color is None else color,
+                 self.font if font is None else font)
+        if state != self.state:
+            self.surface = self.render(*state)
+            self.state = state
+        screen.blit(self.surface, (self.rect.x - self.glow // 2, self.rect.y - self.glow // 2))